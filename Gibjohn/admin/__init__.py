@@ -0,0 +1,4 @@
+# admin/__init__.py
+from flask import Blueprint
+bp = Blueprint("admin", __name__, url_prefix="/admin", template_folder="../templates/admin")
+from . import routes, profiling, slow_queries  # noqa
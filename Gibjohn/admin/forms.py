@@ -0,0 +1,17 @@
+from flask_wtf import FlaskForm
+from wtforms import IntegerField, SelectField, StringField, SubmitField
+from wtforms.validators import DataRequired, NumberRange, Optional, Email
+
+
+class ProfilingForm(FlaskForm):
+    rate = IntegerField("Sample rate (% of matching requests)", default=10,
+                        validators=[DataRequired(), NumberRange(min=1, max=100)])
+    endpoint = SelectField("Endpoint", choices=[("", "Any endpoint")], validate_choice=False)
+    user_email = StringField("Only this user (email)", validators=[Optional(), Email()])
+    minutes = IntegerField("Switch off after (minutes)", default=30,
+                           validators=[DataRequired(), NumberRange(min=1, max=24 * 60)])
+    submit = SubmitField("Start profiling")
+
+
+class StopProfilingForm(FlaskForm):
+    submit = SubmitField("Stop profiling")
@@ -0,0 +1,198 @@
+# admin/profiling.py — profile a sample of live requests on demand (cProfile + stack sampler)
+# Streamed responses (the dashboard SSE stream, ZIP/CSV exports) are not profiled: their
+# body is generated after after_request, so a profile would cover only the view up to the headers.
+import cProfile
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from uuid import uuid4
+from flask import current_app, g, request
+from flask_login import current_user
+
+from . import bp
+
+SAMPLE_INTERVAL = 0.005  # seconds between stack samples
+SETTINGS_FILE = "settings.json"
+SETTINGS_CHECK_INTERVAL = 1.0  # seconds between stat()s of the settings file, per process
+OFF = {"rate": 0.0, "endpoint": "", "user_id": None, "until": 0}
+
+_settings = {"mtime": None, "value": OFF, "checked": 0.0}
+
+# created once at registration rather than on every request
+bp.record_once(lambda state: os.makedirs(state.app.config["PROFILE_DIR"], exist_ok=True))
+
+
+def profile_dir() -> str:
+    return current_app.config["PROFILE_DIR"]
+
+
+def load_settings() -> dict:
+    """
+    Current trigger, shared by every worker through the settings file. The
+    file is stat()ed at most once per SETTINGS_CHECK_INTERVAL and re-read
+    only when it changed, so a change takes up to that long to reach a worker.
+    """
+    now = time.monotonic()
+    if now - _settings["checked"] < SETTINGS_CHECK_INTERVAL:
+        return _settings["value"]
+    _settings["checked"] = now
+    path = os.path.join(profile_dir(), SETTINGS_FILE)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        _settings["mtime"], _settings["value"] = None, OFF
+        return OFF
+    if mtime != _settings["mtime"]:
+        with open(path) as fh:
+            _settings["value"] = {**OFF, **json.load(fh)}
+        _settings["mtime"] = mtime
+    return _settings["value"]
+
+
+def save_settings(rate: float, endpoint: str = "", user_id: int | None = None, minutes: int = 30) -> None:
+    path = os.path.join(profile_dir(), SETTINGS_FILE)
+    value = {"rate": rate, "endpoint": endpoint, "user_id": user_id,
+             "until": time.time() + minutes * 60 if rate else 0}
+    tmp = f"{path}.{os.getpid()}"
+    with open(tmp, "w") as fh:
+        json.dump(value, fh)
+    os.replace(tmp, path)
+    _settings["checked"] = 0.0  # this worker picks it up on its next request; the others within the interval
+
+
+def _wanted(s) -> bool:
+    if not s["rate"] or time.time() > s["until"] or request.endpoint in (None, "static"):
+        return False
+    if s["endpoint"] and request.endpoint != s["endpoint"]:
+        return False
+    if s["user_id"] is not None:
+        if not current_user.is_authenticated or current_user.user_id != s["user_id"]:
+            return False
+    return random.random() < s["rate"]
+
+
+class StackSampler(threading.Thread):
+    """Samples one thread's Python stack every SAMPLE_INTERVAL into collapsed-stack counts."""
+
+    def __init__(self, thread_id: int):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.counts = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(SAMPLE_INTERVAL):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.counts[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def folded(self) -> str:
+        """Brendan Gregg's collapsed format: `root;child;leaf count` per line."""
+        return "".join(f"{stack} {n}\n" for stack, n in self.counts.most_common())
+
+
+@bp.before_app_request
+def _start_profile():
+    if not _wanted(load_settings()):
+        return
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:  # another profiler already owns this interpreter; sample stacks only
+        profiler = None
+    sampler = StackSampler(threading.get_ident())
+    sampler.start()
+    g._profile = (profiler, sampler, time.perf_counter())
+
+
+def _stop(entry):
+    profiler, sampler, started = entry
+    if profiler is not None:
+        profiler.disable()
+    sampler.stop()
+    return profiler, sampler, (time.perf_counter() - started) * 1000
+
+
+@bp.after_app_request
+def _save_profile(response):
+    entry = g.pop("_profile", None)
+    if entry is None:
+        return response
+    profiler, sampler, elapsed_ms = _stop(entry)
+    if response.is_streamed:  # the body runs after this hook; see the note at the top
+        current_app.logger.info("not profiling streamed response %s %s", request.method, request.path)
+        return response
+
+    directory = profile_dir()
+    base = f"{time.strftime('%Y%m%d-%H%M%S', time.gmtime())}-{uuid4().hex[:8]}"
+    if profiler is not None:
+        profiler.dump_stats(os.path.join(directory, f"{base}.pstats"))
+    with open(os.path.join(directory, f"{base}.folded"), "w") as fh:
+        fh.write(sampler.folded())
+    meta = {
+        "name": base,
+        "at": time.time(),
+        "method": request.method,
+        "path": request.path,
+        "endpoint": request.endpoint,
+        "user_id": current_user.user_id if current_user.is_authenticated else None,
+        "status": response.status_code,
+        "elapsed_ms": round(elapsed_ms, 1),
+        "samples": sum(sampler.counts.values()),
+        "pstats": profiler is not None,
+    }
+    with open(os.path.join(directory, f"{base}.json"), "w") as fh:
+        json.dump(meta, fh)
+    current_app.logger.info("profiled %s %s in %.1f ms -> %s", request.method, request.path, elapsed_ms, base)
+    _prune(directory, current_app.config["PROFILE_KEEP"])
+    return response
+
+
+def detach_profile(g_values: dict) -> None:
+    """Drop this request's profiler from a copy of g (fanout.gather), so the copy's teardown can't stop it."""
+    g_values.pop("_profile", None)
+
+
+@bp.teardown_app_request
+def _abandon_profile(_exc):
+    entry = g.pop("_profile", None)  # request raised before after_request ran
+    if entry is not None:
+        _stop(entry)
+
+
+def _prune(directory: str, keep: int) -> None:
+    metas = sorted(f for f in os.listdir(directory) if f.endswith(".json") and f != SETTINGS_FILE)
+    for old in metas[:-keep] if keep else []:
+        base = old[:-len(".json")]
+        for ext in (".json", ".pstats", ".folded"):
+            try:
+                os.remove(os.path.join(directory, base + ext))
+            except FileNotFoundError:
+                pass
+
+
+def recent_profiles(limit: int = 100) -> list[dict]:
+    directory = profile_dir()
+    metas = sorted((f for f in os.listdir(directory) if f.endswith(".json") and f != SETTINGS_FILE),
+                   reverse=True)[:limit]
+    out = []
+    for name in metas:
+        try:
+            with open(os.path.join(directory, name)) as fh:
+                out.append(json.load(fh))
+        except (OSError, ValueError):
+            continue
+    return out
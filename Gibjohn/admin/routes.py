@@ -0,0 +1,93 @@
+# admin/routes.py — operator pages, limited to users flagged is_admin (`flask admin grant`)
+import re
+from datetime import datetime, timezone
+from functools import wraps
+import click
+from flask import render_template, redirect, url_for, flash, current_app, send_from_directory, abort
+from flask_login import login_required, current_user
+from sqlalchemy import func
+from models import db, User
+
+from . import bp
+from .forms import ProfilingForm, StopProfilingForm
+from .profiling import load_settings, save_settings, recent_profiles, profile_dir
+from .slow_queries import slow_query_report
+
+PROFILE_FILE = re.compile(r"^[\w-]+\.(pstats|folded|json)$")
+
+
+def admin_required(view):
+    @wraps(view)
+    @login_required
+    def wrapper(*args, **kwargs):
+        # a server-side flag, not the email: addresses are self-chosen and never verified
+        if not current_user.is_admin:
+            flash("Access denied.", "error")
+            return redirect(url_for("home"))
+        return view(*args, **kwargs)
+    return wrapper
+
+
+@bp.route("/profiles", methods=["GET", "POST"])
+@admin_required
+def profiles():
+    form = ProfilingForm()
+    form.endpoint.choices = [("", "Any endpoint")] + sorted(
+        (e, e) for e in current_app.view_functions if e != "static"
+    )
+    if form.validate_on_submit():
+        user_id = None
+        if form.user_email.data:
+            user = User.query.filter(func.lower(User.email) == form.user_email.data.strip().lower()).first()
+            if user is None:
+                flash("No user with that email.", "error")
+                return redirect(url_for("admin.profiles"))
+            user_id = user.user_id
+        save_settings(form.rate.data / 100, form.endpoint.data or "", user_id, form.minutes.data)
+        flash("Profiling started.", "success")
+        return redirect(url_for("admin.profiles"))
+
+    settings = load_settings()
+    until = datetime.fromtimestamp(settings["until"], timezone.utc) if settings["until"] else None
+    active = bool(settings["rate"]) and until is not None and until > datetime.now(timezone.utc)
+    return render_template("profiles.html", form=form, stop_form=StopProfilingForm(),
+                           settings=settings, active=active, until=until,
+                           profiles=recent_profiles())
+
+
+@bp.route("/profiles/stop", methods=["POST"])
+@admin_required
+def profiles_stop():
+    if StopProfilingForm().validate_on_submit():
+        save_settings(0.0)
+        flash("Profiling stopped.", "success")
+    return redirect(url_for("admin.profiles"))
+
+
+@bp.route("/profiles/<name>")
+@admin_required
+def profile_file(name):
+    if not PROFILE_FILE.match(name):
+        abort(404)
+    return send_from_directory(profile_dir(), name, as_attachment=True)
+
+
+@bp.route("/slow-queries")
+@admin_required
+def slow_queries():
+    return render_template("slow_queries.html",
+                           threshold=current_app.config["SLOW_QUERY_MS"],
+                           rows=slow_query_report(current_app.config["SLOW_QUERY_LOG"]))
+
+
+@bp.cli.command("grant")
+@click.argument("email")
+@click.option("--revoke", is_flag=True, help="Take admin access away instead.")
+def grant_command(email, revoke):
+    """Give an existing account access to the /admin pages."""
+    user = User.query.filter(func.lower(User.email) == email.strip().lower()).first()
+    if user is None:
+        raise click.ClickException(f"No user with email {email}.")
+    user.is_admin = not revoke
+    db.session.commit()
+    click.echo(f"{user.email}: admin {'revoked' if revoke else 'granted'}.")
@@ -0,0 +1,170 @@
+# admin/slow_queries.py — log statements over SLOW_QUERY_MS with their plan, grouped by fingerprint
+import hashlib
+import json
+import os
+import re
+import time
+from collections import Counter
+import click
+from flask import current_app, has_app_context, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from . import bp
+
+MAX_LOG_BYTES = 20 * 1024 * 1024  # rotate slow-queries.jsonl to .1 beyond this
+TREND_WINDOW = 10                 # compare the first vs latest N timings of each fingerprint
+
+_explained = set()  # fingerprints this process has already captured a plan for
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACE = re.compile(r"\s+")
+_EXPLAINABLE = re.compile(r"^\s*(SELECT|WITH)\b", re.I)
+
+
+def normalize(statement: str) -> str:
+    """SQL with literals and placeholder styles folded to ?, IN-lists collapsed, whitespace squeezed."""
+    sql = _STRING.sub("?", statement)
+    sql = re.sub(r"%\(\w+\)s|%s|(?<!:):\w+|\$\d+", "?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _IN_LIST.sub("(?...)", sql)
+    return _SPACE.sub(" ", sql).strip()
+
+
+def fingerprint(normalized: str) -> str:
+    return hashlib.sha1(normalized.encode()).hexdigest()[:16]
+
+
+def param_shape(parameters, executemany: bool):
+    """Types, not values: {"name": "str"} / ["int", ...]; executemany adds the row count."""
+    first = parameters[0] if executemany and parameters else parameters
+    if isinstance(first, dict):
+        shape = {k: type(v).__name__ for k, v in first.items()}
+    elif isinstance(first, (list, tuple)):
+        shape = [type(v).__name__ for v in first]
+    else:
+        shape = None
+    return {"rows": len(parameters), "each": shape} if executemany else shape
+
+
+def _explain(conn, statement, parameters):
+    dialect = conn.dialect.name
+    prefix = "EXPLAIN QUERY PLAN " if dialect == "sqlite" else "EXPLAIN "
+    cursor = conn.connection.driver_connection.cursor()  # raw DBAPI cursor: bypasses these events
+    try:
+        cursor.execute(prefix + statement, parameters)
+        return [" | ".join(str(c) for c in row) for row in cursor.fetchall()]
+    except Exception as exc:  # a plan is best-effort; never break the real query
+        return [f"EXPLAIN failed: {exc}"]
+    finally:
+        cursor.close()
+
+
+def _write(path: str, record: dict) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    try:
+        if os.path.getsize(path) > MAX_LOG_BYTES:
+            os.replace(path, path + ".1")
+    except FileNotFoundError:
+        pass
+    with open(path, "a") as fh:
+        fh.write(json.dumps(record, default=str) + "\n")
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "handle_error")
+def _drop_timer(ctx):
+    if ctx.connection is not None and ctx.connection.info.get("query_start"):
+        ctx.connection.info["query_start"].pop()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record_if_slow(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_start"].pop()
+    if not has_app_context():
+        return
+    threshold = current_app.config["SLOW_QUERY_MS"]
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    if not threshold or elapsed_ms < threshold:
+        return
+
+    sql = normalize(statement)
+    fp = fingerprint(sql)
+    record = {
+        "at": time.time(),
+        "fingerprint": fp,
+        "ms": round(elapsed_ms, 1),
+        "sql": sql,
+        "params": param_shape(parameters, executemany),
+        "endpoint": request.endpoint if has_request_context() else "cli",
+        "database": conn.engine.url.render_as_string(hide_password=True),
+    }
+    if fp not in _explained and not executemany and _EXPLAINABLE.match(statement):
+        record["plan"] = _explain(conn, statement, parameters)
+        _explained.add(fp)
+    _write(current_app.config["SLOW_QUERY_LOG"], record)
+    current_app.logger.warning("slow query %s (%.0f ms) in %s", fp, elapsed_ms, record["endpoint"])
+
+
+def _read(path: str):
+    for name in (path + ".1", path):
+        try:
+            with open(name) as fh:
+                for line in fh:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue
+        except FileNotFoundError:
+            continue
+
+
+def slow_query_report(path: str, limit: int = 50) -> list[dict]:
+    """One row per fingerprint, worst total time first, with latest plan and first-vs-recent average."""
+    groups = {}
+    for rec in _read(path):
+        grp = groups.setdefault(rec["fingerprint"], {
+            "fingerprint": rec["fingerprint"], "sql": rec["sql"], "timings": [],
+            "endpoints": Counter(), "params": rec.get("params"), "plan": None, "last_at": 0,
+        })
+        grp["timings"].append(rec["ms"])
+        grp["endpoints"][rec.get("endpoint") or "?"] += 1
+        grp["last_at"] = max(grp["last_at"], rec["at"])
+        if rec.get("plan"):
+            grp["plan"] = rec["plan"]
+
+    rows = []
+    for grp in groups.values():
+        t = grp.pop("timings")
+        first, recent = t[:TREND_WINDOW], t[-TREND_WINDOW:]
+        rows.append({
+            **grp,
+            "count": len(t),
+            "total_ms": round(sum(t), 1),
+            "avg_ms": round(sum(t) / len(t), 1),
+            "max_ms": max(t),
+            "first_avg_ms": round(sum(first) / len(first), 1),
+            "recent_avg_ms": round(sum(recent) / len(recent), 1),
+            "endpoints": grp["endpoints"].most_common(3),
+        })
+    rows.sort(key=lambda r: r["total_ms"], reverse=True)
+    return rows[:limit]
+
+
+@bp.cli.command("slow-queries")
+@click.option("--top", default=20, show_default=True, help="Fingerprints to show.")
+def slow_queries_command(top):
+    """Print the slow-query log grouped by statement fingerprint."""
+    for r in slow_query_report(current_app.config["SLOW_QUERY_LOG"], top):
+        where = ", ".join(f"{e}×{n}" for e, n in r["endpoints"])
+        click.echo(f"{r['fingerprint']}  n={r['count']}  total={r['total_ms']}ms  avg={r['avg_ms']}ms  "
+                   f"max={r['max_ms']}ms  first→recent={r['first_avg_ms']}→{r['recent_avg_ms']}ms  [{where}]")
+        click.echo(f"    {r['sql'][:300]}")
+        for line in r["plan"] or []:
+            click.echo(f"      {line}")
@@ -0,0 +1,4 @@
+# api/__init__.py — versioned JSON API for mobile and classroom-display clients
+from flask import Blueprint
+bp = Blueprint("api", __name__, url_prefix="/api/v1")
+from . import common, routes  # noqa
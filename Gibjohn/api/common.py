@@ -0,0 +1,114 @@
+# api/common.py — fields=, cursor pagination, weak ETags and gzip shared by every API endpoint
+import base64
+import gzip
+import hashlib
+from datetime import date, datetime
+from functools import wraps
+from flask import jsonify, request, abort, Response
+from flask_login import current_user
+from werkzeug.exceptions import HTTPException
+from models import db
+
+from . import bp
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+GZIP_MIN_BYTES = 1024   # smaller bodies aren't worth the CPU or the header
+GZIP_LEVEL = 6
+
+
+def api_login_required(view):
+    """Like login_required, but a 401 JSON body instead of a redirect to the login page."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not current_user.is_authenticated:
+            abort(401, "Log in first.")
+        return view(*args, **kwargs)
+    return wrapper
+
+
+@bp.errorhandler(HTTPException)
+def _json_error(err):
+    return jsonify(error=err.name, message=err.description), err.code
+
+
+def parse_fields(allowed: dict, default) -> list[str]:
+    """`fields=a,b` restricted to the endpoint's allowed names; default when absent."""
+    raw = request.args.get("fields")
+    if not raw:
+        return list(default)
+    fields = [f.strip() for f in raw.split(",") if f.strip()]
+    unknown = [f for f in fields if f not in allowed]
+    if unknown:
+        abort(400, f"Unknown field(s): {', '.join(unknown)}. Allowed: {', '.join(allowed)}.")
+    return fields
+
+
+def encode_cursor(pk: int) -> str:
+    return base64.urlsafe_b64encode(str(pk).encode()).decode().rstrip("=")
+
+
+def parse_page() -> tuple[int, int | None]:
+    """(limit, last primary key seen) from ?limit= and ?cursor=."""
+    limit = request.args.get("limit", DEFAULT_LIMIT, type=int)
+    if not 1 <= limit <= MAX_LIMIT:
+        abort(400, f"limit must be between 1 and {MAX_LIMIT}.")
+    cursor = request.args.get("cursor")
+    if not cursor:
+        return limit, None
+    try:
+        return limit, int(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError:
+        abort(400, "Invalid cursor.")
+
+
+def collection_etag(version_stmt) -> str:
+    """
+    Hash of a cheap aggregate over the collection (count, max id, max updated_at...)
+    plus who is asking and the query string: equal means the page can't have changed.
+    """
+    version = db.session.execute(version_stmt).one()
+    key = repr((tuple(version), current_user.user_id, sorted(request.args.items(multi=True))))
+    return hashlib.sha1(key.encode()).hexdigest()[:20]
+
+
+def not_modified(etag: str) -> Response | None:
+    if request.if_none_match.contains_weak(etag):
+        resp = Response(status=304)
+        resp.set_etag(etag, weak=True)
+        resp.headers["Cache-Control"] = "private, no-cache"
+        return resp
+    return None
+
+
+def _jsonable(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def json_page(rows, fields, limit: int, etag: str, pk_attr: str = "_pk") -> Response:
+    """Serialize up to `limit` rows (fetched limit+1 to detect a next page)."""
+    more = len(rows) > limit
+    rows = rows[:limit]
+    resp = jsonify(
+        data=[{f: _jsonable(getattr(r, f)) for f in fields} for r in rows],
+        next_cursor=encode_cursor(getattr(rows[-1], pk_attr)) if more else None,
+    )
+    resp.set_etag(etag, weak=True)
+    resp.headers["Cache-Control"] = "private, no-cache"  # always revalidate; 304 is cheap
+    return resp
+
+
+@bp.after_request
+def _gzip(resp):
+    if (resp.status_code != 200 or resp.direct_passthrough or "Content-Encoding" in resp.headers
+            or "gzip" not in request.headers.get("Accept-Encoding", "")):
+        return resp
+    data = resp.get_data()
+    if len(data) < GZIP_MIN_BYTES:
+        return resp
+    resp.set_data(gzip.compress(data, GZIP_LEVEL))
+    resp.headers["Content-Encoding"] = "gzip"
+    resp.vary.add("Accept-Encoding")
+    return resp
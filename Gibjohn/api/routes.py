@@ -0,0 +1,145 @@
+# api/routes.py — /api/v1 collections, scoped to what the signed-in user can already see in the HTML app
+from flask import request, abort, jsonify
+from flask_login import current_user
+from sqlalchemy import select, func, desc
+from models import db, Class, ClassEnrollment, Assignment, Submission, User
+from gradebook import gradebook_rows, build, summarise, payload
+from learner.feed import enrolled_class_ids
+from replicas import read_only
+
+from . import bp
+from .common import (api_login_required, parse_fields, parse_page, collection_etag, not_modified, json_page)
+
+LEADERBOARD_MAX = 100
+
+CLASS_FIELDS = {c: getattr(Class, c) for c in ("class_id", "title", "subject", "year_group", "tutor_id", "created_at")}
+ASSIGNMENT_FIELDS = {c: getattr(Assignment, c) for c in
+                     ("assignment_id", "class_id", "resource_id", "title", "due_date", "created_at", "updated_at")}
+SUBMISSION_FIELDS = {c: getattr(Submission, c) for c in
+                     ("submission_id", "assignment_id", "user_id", "status", "score", "submitted_at")}
+
+
+def _class_scope():
+    """Class ids the user may read: classes they teach, or classes they're enrolled in."""
+    if current_user.role == "tutor":
+        return select(Class.class_id).where(Class.tutor_id == current_user.user_id)
+    return enrolled_class_ids(current_user.user_id)
+
+
+def _collection(pk, columns: dict, criteria, version_cols=()):
+    """fields= / cursor / ETag handling for a newest-first list keyed by `pk`."""
+    fields = parse_fields(columns, columns)
+    limit, after = parse_page()
+    etag = collection_etag(select(func.count(pk), func.max(pk), *[func.max(c) for c in version_cols])
+                           .where(*criteria))
+    if (resp := not_modified(etag)) is not None:
+        return resp
+
+    stmt = select(pk.label("_pk"), *[columns[f].label(f) for f in fields]).where(*criteria)
+    if after is not None:
+        stmt = stmt.where(pk < after)
+    rows = db.session.execute(stmt.order_by(pk.desc()).limit(limit + 1)).all()
+    return json_page(rows, fields, limit, etag)
+
+
+@bp.route("/classes")
+@api_login_required
+@read_only
+def classes():
+    return _collection(Class.class_id, CLASS_FIELDS, [Class.class_id.in_(_class_scope())])
+
+
+@bp.route("/assignments")
+@api_login_required
+@read_only
+def assignments():
+    criteria = [Assignment.class_id.in_(_class_scope())]
+    if (class_id := request.args.get("class_id", type=int)) is not None:
+        criteria.append(Assignment.class_id == class_id)
+    return _collection(Assignment.assignment_id, ASSIGNMENT_FIELDS, criteria,
+                       version_cols=[Assignment.updated_at])
+
+
+@bp.route("/submissions")
+@api_login_required
+@read_only
+def submissions():
+    if current_user.role == "tutor":
+        criteria = [Submission.assignment_id.in_(
+            select(Assignment.assignment_id).where(Assignment.class_id.in_(_class_scope())))]
+    else:
+        criteria = [Submission.user_id == current_user.user_id]
+    if (assignment_id := request.args.get("assignment_id", type=int)) is not None:
+        criteria.append(Submission.assignment_id == assignment_id)
+    return _collection(Submission.submission_id, SUBMISSION_FIELDS, criteria)
+
+
+@bp.route("/leaderboard")
+@api_login_required
+@read_only
+def leaderboard():
+    """Top learners by total score across the tutor's classes (or one ?class_id=)."""
+    if current_user.role != "tutor":
+        abort(403, "Leaderboards are for tutors.")
+    allowed = {"user_id": None, "name": None, "xp": None, "submissions": None}
+    fields = parse_fields(allowed, allowed)
+    limit = request.args.get("limit", 10, type=int)
+    if not 1 <= limit <= LEADERBOARD_MAX:
+        abort(400, f"limit must be between 1 and {LEADERBOARD_MAX}.")
+
+    criteria = [Assignment.class_id.in_(_class_scope())]
+    if (class_id := request.args.get("class_id", type=int)) is not None:
+        criteria.append(Assignment.class_id == class_id)
+    scoped = (select(func.count(Submission.submission_id), func.max(Submission.submission_id))
+              .join(Assignment, Assignment.assignment_id == Submission.assignment_id).where(*criteria))
+    etag = collection_etag(scoped)
+    if (resp := not_modified(etag)) is not None:
+        return resp
+
+    rows = db.session.execute(
+        select(User.user_id,
+               func.coalesce(User.full_name, "Student").label("name"),
+               func.coalesce(func.sum(Submission.score), 0).label("xp"),
+               func.count(Submission.submission_id).label("submissions"))
+        .join(Submission, Submission.user_id == User.user_id)
+        .join(Assignment, Assignment.assignment_id == Submission.assignment_id)
+        .where(*criteria)
+        .group_by(User.user_id, User.full_name)
+        .order_by(desc("xp"), User.user_id)
+        .limit(limit)
+    ).all()
+    resp = jsonify(data=[{f: (int(r.xp) if f == "xp" else getattr(r, f)) for f in fields} for r in rows])
+    resp.set_etag(etag, weak=True)
+    resp.headers["Cache-Control"] = "private, no-cache"
+    return resp
+
+
+@bp.route("/classes/<int:class_id>/gradebook")
+@api_login_required
+@read_only
+def class_gradebook(class_id):
+    """Learners x assignments matrix for one of the tutor's classes (drives the heatmap)."""
+    klass = db.session.get(Class, class_id)
+    if not klass or klass.tutor_id != current_user.user_id:
+        abort(404, "Class not found.")
+
+    in_class = Assignment.class_id == class_id
+    submitted = (select(Submission.submission_id)
+                 .join(Assignment, Assignment.assignment_id == Submission.assignment_id).where(in_class).subquery())
+    enrolled = ClassEnrollment.class_id == class_id
+    etag = collection_etag(select(
+        select(func.count()).select_from(submitted).scalar_subquery(),
+        select(func.max(submitted.c.submission_id)).scalar_subquery(),
+        select(func.count(Assignment.assignment_id)).where(in_class).scalar_subquery(),
+        select(func.max(Assignment.updated_at)).where(in_class).scalar_subquery(),
+        select(func.count()).select_from(ClassEnrollment).where(enrolled).scalar_subquery(),
+        select(func.max(ClassEnrollment.enrolled_at)).where(enrolled).scalar_subquery(),
+    ))
+    if (resp := not_modified(etag)) is not None:
+        return resp
+
+    book = build(gradebook_rows(class_id))
+    resp = jsonify(payload(book, summarise(book)))
+    resp.set_etag(etag, weak=True)
+    resp.headers["Cache-Control"] = "private, no-cache"
+    return resp
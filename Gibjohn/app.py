@@ -9,6 +9,12 @@ from flask_talisman import Talisman
 from config import Config
 from models import db, User
 from auth.routes import limiter
+import tenancy
+import replicas
+import cache
+import feeds
+import counters
+import maintenance
 
 
 
@@ -22,25 +28,32 @@ app.config.from_object(Config)
 # security headers (CSP example)
 csp = {
     "default-src": ["'self'"],
-    "img-src": ["'self'", "data:"],
+    "img-src": ["'self'", "data:", "https://img.youtube.com"],
     "style-src": ["'self'", "'unsafe-inline'"],
     "script-src": ["'self'"],
-    "frame-src": ["https://www.youtube.com", "https://www.youtube-nocookie.com"],
-    "child-src": ["https://www.youtube.com", "https://www.youtube-nocookie.com"],
+    "frame-src": ["https://www.youtube.com", "https://www.youtube-nocookie.com", "https://player.vimeo.com"],
+    "child-src": ["https://www.youtube.com", "https://www.youtube-nocookie.com", "https://player.vimeo.com"],
     "connect-src": ["'self'"]
 }
 Talisman(app, content_security_policy=csp, force_https=False)  # set True in prod
 # init extensions
 db.init_app(app)
+tenancy.init_app(app, db)  # before anything that queries: picks the school's DB per request
+replicas.init_app(app)
+cache.init_app(app)
+feeds.init_app(app)
+counters.init_app(app)
+maintenance.init_app(app)
 login_manager.init_app(app)
 csrf.init_app(app)
-migrate.init_app(app, db)
+migrate.init_app(app, db, render_as_batch=True)  # SQLite can only ALTER by rebuilding the table
 limiter.init_app(app)
 
     
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
+    user = User.query.get(int(user_id))
+    return None if user is None or user.deleted_at else user
 
 login_manager.login_view = "auth.login"
 login_manager.session_protection = "strong"
@@ -48,9 +61,15 @@ login_manager.session_protection = "strong"
 from auth import bp as auth_bp
 from learner import bp as learner_bp
 from tutor import bp as tutor_bp
+from admin import bp as admin_bp
+from api import bp as api_bp
 app.register_blueprint(auth_bp)
 app.register_blueprint(learner_bp)
 app.register_blueprint(tutor_bp)
+app.register_blueprint(admin_bp)
+app.register_blueprint(api_bp)
+# a dashboard's stream reconnects (and backs off from 503s) all day: keep it out of the 200/day budget
+limiter.exempt(app.view_functions["tutor.dashboard_stream"])
 
 app.config["MAX_CONTENT_LENGTH"] = 50 * 1024 * 1024  # 50 MB per request
 
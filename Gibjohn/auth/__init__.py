@@ -1,4 +1,4 @@
 # auth/__init__.py
 from flask import Blueprint
 bp = Blueprint("auth", __name__, template_folder="/templates")
-from . import routes  # noqa
\ No newline at end of file
+from . import routes, purge, export, roster  # noqa
\ No newline at end of file
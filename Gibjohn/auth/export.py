@@ -0,0 +1,82 @@
+# auth/export.py — "download my data" as a streamed ZIP archive
+import json
+import os
+from datetime import datetime, timezone
+from flask import Response, current_app, stream_with_context
+from flask_login import login_required, current_user
+from sqlalchemy import select
+from models import (db, User, Class, ClassEnrollment, Resources, Assignment, Submission,
+                    Progress, UserReward, ActivityLog)
+from streaming import stream_zip
+from . import bp
+from .routes import limiter
+
+YIELD_PER = 500
+FILE_CHUNK = 64 * 1024
+PRIVATE_COLUMNS = {"password_hash"}
+
+
+def _json_default(value):
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value).hex()
+    return str(value)
+
+
+def _jsonl(model, criterion):
+    """One JSON object per row, fetched YIELD_PER rows at a time."""
+    cols = [c for c in model.__table__.columns if c.name not in PRIVATE_COLUMNS]
+    stmt = (select(*cols).where(criterion)
+            .execution_options(yield_per=YIELD_PER, stream_results=True))
+    for row in db.session.execute(stmt):
+        yield (json.dumps(dict(row._mapping), default=_json_default) + "\n").encode()
+
+
+def _file_chunks(path):
+    with open(path, "rb") as fh:
+        while chunk := fh.read(FILE_CHUNK):
+            yield chunk
+
+
+def _upload_files(user_id: int, upload_dir: str):
+    """(arcname, chunks) for each of the user's uploads that still exists on disk."""
+    root = os.path.realpath(upload_dir)
+    stmt = (select(Resources.resource_id, Resources.path)
+            .where(Resources.owner_id == user_id, Resources.path.isnot(None))
+            .execution_options(yield_per=YIELD_PER, stream_results=True))
+    for rid, path in db.session.execute(stmt):
+        real = os.path.realpath(path)
+        if os.path.commonpath([root, real]) != root or not os.path.isfile(real):
+            continue
+        yield f"uploads/{rid}-{os.path.basename(real)}", _file_chunks(real)
+
+
+def export_members(user_id: int, upload_dir: str):
+    class_ids = select(Class.class_id).where(Class.tutor_id == user_id)
+    tables = [
+        ("user.jsonl", User, User.user_id == user_id),
+        ("progress.jsonl", Progress, Progress.user_id == user_id),
+        ("rewards.jsonl", UserReward, UserReward.user_id == user_id),
+        ("enrollments.jsonl", ClassEnrollment, ClassEnrollment.user_id == user_id),
+        ("submissions.jsonl", Submission, Submission.user_id == user_id),
+        ("activity.jsonl", ActivityLog, ActivityLog.user_id == user_id),
+        ("resources.jsonl", Resources, Resources.owner_id == user_id),
+        ("classes.jsonl", Class, Class.tutor_id == user_id),
+        ("assignments.jsonl", Assignment, Assignment.class_id.in_(class_ids)),
+    ]
+    for arcname, model, crit in tables:
+        yield arcname, _jsonl(model, crit)
+    yield from _upload_files(user_id, upload_dir)
+
+
+@bp.route("/account/export")
+@login_required
+@limiter.limit("5 per hour")
+def export_data():
+    upload_dir = os.path.join(current_app.root_path, "uploads")
+    body = stream_zip(export_members(current_user.user_id, upload_dir))
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%d")
+
+    resp = Response(stream_with_context(body), mimetype="application/zip")
+    resp.headers["Content-Disposition"] = f'attachment; filename="gibjohn-data-{stamp}.zip"'
+    resp.headers["Cache-Control"] = "no-store"
+    return resp
@@ -0,0 +1,137 @@
+# auth/purge.py — account deletion via ON DELETE CASCADE, batched for big accounts
+from datetime import datetime, timezone
+import click
+from flask import current_app
+from sqlalchemy import select, delete, update, func, or_, tuple_
+from counters import check as check_counters
+from tutor.rollups import buckets_for, refresh_buckets
+from models import (db, User, Class, ClassEnrollment, Resources, Assignment, Submission,
+                    Progress, UserReward, ActivityLog, DailyClassRollup, ReminderSent, LessonCompletion,
+                    TutorFeedEntry, TutorFeedHead, fk_cascades)
+
+from . import bp
+
+
+def _purge_steps(user_id: int):
+    """
+    (model, criterion) pairs for everything owned by a user, children first.
+    Only the user's own classes' assignments go: other tutors' assignments
+    that use the user's resources are detached from them (_detach_resources).
+    """
+    class_ids = select(Class.class_id).where(Class.tutor_id == user_id)
+    assignment_ids = select(Assignment.assignment_id).where(Assignment.class_id.in_(class_ids))
+    return [
+        (Submission, Submission.user_id == user_id),
+        (Submission, Submission.assignment_id.in_(assignment_ids)),
+        (TutorFeedEntry, or_(TutorFeedEntry.tutor_id == user_id, TutorFeedEntry.activity_id.in_(
+            select(ActivityLog.activity_id).where(ActivityLog.user_id == user_id)))),
+        (TutorFeedHead, TutorFeedHead.tutor_id == user_id),
+        (ActivityLog, ActivityLog.user_id == user_id),
+        (ReminderSent, or_(ReminderSent.user_id == user_id, ReminderSent.assignment_id.in_(assignment_ids))),
+        (LessonCompletion, or_(LessonCompletion.user_id == user_id, LessonCompletion.assignment_id.in_(assignment_ids))),
+        (ClassEnrollment, or_(ClassEnrollment.user_id == user_id, ClassEnrollment.class_id.in_(class_ids))),
+        (DailyClassRollup, or_(DailyClassRollup.tutor_id == user_id, DailyClassRollup.class_id.in_(class_ids))),
+        (Assignment, Assignment.assignment_id.in_(assignment_ids)),
+        (Resources, Resources.owner_id == user_id),
+        (Class, Class.tutor_id == user_id),
+        (UserReward, UserReward.user_id == user_id),
+        (Progress, Progress.user_id == user_id),
+    ]
+
+
+def _detach_resources(user_id: int) -> None:
+    """
+    Point other tutors' assignments off this user's resources before they're
+    deleted (what ON DELETE SET NULL does, for databases that predate it).
+    """
+    resource_ids = select(Resources.resource_id).where(Resources.owner_id == user_id)
+    db.session.execute(update(Assignment).where(Assignment.resource_id.in_(resource_ids))
+                       .values(resource_id=None))
+
+
+def dependent_rows(user_id: int) -> int:
+    return sum(
+        db.session.scalar(select(func.count()).select_from(model).where(crit)) or 0
+        for model, crit in _purge_steps(user_id)
+    )
+
+
+def _delete_in_batches(model, criterion, batch_size: int) -> int:
+    """DELETE matching rows batch_size at a time, committing between batches."""
+    pk = model.__mapper__.primary_key
+    total = 0
+    while True:
+        keys = db.session.execute(select(*pk).where(criterion).limit(batch_size)).all()
+        if not keys:
+            return total
+        if len(pk) == 1:
+            match = pk[0].in_([k[0] for k in keys])
+        else:
+            match = tuple_(*pk).in_([tuple(k) for k in keys])
+        db.session.execute(delete(model).where(match))
+        db.session.commit()
+        total += len(keys)
+
+
+def _other_buckets(user_id: int):
+    """Rollup days in other tutors' classes that count this user's submissions."""
+    return buckets_for(Submission.user_id == user_id, Class.tutor_id != user_id)
+
+
+def _counted_parents(user_id: int) -> tuple[list[int], list[int]]:
+    """Other tutors' classes/assignments whose counters include this user; bulk deletes bypass counters.py."""
+    class_ids = db.session.scalars(select(ClassEnrollment.class_id).where(ClassEnrollment.user_id == user_id)).all()
+    assignment_ids = db.session.scalars(
+        select(Submission.assignment_id.distinct()).where(Submission.user_id == user_id)).all()
+    return class_ids, assignment_ids
+
+
+def delete_account(user: User) -> bool:
+    """
+    Delete a user. Small accounts go in one statement and the database
+    cascades the rest (or, on a database not yet migrated to cascading
+    keys, the children are deleted first in the same transaction); large
+    ones are disabled now and purged later.
+    Returns True if the data is already gone, False if it was queued.
+    """
+    uid = user.user_id
+    if dependent_rows(uid) <= current_app.config["PURGE_INLINE_MAX_ROWS"]:
+        parents, buckets = _counted_parents(uid), _other_buckets(uid)
+        _detach_resources(uid)
+        if not fk_cascades():
+            for model, crit in _purge_steps(uid):
+                db.session.execute(delete(model).where(crit))
+        db.session.execute(delete(User).where(User.user_id == uid))
+        refresh_buckets(buckets)
+        db.session.commit()
+        check_counters(True, *parents)
+        return True
+
+    user.deleted_at = datetime.now(timezone.utc)
+    user.email = f"deleted-{uid}@deleted.invalid"  # frees the address straight away
+    user.password_hash = "!"                          # never matches a password
+    db.session.commit()
+    return False
+
+
+def purge_deleted_users(batch_size: int) -> int:
+    uids = db.session.scalars(select(User.user_id).where(User.deleted_at.isnot(None))).all()
+    for uid in uids:
+        parents, buckets = _counted_parents(uid), _other_buckets(uid)
+        _detach_resources(uid)
+        db.session.commit()
+        for model, crit in _purge_steps(uid):
+            _delete_in_batches(model, crit, batch_size)
+        db.session.execute(delete(User).where(User.user_id == uid))
+        refresh_buckets(buckets)
+        db.session.commit()
+        check_counters(True, *parents)
+    return len(uids)
+
+
+@bp.cli.command("purge-deleted")
+@click.option("--batch-size", type=int, default=None, help="Rows per DELETE (default PURGE_BATCH_SIZE).")
+def purge_deleted_command(batch_size):
+    """Finish deleting accounts queued by large account deletions."""
+    n = purge_deleted_users(batch_size or current_app.config["PURGE_BATCH_SIZE"])
+    click.echo(f"Purged {n} account(s).")
@@ -10,6 +10,7 @@ from email_validator import validate_email, EmailNotValidError
 from . import bp  #  Blueprint created in auth/__init__.py;  its name is "auth"
 from .forms import RegisterForm, LoginForm, ProfileForm, ChangePasswordForm, DeleteAccountForm
 from models import db, User
+from .purge import delete_account
 
 # If you use Flask-Limiter v3+, you usually init this in app factory and call limiter.limit on routes.Limiter(get_remote_address, default_limits=["200 per day"])
 limiter = Limiter(get_remote_address, default_limits=["200 per day"])
@@ -124,10 +125,12 @@ def profile():
             return redirect(url_for("auth.profile"))
 
         try:
-            db.session.delete(current_user)
-            db.session.commit()
+            done = delete_account(current_user._get_current_object())
             logout_user()
-            flash("Your account has been deleted.", "success")
+            if done:
+                flash("Your account has been deleted.", "success")
+            else:
+                flash("Your account has been closed. Remaining data will be removed shortly.", "success")
             return redirect(url_for("home"))
         except Exception as err:
             db.session.rollback()
@@ -0,0 +1,122 @@
+# bench_fanout.py — tutor dashboard/analytics latency with panel queries run serially vs via fanout.gather
+#   python bench_fanout.py --latency-ms 2 --requests 50
+#   python bench_fanout.py --latency-ms 2 --concurrency 8   # 8 clients at once: one gthread worker's load
+# --latency-ms adds a sleep per statement to stand in for a networked database's round trip.
+# With --concurrency above 1 the clients share the process's fanout pool, so most requests find it
+# busy and run their queries serially (fanout.gather's fallback) instead of queueing for it.
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def _seed(db, models, classes: int, learners: int, assignments: int) -> int:
+    from sqlalchemy import insert
+    from counters import check
+    User, Class, Resources, Assignment, ClassEnrollment, Submission = (
+        models.User, models.Class, models.Resources, models.Assignment, models.ClassEnrollment, models.Submission)
+    tutor = User(email="tutor@bench.test", role="tutor", password_hash="!", full_name="Bench Tutor")
+    db.session.add(tutor)
+    db.session.flush()
+    resource = Resources(title="Worksheet", subject="Maths", type="link", owner_id=tutor.user_id)
+    db.session.add(resource)
+    db.session.flush()
+    db.session.execute(insert(User), [{"email": f"l{i}@bench.test", "role": "learner", "password_hash": "!",
+                                       "full_name": f"Learner {i}"} for i in range(classes * learners)])
+    learner_ids = db.session.scalars(db.select(User.user_id).where(User.role == "learner")).all()
+    rng = random.Random(1)
+    for c in range(classes):
+        klass = Class(title=f"Class {c}", subject=rng.choice(["Maths", "Science", "English"]),
+                      year_group=7 + c % 5, tutor_id=tutor.user_id)
+        db.session.add(klass)
+        db.session.flush()
+        roster = learner_ids[c * learners:(c + 1) * learners]
+        db.session.execute(insert(ClassEnrollment), [{"class_id": klass.class_id, "user_id": u} for u in roster])
+        for a in range(assignments):
+            assignment = Assignment(title=f"Task {c}.{a}", class_id=klass.class_id, resource_id=resource.resource_id)
+            db.session.add(assignment)
+            db.session.flush()
+            db.session.execute(insert(Submission), [
+                {"assignment_id": assignment.assignment_id, "user_id": u, "status": "submitted",
+                 "score": rng.randint(0, 100)} for u in roster if rng.random() < 0.7])
+    db.session.commit()
+    check(repair=True)  # bulk inserts skip the counter hooks
+    return tutor.user_id
+
+
+def _time(client, path: str, n: int) -> list[float]:
+    client.get(path)  # warm up pools and templates
+    samples = []
+    for _ in range(n):
+        started = time.perf_counter()
+        resp = client.get(path)
+        samples.append((time.perf_counter() - started) * 1000)
+        assert resp.status_code == 200, (path, resp.status_code)
+    return samples
+
+
+def _time_concurrently(clients, path: str, n: int) -> list[float]:
+    """n requests from each client, all clients at once, as a worker's web threads would."""
+    with ThreadPoolExecutor(max_workers=len(clients)) as threads:
+        runs = threads.map(lambda c: _time(c, path, n), clients)
+        return [ms for run in runs for ms in run]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=30)
+    parser.add_argument("--workers", type=int, default=4, help="FANOUT_WORKERS for the parallel run")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="simulated round trip per statement")
+    parser.add_argument("--concurrency", type=int, default=1, help="clients requesting at the same time")
+    parser.add_argument("--classes", type=int, default=6)
+    parser.add_argument("--learners", type=int, default=30)
+    parser.add_argument("--assignments", type=int, default=12)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="bench-fanout-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+    os.environ.setdefault("CACHE_PATH", os.path.join(tmp, "cache.sqlite3"))
+    sys.path.insert(0, HERE)
+    from sqlalchemy import event
+    from app import app
+    import models
+
+    app.login_manager.session_protection = None  # the test client's identity isn't what's being measured
+    app.config["RATELIMIT_ENABLED"] = False
+    with app.app_context():
+        models.db.create_all()
+        tutor_id = _seed(models.db, models, args.classes, args.learners, args.assignments)
+        engine = models.db.engine
+
+    if args.latency_ms:
+        @event.listens_for(engine, "before_cursor_execute")
+        def _round_trip(*_):
+            time.sleep(args.latency_ms / 1000)
+
+    clients = [app.test_client() for _ in range(args.concurrency)]
+    for client in clients:
+        with client.session_transaction() as sess:
+            sess["_user_id"] = str(tutor_id)
+
+    print(f"{args.classes} classes x {args.learners} learners x {args.assignments} assignments, "
+          f"+{args.latency_ms:g} ms per statement, {args.requests} requests each from "
+          f"{args.concurrency} client(s) (median / p90 ms)")
+    for path in ("/tutor/dashboard", "/analytics"):
+        results = {}
+        for label, workers in (("serial", 0), (f"fanout x{args.workers}", args.workers)):
+            app.config["FANOUT_WORKERS"] = workers
+            samples = sorted(_time_concurrently(clients, path, args.requests))
+            results[label] = (statistics.median(samples), samples[int(len(samples) * 0.9) - 1])
+        line = "  ".join(f"{label:>10}: {med:7.1f} / {p90:7.1f}" for label, (med, p90) in results.items())
+        (serial, _), (parallel, _) = results.values()
+        print(f"{path:<18} {line}  speed-up x{serial / parallel:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+# bench_sse.py — open dashboard streams on one gunicorn worker, then time a page and an event's fan-out
+#   python bench_sse.py --streams 300
+#   GUNICORN_WORKER_CLASS=gthread python bench_sse.py --streams 20   # the thread-per-stream worker
+# A page fetched while the streams are open should answer as fast as with none, and one submission
+# should reach every open stream (the worker's single dispatcher feeds them all).
+import argparse
+import http.client
+import os
+import re
+import selectors
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.parse
+import urllib.request
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+CSRF = re.compile(r'name="csrf_token" type="hidden" value="([^"]+)"')
+AGENT = "bench-sse"
+
+
+def _seed(tmp: str) -> None:
+    """Schema plus a tutor, a learner and a class, written before the server starts."""
+    sys.path.insert(0, HERE)
+    from app import app
+    from models import db, User, Class, ClassEnrollment, Assignment
+    with app.app_context():
+        db.create_all()
+        tutor = User(email="tutor@bench.example", role="tutor", full_name="Bench Tutor")
+        tutor.set_password("Bench-password-1")
+        learner = User(email="ada@bench.example", role="learner", full_name="Ada", password_hash="!")
+        db.session.add_all([tutor, learner])
+        db.session.flush()
+        klass = Class(title="Bench class", subject="Maths", year_group=9, tutor_id=tutor.user_id)
+        db.session.add(klass)
+        db.session.flush()
+        db.session.add(ClassEnrollment(class_id=klass.class_id, user_id=learner.user_id))
+        db.session.add(Assignment(title="Bench task", class_id=klass.class_id))
+        db.session.commit()
+
+
+def _submit() -> float:
+    """Save one submission from this process, as another worker would; returns when it was committed."""
+    from app import app
+    from models import db, User, Assignment, Submission
+    with app.app_context():
+        learner = db.session.scalar(db.select(User).where(User.email == "ada@bench.example"))
+        assignment = db.session.scalar(db.select(Assignment))
+        db.session.add(Submission(assignment_id=assignment.assignment_id, user_id=learner.user_id,
+                                  status="submitted", score=90.0))
+        db.session.commit()
+    return time.monotonic()
+
+
+def _login(port: int) -> str:
+    """A real login POST; returns the Cookie header the streams send (the cookie is Secure, so by hand)."""
+    def call(method: str, cookie: str = "", body: str = "") -> tuple[str, str]:
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        headers = {"User-Agent": AGENT, "Cookie": cookie, "Content-Type": "application/x-www-form-urlencoded"}
+        conn.request(method, "/login", body=body, headers=headers)
+        resp = conn.getresponse()
+        page = resp.read().decode()
+        jar = dict(c.split(";", 1)[0].split("=", 1) for c in resp.headers.get_all("Set-Cookie") or [])
+        conn.close()
+        return page, "; ".join(f"{k}={v}" for k, v in jar.items()) or cookie
+
+    page, cookie = call("GET")
+    form = urllib.parse.urlencode({"email": "tutor@bench.example", "password": "Bench-password-1",
+                                   "csrf_token": CSRF.search(page).group(1)})
+    return call("POST", cookie, form)[1]
+
+
+def _wait_for(url: str, deadline: float) -> None:
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(url, timeout=1).read()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise SystemExit(f"server did not answer {url}")
+
+
+def _page_ms(url: str, n: int) -> list[float]:
+    samples = []
+    for _ in range(n):
+        started = time.perf_counter()
+        urllib.request.urlopen(url, timeout=30).read()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def _open_streams(port: int, cookie: str, n: int) -> tuple[selectors.DefaultSelector, dict, int]:
+    """n raw connections to the stream; returns them with how many got 200 (the rest got 503)."""
+    sel = selectors.DefaultSelector()
+    buffers = {}
+    request = (f"GET /tutor/dashboard/stream HTTP/1.1\r\nHost: 127.0.0.1\r\nUser-Agent: {AGENT}\r\n"
+               f"Cookie: {cookie}\r\nAccept: text/event-stream\r\n\r\n").encode()
+    for _ in range(n):
+        sock = socket.create_connection(("127.0.0.1", port))
+        sock.sendall(request)
+        sock.setblocking(False)
+        sel.register(sock, selectors.EVENT_READ)
+        buffers[sock] = b""
+    _read(sel, buffers, lambda buf: b"\r\n\r\n" in buf, time.monotonic() + 30)
+    accepted = sum(buf.startswith(b"HTTP/1.1 200") for buf in buffers.values())
+    return sel, buffers, accepted
+
+
+def _read(sel, buffers: dict, done, deadline: float) -> None:
+    while time.monotonic() < deadline and not all(done(buf) for buf in buffers.values()):
+        for key, _ in sel.select(timeout=0.1):
+            chunk = key.fileobj.recv(65536)
+            if chunk:
+                buffers[key.fileobj] += chunk
+            else:
+                sel.unregister(key.fileobj)
+                buffers[key.fileobj] += b"\0closed"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Open SSE streams on one gunicorn worker and time what else it serves.")
+    parser.add_argument("--streams", type=int, default=300)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="bench-sse-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+    os.environ.setdefault("CACHE_PATH", os.path.join(tmp, "cache.sqlite3"))
+    _seed(tmp)
+
+    env = {**os.environ, "WEB_CONCURRENCY": "1"}
+    log = tempfile.TemporaryFile(mode="w+")
+    master = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "wsgi:app",
+         "--bind", f"127.0.0.1:{args.port}", "--max-requests", "0"],
+        cwd=HERE, env=env, stdout=subprocess.DEVNULL, stderr=log,
+    )
+    base = f"http://127.0.0.1:{args.port}"
+    try:
+        _wait_for(f"{base}/privacy", time.monotonic() + 60)
+        idle = _page_ms(f"{base}/privacy", args.requests)
+        cookie = _login(args.port)
+        sel, buffers, accepted = _open_streams(args.port, cookie, args.streams)
+        busy = _page_ms(f"{base}/privacy", args.requests)
+
+        open_streams = {s: b for s, b in buffers.items() if b.startswith(b"HTTP/1.1 200")}
+        for sock in buffers.keys() - open_streams.keys():
+            if sock.fileno() in sel.get_map():
+                sel.unregister(sock)  # refused with 503: nothing more to read
+        committed = _submit()
+        _read(sel, open_streams, lambda buf: b"event: submission" in buf or buf.endswith(b"\0closed"),
+              committed + 30)
+        delivered = sum(b"event: submission" in buf for buf in open_streams.values())
+        fan_out_s = time.monotonic() - committed
+        for sock in buffers:
+            sock.close()
+    finally:
+        master.send_signal(signal.SIGTERM)
+        master.wait(timeout=60)
+
+    worker = os.environ.get("GUNICORN_WORKER_CLASS", "default")
+    print(f"worker class {worker}: {accepted}/{args.streams} streams accepted, "
+          f"{delivered}/{accepted} got the submission within {fan_out_s:.2f}s")
+    print(f"/privacy median ms: {statistics.median(idle):.1f} with no streams, "
+          f"{statistics.median(busy):.1f} with {accepted} open")
+
+
+if __name__ == "__main__":
+    main()
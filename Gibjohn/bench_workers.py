@@ -0,0 +1,100 @@
+# bench_workers.py — per-worker memory and boot time under gunicorn, with and without preload (Linux)
+#   python bench_workers.py --workers 4
+import argparse
+import os
+import re
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BOOTED = re.compile(r"worker (\d+) booted in ([\d.]+)s")
+
+
+def _children(pid: int) -> list[int]:
+    with open(f"/proc/{pid}/task/{pid}/children") as fh:
+        return [int(p) for p in fh.read().split()]
+
+
+def _memory_kb(pid: int) -> dict:
+    """Rss, Pss and USS (private pages) from smaps_rollup."""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as fh:
+        for line in fh:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1])
+    return {"rss": fields["Rss"], "pss": fields["Pss"],
+            "uss": fields["Private_Clean"] + fields["Private_Dirty"]}
+
+
+def _wait_for(url: str, deadline: float) -> None:
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(url, timeout=1).read()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise SystemExit(f"server did not answer {url}")
+
+
+def run(preload: bool, workers: int, port: int, requests: int) -> dict:
+    env = {**os.environ, "GUNICORN_PRELOAD": "1" if preload else "0", "WEB_CONCURRENCY": str(workers)}
+    log = tempfile.TemporaryFile(mode="w+")
+    started = time.monotonic()
+    master = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "wsgi:app",
+         "--bind", f"127.0.0.1:{port}", "--max-requests", "0"],
+        cwd=HERE, env=env, stdout=subprocess.DEVNULL, stderr=log,
+    )
+    try:
+        url = f"http://127.0.0.1:{port}/privacy"
+        _wait_for(url, started + 60)
+        first_response = time.monotonic() - started
+        while time.monotonic() < started + 60:
+            log.seek(0)
+            boots = [float(s) for _, s in BOOTED.findall(log.read())]
+            if len(boots) >= workers:
+                break
+            time.sleep(0.05)
+        for _ in range(requests):  # touch the request path in every worker before measuring
+            urllib.request.urlopen(url, timeout=5).read()
+        pids = _children(master.pid)
+        mem = [_memory_kb(p) for p in pids]
+        master_mem = _memory_kb(master.pid)
+    finally:
+        master.send_signal(signal.SIGTERM)
+        master.wait(timeout=60)
+    n = len(mem)
+    return {
+        "mode": "preload" if preload else "no preload",
+        "workers": n,
+        "first_response_s": first_response,
+        "all_booted_s": max(boots) if boots else float("nan"),
+        "rss_mb": sum(m["rss"] for m in mem) / n / 1024,
+        "pss_mb": sum(m["pss"] for m in mem) / n / 1024,
+        "uss_mb": sum(m["uss"] for m in mem) / n / 1024,
+        "total_pss_mb": (sum(m["pss"] for m in mem) + master_mem["pss"]) / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare gunicorn workers with and without preload_app.")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'mode':12} {'workers':>7} {'1st resp s':>10} {'booted s':>9} "
+          f"{'RSS/w MB':>9} {'PSS/w MB':>9} {'USS/w MB':>9} {'total PSS MB':>13}")
+    for preload in (False, True):
+        r = run(preload, args.workers, args.port, args.requests)
+        print(f"{r['mode']:12} {r['workers']:>7} {r['first_response_s']:>10.2f} {r['all_booted_s']:>9.2f} "
+              f"{r['rss_mb']:>9.1f} {r['pss_mb']:>9.1f} {r['uss_mb']:>9.1f} {r['total_pss_mb']:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+# cache.py — host-wide cache shared by every worker: one SQLite file in WAL mode, size-bounded LRU
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from tenancy import current_tenant
+
+TOUCH_INTERVAL = 1.0   # seconds; reads refresh an entry's LRU clock at most this often
+EVICT_SLACK = 0.9      # evict down to this fraction of max_bytes so we don't evict on every set
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    ns       TEXT NOT NULL,
+    key      TEXT NOT NULL,
+    value    BLOB NOT NULL,
+    size     INTEGER NOT NULL,
+    expires  REAL,
+    accessed REAL NOT NULL,
+    PRIMARY KEY (ns, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_entries_accessed ON entries (accessed);
+CREATE INDEX IF NOT EXISTS ix_entries_expires ON entries (expires) WHERE expires IS NOT NULL;
+CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL) WITHOUT ROWID;
+INSERT OR IGNORE INTO meta VALUES ('bytes', 0), ('evictions', 0), ('expired', 0);
+"""
+
+_MISSING = object()
+
+
+class SharedCache:
+    """
+    get/set/delete with TTL, namespace invalidation and LRU eviction once the
+    stored values pass max_bytes. Safe across threads and forked workers: each
+    (process, thread) opens its own connection to the same file.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 64 * 1024 * 1024, default_ttl: float | None = 300):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._local = threading.local()
+        self._counts = {"hits": 0, "misses": 0, "sets": 0}  # this process only
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._conn() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():  # never reuse a handle across fork
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    @staticmethod
+    def _ns(ns: str) -> str:
+        return f"{current_tenant()}:{ns}"  # schools never see each other's entries
+
+    # ----- reads -----
+    def get(self, key, default=None, ns: str = "default"):
+        conn, now = self._conn(), time.time()
+        row = conn.execute("SELECT value, expires, accessed FROM entries WHERE ns = ? AND key = ?",
+                           (self._ns(ns), str(key))).fetchone()
+        if row is None or (row[1] is not None and row[1] <= now):
+            self._counts["misses"] += 1
+            return default
+        if now - row[2] > TOUCH_INTERVAL:
+            conn.execute("UPDATE entries SET accessed = ? WHERE ns = ? AND key = ?", (now, self._ns(ns), str(key)))
+        self._counts["hits"] += 1
+        return pickle.loads(row[0])
+
+    def get_or_set(self, key, make, ttl: float | None = _MISSING, ns: str = "default"):
+        value = self.get(key, _MISSING, ns=ns)
+        if value is _MISSING:
+            value = make()
+            self.set(key, value, ttl=ttl, ns=ns)
+        return value
+
+    # ----- writes -----
+    def set(self, key, value, ttl: float | None = _MISSING, ns: str = "default") -> None:
+        ttl = self.default_ttl if ttl is _MISSING else ttl
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        now = time.time()
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            old = conn.execute("SELECT size FROM entries WHERE ns = ? AND key = ?",
+                               (self._ns(ns), str(key))).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (ns, key, value, size, expires, accessed) VALUES (?, ?, ?, ?, ?, ?)",
+                (self._ns(ns), str(key), blob, len(blob), now + ttl if ttl else None, now),
+            )
+            total = conn.execute("UPDATE meta SET value = value + ? WHERE name = 'bytes' RETURNING value",
+                                 (len(blob) - (old[0] if old else 0),)).fetchone()[0]
+            if total > self.max_bytes:
+                self._evict(conn, total, now)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        self._counts["sets"] += 1
+
+    def _evict(self, conn, total: int, now: float) -> None:
+        """Drop expired entries, then least-recently-used ones, until under EVICT_SLACK * max_bytes."""
+        expired = conn.execute("DELETE FROM entries WHERE expires <= ? RETURNING size", (now,)).fetchall()
+        freed = sum(s for (s,) in expired)
+        target = total - int(self.max_bytes * EVICT_SLACK)
+        victims = []
+        if freed < target:
+            for ns, key, size in conn.execute("SELECT ns, key, size FROM entries ORDER BY accessed"):
+                victims.append((ns, key))
+                freed += size
+                if freed >= target:
+                    break
+            conn.executemany("DELETE FROM entries WHERE ns = ? AND key = ?", victims)
+        conn.execute("UPDATE meta SET value = value - ? WHERE name = 'bytes'", (freed,))
+        conn.execute("UPDATE meta SET value = value + ? WHERE name = 'evictions'", (len(victims),))
+        conn.execute("UPDATE meta SET value = value + ? WHERE name = 'expired'", (len(expired),))
+
+    def _delete_where(self, where: str, params) -> int:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            sizes = conn.execute(f"DELETE FROM entries WHERE {where} RETURNING size", params).fetchall()
+            conn.execute("UPDATE meta SET value = value - ? WHERE name = 'bytes'", (sum(s for (s,) in sizes),))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return len(sizes)
+
+    def delete(self, key, ns: str = "default") -> bool:
+        return bool(self._delete_where("ns = ? AND key = ?", (self._ns(ns), str(key))))
+
+    def invalidate(self, ns: str) -> int:
+        """Drop every entry in a namespace (this school's); returns how many."""
+        return self._delete_where("ns = ?", (self._ns(ns),))
+
+    def clear(self) -> int:
+        return self._delete_where("1 = 1", ())
+
+    def stats(self) -> dict:
+        conn = self._conn()
+        meta = dict(conn.execute("SELECT name, value FROM meta"))
+        entries = conn.execute("SELECT count(*) FROM entries").fetchone()[0]
+        lookups = self._counts["hits"] + self._counts["misses"]
+        return {
+            "entries": entries,
+            "bytes": meta["bytes"],
+            "max_bytes": self.max_bytes,
+            "evictions": meta["evictions"],
+            "expired": meta["expired"],
+            "process": {**self._counts, "hit_rate": self._counts["hits"] / lookups if lookups else None},
+        }
+
+
+def init_app(app) -> SharedCache:
+    cache = SharedCache(
+        app.config["CACHE_PATH"],
+        max_bytes=app.config["CACHE_MAX_BYTES"],
+        default_ttl=app.config["CACHE_DEFAULT_TTL"],
+    )
+    app.extensions["cache"] = cache
+    return cache
@@ -1,10 +1,25 @@
 import os
+from tenancy import tenant_binds
+from replicas import replica_binds
 
 
 class Config:
     SECRET_KEY = os.getenv("SECRET_KEY","devsecret")
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL","sqlite:///app.db")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # one database per school: TENANTS="school-a,school-b" -> school-a.<host> uses its own DB
+    TENANTS = [t.strip() for t in os.getenv("TENANTS", "").split(",") if t.strip()]
+    # optional read replicas: REPLICA_DATABASE_URL / TENANT_<NAME>_REPLICA_URL serve @read_only views
+    SQLALCHEMY_BINDS = {**tenant_binds(TENANTS), **replica_binds(TENANTS)}
+    REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", 10))  # primary-only after a user's write
+    # fanout.gather: threads per process running a dashboard's independent queries at once (0 = serial);
+    # shared by the worker's web threads (a request finding them all busy runs its queries serially).
+    # Each holds a pooled connection, so keep pool_size + max_overflow above this plus the web threads
+    FANOUT_WORKERS = int(os.getenv("FANOUT_WORKERS", 4))
+    # live dashboard streams open at once per worker process. gunicorn.conf.py raises it for gevent
+    # workers (a stream is a greenlet); under threads each holds one of `threads`, so keep it below that
+    SSE_MAX_STREAMS = int(os.getenv("SSE_MAX_STREAMS", 4))
+    SSE_RETRY_SECONDS = int(os.getenv("SSE_RETRY_SECONDS", 30))  # client back-off when a worker is full
     SESSION_COOKIE_HTTPONLY = True
     SESSION_COOKIE_SAMESITE = "Lax"   # "Strict" if you don’t embed
     SESSION_COOKIE_SECURE = False     # True in HTTPS/prod
@@ -13,6 +28,34 @@ class Config:
     BASE_DIR = os.path.abspath(os.path.dirname(__file__))
     UPLOAD_FOLDER = os.path.join(BASE_DIR, "uploads")
     MAX_CONTENT_LENGTH = 50 * 1024 * 1024  # e.g., 50MB
+    # account deletion: delete inline below this many dependent rows, else queue for `flask auth purge-deleted`
+    PURGE_INLINE_MAX_ROWS = int(os.getenv("PURGE_INLINE_MAX_ROWS", 5000))
+    PURGE_BATCH_SIZE = int(os.getenv("PURGE_BATCH_SIZE", 1000))
+    PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(BASE_DIR, "profiles"))
+    PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", 200))  # newest request profiles kept on disk
+    SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", 200))  # 0 disables the slow-query log
+    SLOW_QUERY_LOG = os.getenv("SLOW_QUERY_LOG", os.path.join(BASE_DIR, "logs", "slow-queries.jsonl"))
+    # host-wide cache shared by all workers (SQLite WAL file); app.extensions["cache"]
+    CACHE_PATH = os.getenv("CACHE_PATH", os.path.join(BASE_DIR, "instance", "cache.sqlite3"))
+    CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", 64 * 1024 * 1024))
+    CACHE_DEFAULT_TTL = int(os.getenv("CACHE_DEFAULT_TTL", 300))
+    # `flask db-maint`: rows sampled per index by PRAGMA optimize, and the incremental vacuum's pace
+    DB_MAINT_ANALYSIS_LIMIT = int(os.getenv("DB_MAINT_ANALYSIS_LIMIT", 1000))
+    DB_MAINT_VACUUM_STEP_PAGES = int(os.getenv("DB_MAINT_VACUUM_STEP_PAGES", 256))  # pages per write lock
+    DB_MAINT_VACUUM_SECONDS = float(os.getenv("DB_MAINT_VACUUM_SECONDS", 30))     # budget per pass
+    DB_MAINT_PAUSE_SECONDS = float(os.getenv("DB_MAINT_PAUSE_SECONDS", 0.05))     # gap for queued writers
+    # outgoing mail: "smtp", or "file" to drop .eml files in MAIL_OUTBOX (dev)
+    MAIL_TRANSPORT = os.getenv("MAIL_TRANSPORT", "file")
+    MAIL_SERVER = os.getenv("MAIL_SERVER", "localhost")
+    MAIL_PORT = int(os.getenv("MAIL_PORT", 25))
+    MAIL_USERNAME = os.getenv("MAIL_USERNAME")
+    MAIL_PASSWORD = os.getenv("MAIL_PASSWORD")
+    MAIL_USE_TLS = os.getenv("MAIL_USE_TLS", "0") == "1"
+    MAIL_FROM = os.getenv("MAIL_FROM", "Gibjohn <no-reply@gibjohn.local>")
+    MAIL_OUTBOX = os.getenv("MAIL_OUTBOX", os.path.join(BASE_DIR, "outbox"))
+    MAIL_BATCH_SIZE = int(os.getenv("MAIL_BATCH_SIZE", 100))  # messages per send + commit
+    # due dates come from a datetime-local input and are stored naive in the school's own time
+    SCHOOL_TIMEZONE = os.getenv("SCHOOL_TIMEZONE", "Europe/London")
 
     
 
@@ -0,0 +1,98 @@
+# counters.py — Class.student_count and Assignment.submission_count/submitter_count,
+# bumped in the writer's flush so dashboards read columns instead of GROUP BYs
+import click
+from flask.cli import AppGroup
+from sqlalchemy import event, select, update, func, case, exists, and_, or_
+from sqlalchemy.orm import Session
+from models import db, Class, ClassEnrollment, Assignment, Submission
+
+
+def _bump_class(conn, class_id: int, delta: int) -> None:
+    conn.execute(update(Class).where(Class.class_id == class_id)
+                 .values(student_count=Class.student_count + delta))
+
+
+def _bump_assignment(conn, sub: Submission, delta: int) -> None:
+    """
+    +/-1 submission; +/-1 submitter only if this was the learner's first
+    (or last remaining) attempt. Runs after the row is written, so the
+    EXISTS sees it: on insert, only earlier attempts count as "another".
+    """
+    same_learner = [Submission.assignment_id == sub.assignment_id, Submission.user_id == sub.user_id]
+    if delta > 0:
+        same_learner.append(Submission.submission_id < sub.submission_id)
+    other = exists().where(and_(*same_learner))
+    conn.execute(
+        update(Assignment).where(Assignment.assignment_id == sub.assignment_id)
+        .values(submission_count=Assignment.submission_count + delta,
+                submitter_count=Assignment.submitter_count + case((other, 0), else_=delta),
+                updated_at=Assignment.updated_at)  # a counter isn't an edit; keep onupdate (and API ETags) out of it
+    )
+
+
+# insert=True: runs before other after_flush hooks (events._collect), which read the new counts
+@event.listens_for(Session, "after_flush", propagate=True, insert=True)
+def _count(session, flush_context):
+    touched = [o for o in (*session.new, *session.deleted) if isinstance(o, (ClassEnrollment, Submission))]
+    if not touched:
+        return
+    conn = session.connection()
+    for obj in touched:
+        delta = 1 if obj in session.new else -1
+        if isinstance(obj, ClassEnrollment):
+            _bump_class(conn, obj.class_id, delta)
+        else:
+            _bump_assignment(conn, obj, delta)
+
+
+def _true_counts():
+    """Correlated recounts, usable both to compare and as UPDATE values."""
+    students = (select(func.count()).select_from(ClassEnrollment)
+                .where(ClassEnrollment.class_id == Class.class_id).scalar_subquery())
+    submissions = (select(func.count()).select_from(Submission)
+                   .where(Submission.assignment_id == Assignment.assignment_id).scalar_subquery())
+    submitters = (select(func.count(func.distinct(Submission.user_id)))
+                  .where(Submission.assignment_id == Assignment.assignment_id).scalar_subquery())
+    return students, submissions, submitters
+
+
+def check(repair: bool = False, class_ids=None, assignment_ids=None) -> tuple[int, int]:
+    """(classes, assignments) whose counters disagree with the tables; fixes them when `repair`."""
+    students, submissions, submitters = _true_counts()
+    class_filter = [Class.student_count != students]
+    assignment_filter = [or_(Assignment.submission_count != submissions, Assignment.submitter_count != submitters)]
+    if class_ids is not None:
+        class_filter.append(Class.class_id.in_(class_ids))
+    if assignment_ids is not None:
+        assignment_filter.append(Assignment.assignment_id.in_(assignment_ids))
+
+    bad_classes = db.session.scalars(select(Class.class_id).where(*class_filter)).all()
+    bad_assignments = db.session.scalars(select(Assignment.assignment_id).where(*assignment_filter)).all()
+    if repair and (bad_classes or bad_assignments):
+        if bad_classes:
+            db.session.execute(update(Class).where(Class.class_id.in_(bad_classes))
+                               .values(student_count=students))
+        if bad_assignments:
+            db.session.execute(update(Assignment).where(Assignment.assignment_id.in_(bad_assignments))
+                               .values(submission_count=submissions, submitter_count=submitters,
+                                       updated_at=Assignment.updated_at))
+        db.session.commit()
+    return len(bad_classes), len(bad_assignments)
+
+
+def init_app(app):
+    app.cli.add_command(counters_cli)
+
+
+counters_cli = AppGroup("counters", help="Denormalized counter commands.")
+
+
+@counters_cli.command("check")
+@click.option("--repair", is_flag=True, help="Rewrite counters that disagree with the tables.")
+def check_command(repair):
+    """Compare student/submission counters with real counts (cron nightly; per school via `tenants each`)."""
+    classes, assignments = check(repair)
+    verb = "Repaired" if repair else "Found"
+    click.echo(f"{verb} {classes} class and {assignments} assignment counter(s) out of step.")
+    if (classes or assignments) and not repair:
+        raise SystemExit(1)
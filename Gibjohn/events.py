@@ -0,0 +1,245 @@
+# events.py — live tutor dashboard events. Writers add rows to live_events in their own
+# transaction; one dispatcher thread per worker process (and school) tails that table and
+# wakes the process's SSE streams. The table is the channel, so a submission saved by any
+# worker reaches streams held by every other one, and event ids are global.
+import json
+import threading
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from flask import current_app
+from sqlalchemy import event, select, func, insert, delete
+from sqlalchemy.orm import Session
+from models import db, Class, ClassEnrollment, Assignment, Submission, ActivityLog, User, LiveEvent
+from tenancy import current_tenant, tenant_engine
+from feeds import fan_out
+
+BACKLOG = 256       # events kept per topic (and replayed at most) for Last-Event-ID resume
+HEARTBEAT = 15      # seconds between keep-alive comments on idle streams
+POLL_INTERVAL = 0.5  # seconds between a dispatcher's reads of live_events when it is idle
+POLL_BATCH = 500
+KEEP = timedelta(hours=1)  # live_events rows older than this are pruned
+PRUNE_EVERY = 60           # seconds between prunes, per dispatcher
+
+
+class _Topic:
+    """
+    One ring buffer + condition per topic. Publishing is an append and a
+    notify_all; subscribers hold no queue of their own, just the last seq
+    they sent. Each subscriber still waits in wait(): a greenlet under the
+    gevent worker, a whole thread under gthread, which is why streams are
+    capped per process (Broker.reserve).
+    """
+
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.events = deque(maxlen=BACKLOG)  # (seq, name, payload_json)
+        self.seq = 0
+
+
+class Broker:
+    """This process's SSE subscribers, fed by the dispatchers; seq is the live_events id."""
+
+    def __init__(self):
+        self._topics = {}
+        self._lock = threading.Lock()
+        self._streams = 0
+        self._closed = threading.Event()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed.is_set()
+
+    def reserve(self, limit: int) -> bool:
+        """Claim one of `limit` stream slots for this process; False when all are taken."""
+        with self._lock:
+            if self._streams >= limit:
+                return False
+            self._streams += 1
+            return True
+
+    def release(self) -> None:
+        with self._lock:
+            self._streams -= 1
+
+    def _topic(self, name) -> _Topic:
+        with self._lock:
+            return self._topics.setdefault(name, _Topic())
+
+    def publish(self, topic: str, seq: int, name: str, payload: str) -> None:
+        t = self._topic(topic)
+        with t.cond:
+            if seq <= t.seq:
+                return
+            t.seq = seq
+            t.events.append((seq, name, payload))
+            t.cond.notify_all()
+
+    def close(self) -> None:
+        """End every open subscription and stop the dispatchers (worker shutdown); clients reconnect elsewhere."""
+        self._closed.set()
+        with self._lock:
+            topics = list(self._topics.values())
+        for t in topics:
+            with t.cond:
+                t.cond.notify_all()
+
+    def wait_closed(self, timeout: float) -> bool:
+        return self._closed.wait(timeout)
+
+    def subscribe(self, topic: str, last_seq: int | None = None, backlog=()):
+        """
+        Yield (seq, name, payload) until close(); yields None on heartbeat timeouts.
+        `backlog` (events after last_seq, read from live_events) goes first; without
+        last_seq, only events dispatched after subscribing are sent.
+        """
+        t = self._topic(topic)
+        with t.cond:
+            cursor = t.seq if last_seq is None else last_seq
+        for e in backlog:
+            cursor = max(cursor, e[0])
+            yield e
+        while not self.closed:
+            with t.cond:
+                if t.seq <= cursor:
+                    t.cond.wait(HEARTBEAT)
+                if self.closed:
+                    return
+                pending = [e for e in t.events if e[0] > cursor]
+            if not pending:
+                yield None
+                continue
+            for e in pending:
+                cursor = e[0]
+                yield e
+
+
+broker = Broker()
+
+
+class _Dispatcher(threading.Thread):
+    """
+    Tails one school's live_events table for this process. Ids only grow in
+    commit order because SQLite has one writer at a time (on a server
+    database, swap this for LISTEN/NOTIFY or similar).
+    """
+
+    def __init__(self, app, tenant: str):
+        super().__init__(daemon=True, name=f"live-events-{tenant}")
+        self.app = app
+        self.tenant = tenant
+        self.engine = tenant_engine(db, tenant)
+        with self.engine.connect() as conn:
+            self.cursor = conn.scalar(select(func.max(LiveEvent.event_id))) or 0
+
+    def _poll(self, conn) -> int:
+        rows = conn.execute(
+            select(LiveEvent.event_id, LiveEvent.topic, LiveEvent.name, LiveEvent.payload)
+            .where(LiveEvent.event_id > self.cursor).order_by(LiveEvent.event_id).limit(POLL_BATCH)
+        ).all()
+        for r in rows:
+            broker.publish(f"{self.tenant}:{r.topic}", r.event_id, r.name, r.payload)
+            self.cursor = r.event_id
+        return len(rows)
+
+    def run(self):
+        last_prune = 0.0
+        while not broker.closed:
+            n = 0
+            try:
+                with self.engine.connect() as conn:
+                    n = self._poll(conn)
+                    now = datetime.now(timezone.utc)
+                    if now.timestamp() - last_prune > PRUNE_EVERY:
+                        conn.execute(delete(LiveEvent).where(LiveEvent.created_at < now - KEEP))
+                        conn.commit()
+                        last_prune = now.timestamp()
+            except Exception:
+                self.app.logger.exception("live events: poll failed for %s", self.tenant)
+            if n < POLL_BATCH:
+                broker.wait_closed(POLL_INTERVAL)
+
+
+_dispatchers = {}
+_dispatchers_lock = threading.Lock()
+
+
+def _ensure_dispatcher(tenant: str) -> None:
+    """Start this process's dispatcher for a school on its first stream (never in the preloading master)."""
+    with _dispatchers_lock:
+        d = _dispatchers.get(tenant)
+        if d is None or not d.is_alive():  # a thread inherited across fork reports not alive
+            d = _dispatchers[tenant] = _Dispatcher(current_app._get_current_object(), tenant)
+            d.start()
+
+
+def _tutor_key(tutor_id: int) -> str:
+    return f"tutor:{tutor_id}"
+
+
+def tutor_topic(tutor_id: int) -> str:
+    return f"{current_tenant()}:{_tutor_key(tutor_id)}"
+
+
+def listen(tutor_id: int, last_seq: int | None = None):
+    """Subscribe to a tutor's events, replaying those after last_seq from live_events first."""
+    _ensure_dispatcher(current_tenant())
+    backlog = []
+    if last_seq is not None:
+        backlog = db.session.execute(
+            select(LiveEvent.event_id, LiveEvent.name, LiveEvent.payload)
+            .where(LiveEvent.topic == _tutor_key(tutor_id), LiveEvent.event_id > last_seq)
+            .order_by(LiveEvent.event_id).limit(BACKLOG)
+        ).all()
+        db.session.remove()  # the stream can stay open for hours; don't hold a connection for it
+    return broker.subscribe(tutor_topic(tutor_id), last_seq, [tuple(r) for r in backlog])
+
+
+def sse_format(item) -> str:
+    if item is None:
+        return ": keep-alive\n\n"
+    seq, name, payload = item
+    return f"id: {seq}\nevent: {name}\ndata: {payload}\n\n"
+
+
+# --- write path: event rows go in with the change, so a rollback drops them too ---
+def _emit(conn, tutor_id: int, name: str, data: dict) -> None:
+    conn.execute(insert(LiveEvent).values(topic=_tutor_key(tutor_id), name=name,
+                                          payload=json.dumps(data, default=str)))
+
+
+@event.listens_for(Session, "after_flush", propagate=True)
+def _collect(session, flush_context):
+    relevant = [o for o in session.new if isinstance(o, (Submission, ActivityLog))]
+    if not relevant:
+        return
+    conn = session.connection()
+    for obj in relevant:
+        if isinstance(obj, Submission):
+            # counters._count is inserted ahead of this hook, so these are already bumped
+            # for this row: the same numbers the dashboard table reads
+            row = conn.execute(
+                select(Assignment.title, Assignment.submitter_count, Class.class_id, Class.tutor_id,
+                       Class.student_count, User.full_name)
+                .join(Class, Class.class_id == Assignment.class_id)
+                .join(User, User.user_id == obj.user_id)
+                .filter(Assignment.assignment_id == obj.assignment_id)
+            ).first()
+            if not row:
+                continue
+            _emit(conn, row.tutor_id, "submission", {
+                "assignment_id": obj.assignment_id,
+                "title": row.title,
+                "learner": row.full_name or "Student",
+                "score": obj.score,
+                "submitted": row.submitter_count,
+                "class_size": row.student_count,
+            })
+        elif isinstance(obj, ActivityLog):
+            tutor_ids = conn.execute(
+                select(func.distinct(Class.tutor_id))
+                .join(ClassEnrollment, ClassEnrollment.class_id == Class.class_id)
+                .filter(ClassEnrollment.user_id == obj.user_id)
+            ).scalars().all()
+            fan_out(conn, obj, tutor_ids)  # same transaction as the log row
+            for tid in tutor_ids:
+                _emit(conn, tid, "activity", {"action": obj.action})
@@ -0,0 +1,83 @@
+# fanout.py — run a view's independent read queries side by side instead of back to back
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app, g, has_request_context
+from flask.globals import request_ctx
+from admin.profiling import detach_profile
+
+_lock = threading.Lock()
+_pool = None
+_slots = None
+_pool_key = None  # (pid, FANOUT_WORKERS) the pool was built for
+
+
+def _executor() -> tuple[ThreadPoolExecutor, threading.BoundedSemaphore]:
+    """
+    One pool per process (a pool inherited across gunicorn's fork has no
+    threads), with a slot per pool thread. Every web thread in the worker
+    shares it, so a query only goes to the pool if it can claim a free slot.
+    """
+    global _pool, _slots, _pool_key
+    workers = current_app.config["FANOUT_WORKERS"]
+    with _lock:
+        if _pool_key != (os.getpid(), workers):
+            if _pool is not None and _pool_key[0] == os.getpid():
+                _pool.shutdown(wait=False)  # FANOUT_WORKERS changed (tests, bench_fanout.py)
+            _pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fanout")
+            _slots = threading.BoundedSemaphore(workers)
+            _pool_key = (os.getpid(), workers)
+        return _pool, _slots
+
+
+def _in_copied_context(g_values: dict, fn):
+    """
+    Run fn under a copy of the request. The copy pushes a fresh app context,
+    so db.session is a new session on its own pooled connection, torn down
+    (and the connection returned) when the task ends; copying g keeps tenant,
+    replica routing and the logged-in user the same as the caller's.
+    """
+    ctx = request_ctx.copy()  # one per task: a context can't be pushed in two threads at once
+
+    def task():
+        with ctx:
+            g.__dict__.update(g_values)
+            return fn()
+    return task
+
+
+def gather(**queries) -> dict:
+    """
+    Call each zero-argument function concurrently and return {name: result}.
+
+    The functions must be independent reads that return plain values (rows,
+    scalars, lists) — ORM objects come back detached, so touch only loaded
+    columns. Runs serially when FANOUT_WORKERS is 0, outside a request, or
+    for a single query, and re-raises the first failure either way.
+
+    The caller always runs one query itself, and any the pool has no free
+    slot for: when other requests are using the pool this degrades to
+    serial instead of queueing behind them.
+    """
+    workers = current_app.config["FANOUT_WORKERS"] if has_request_context() else 0
+    if workers <= 0 or len(queries) < 2:
+        return {name: fn() for name, fn in queries.items()}
+
+    g_values = dict(g.__dict__)
+    detach_profile(g_values)
+    pool, slots = _executor()
+    names = list(queries)
+    futures, inline = {}, [names[0]]
+    for name in names[1:]:
+        if not slots.acquire(blocking=False):
+            inline.append(name)
+            continue
+        futures[name] = f = pool.submit(_in_copied_context(g_values, queries[name]))
+        f.add_done_callback(lambda _: slots.release())  # also runs if the future is cancelled
+    try:
+        results = {name: queries[name]() for name in inline}
+        results.update((name, f.result()) for name, f in futures.items())
+        return {name: results[name] for name in names}
+    finally:
+        for f in futures.values():
+            f.cancel()
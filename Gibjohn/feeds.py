@@ -0,0 +1,105 @@
+# feeds.py — fan-out-on-write tutor activity feed: each ActivityLog row is copied into a
+# FEED_SIZE-slot ring buffer per tutor who teaches the learner, so the dashboard reads one key
+import click
+from flask.cli import AppGroup
+from sqlalchemy import select, insert, update, delete, func, desc
+from models import db, Class, ClassEnrollment, ActivityLog, TutorFeedHead, TutorFeedEntry
+
+FEED_SIZE = 50  # entries kept per tutor; changing it needs `flask feeds rebuild`
+
+
+def _dialect_insert(conn):
+    if conn.dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    elif conn.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        return None
+    return dialect_insert
+
+
+def _next_seq(conn, tutor_id: int) -> int:
+    """Bump and return the tutor's head counter (row-locked, so concurrent writers get distinct seqs)."""
+    dialect_insert = _dialect_insert(conn)
+    if dialect_insert is not None:
+        stmt = dialect_insert(TutorFeedHead).values(tutor_id=tutor_id, head=1)
+        stmt = stmt.on_conflict_do_update(index_elements=[TutorFeedHead.tutor_id],
+                                          set_={"head": TutorFeedHead.head + 1})
+        return conn.execute(stmt.returning(TutorFeedHead.head)).scalar_one()
+    head = conn.execute(update(TutorFeedHead).where(TutorFeedHead.tutor_id == tutor_id)
+                        .values(head=TutorFeedHead.head + 1).returning(TutorFeedHead.head)).scalar()
+    if head is None:
+        conn.execute(insert(TutorFeedHead).values(tutor_id=tutor_id, head=1))
+        head = 1
+    return head
+
+
+def _write_slot(conn, tutor_id: int, seq: int, activity_id: int, action: str, created_at) -> None:
+    values = {"tutor_id": tutor_id, "slot": seq % FEED_SIZE, "seq": seq,
+              "activity_id": activity_id, "action": action, "created_at": created_at}
+    dialect_insert = _dialect_insert(conn)
+    if dialect_insert is not None:
+        stmt = dialect_insert(TutorFeedEntry).values(**values)
+        conn.execute(stmt.on_conflict_do_update(
+            index_elements=[TutorFeedEntry.tutor_id, TutorFeedEntry.slot],
+            set_={k: stmt.excluded[k] for k in ("seq", "activity_id", "action", "created_at")},
+        ))
+        return
+    conn.execute(delete(TutorFeedEntry).where(TutorFeedEntry.tutor_id == tutor_id,
+                                              TutorFeedEntry.slot == values["slot"]))
+    conn.execute(insert(TutorFeedEntry).values(**values))
+
+
+def fan_out(conn, activity: ActivityLog, tutor_ids) -> None:
+    """Push one activity into each tutor's ring buffer, inside the writer's transaction."""
+    for tutor_id in tutor_ids:
+        seq = _next_seq(conn, tutor_id)
+        _write_slot(conn, tutor_id, seq, activity.activity_id, activity.action, activity.timestamp)
+
+
+def recent_activity(tutor_id: int, limit: int = 8) -> list[str]:
+    """Newest actions for a tutor's dashboard: one primary-key range read."""
+    return db.session.scalars(
+        select(TutorFeedEntry.action)
+        .where(TutorFeedEntry.tutor_id == tutor_id)
+        .order_by(desc(TutorFeedEntry.seq))
+        .limit(min(limit, FEED_SIZE))
+    ).all()
+
+
+def rebuild(tutor_ids=None) -> int:
+    """Refill ring buffers from activity_logs (the old fan-in query), e.g. after deploy or a FEED_SIZE change."""
+    if tutor_ids is None:
+        tutor_ids = db.session.scalars(select(func.distinct(Class.tutor_id))).all()
+    conn = db.session.connection()
+    written = 0
+    for tutor_id in tutor_ids:
+        conn.execute(delete(TutorFeedEntry).where(TutorFeedEntry.tutor_id == tutor_id))
+        conn.execute(delete(TutorFeedHead).where(TutorFeedHead.tutor_id == tutor_id))
+        learners = (select(ClassEnrollment.user_id)
+                    .join(Class, Class.class_id == ClassEnrollment.class_id)
+                    .where(Class.tutor_id == tutor_id))
+        latest = db.session.scalars(
+            select(ActivityLog).where(ActivityLog.user_id.in_(learners))
+            .order_by(desc(ActivityLog.timestamp), desc(ActivityLog.activity_id)).limit(FEED_SIZE)
+        ).all()
+        for activity in reversed(latest):  # oldest first, so seq order matches time order
+            fan_out(conn, activity, [tutor_id])
+        written += len(latest)
+    db.session.commit()
+    return written
+
+
+def init_app(app):
+    app.cli.add_command(feeds_cli)
+
+
+feeds_cli = AppGroup("feeds", help="Tutor activity feed commands.")
+
+
+@feeds_cli.command("rebuild")
+@click.option("--tutor", "tutor_ids", type=int, multiple=True, help="Only these tutor ids.")
+def rebuild_command(tutor_ids):
+    """Rebuild tutor activity ring buffers from activity_logs."""
+    n = rebuild(list(tutor_ids) or None)
+    click.echo(f"Wrote {n} feed entr{'y' if n == 1 else 'ies'} (FEED_SIZE={FEED_SIZE}).")
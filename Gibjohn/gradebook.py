@@ -0,0 +1,105 @@
+# gradebook.py — dense students x assignments score matrix for one class, from one query
+import base64
+import numpy as np
+from sqlalchemy import select, func, and_
+from models import db, ClassEnrollment, User, Assignment, Submission
+
+
+def gradebook_rows(class_id: int):
+    """
+    One row per (enrolled learner, assignment) — best score and attempt count —
+    ordered learner-major with the same assignment order in every block, so
+    the result reshapes straight into the matrix.
+    """
+    stmt = (
+        select(
+            ClassEnrollment.user_id,
+            func.coalesce(User.full_name, User.email).label("name"),
+            Assignment.assignment_id,
+            Assignment.title,
+            Assignment.due_date,
+            func.max(Submission.score).label("best"),
+            func.count(Submission.submission_id).label("attempts"),
+        )
+        .join(User, User.user_id == ClassEnrollment.user_id)
+        .join(Assignment, Assignment.class_id == ClassEnrollment.class_id)
+        .outerjoin(Submission, and_(Submission.assignment_id == Assignment.assignment_id,
+                                    Submission.user_id == ClassEnrollment.user_id))
+        .where(ClassEnrollment.class_id == class_id)
+        .group_by(ClassEnrollment.user_id, User.full_name, User.email,
+                  Assignment.assignment_id, Assignment.title, Assignment.due_date, Assignment.due_sort)
+        .order_by(func.lower(func.coalesce(User.full_name, User.email)), ClassEnrollment.user_id,
+                  Assignment.due_sort, Assignment.assignment_id)
+    )
+    return db.session.execute(stmt).all()
+
+
+def build(rows) -> dict:
+    """
+    students    – [(user_id, name)]            (rows of the matrix)
+    assignments – [(assignment_id, title, due)] (columns)
+    scores      – float32 (students x assignments), NaN where there's no score
+    done        – bool mask, True where the learner has submitted at all
+    """
+    if not rows:
+        return {"students": [], "assignments": [],
+                "scores": np.empty((0, 0), dtype=np.float32), "done": np.empty((0, 0), dtype=bool)}
+
+    first = rows[0].user_id
+    n_assignments = next((i for i, r in enumerate(rows) if r.user_id != first), len(rows))
+    shape = (len(rows) // n_assignments, n_assignments)
+
+    scores = np.fromiter((np.nan if r.best is None else r.best for r in rows),
+                         dtype=np.float32, count=len(rows)).reshape(shape)
+    done = np.fromiter((r.attempts > 0 for r in rows), dtype=bool, count=len(rows)).reshape(shape)
+    return {
+        "students": [(r.user_id, r.name) for r in rows[::n_assignments]],
+        "assignments": [(r.assignment_id, r.title, r.due_date) for r in rows[:n_assignments]],
+        "scores": scores,
+        "done": done,
+    }
+
+
+def _mean(totals: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    return np.divide(totals, counts, out=np.full(totals.shape, np.nan), where=counts > 0)
+
+
+def summarise(book: dict) -> dict:
+    """Completion (0..1) and average score, per learner (axis 1) and per assignment (axis 0)."""
+    scores, done = book["scores"], book["done"]
+    scored = ~np.isnan(scores)
+    totals = np.where(scored, scores, 0).astype(np.float64)
+    return {
+        "student_completion": done.mean(axis=1) if done.shape[1] else np.zeros(done.shape[0]),
+        "student_average": _mean(totals.sum(axis=1), scored.sum(axis=1)),
+        "assignment_completion": done.mean(axis=0) if done.shape[0] else np.zeros(done.shape[1]),
+        "assignment_average": _mean(totals.sum(axis=0), scored.sum(axis=0)),
+        "completion": float(done.mean()) if done.size else 0.0,
+        "average": float(_mean(totals.sum(), scored.sum())) if done.size else float("nan"),
+    }
+
+
+def _json_floats(values, digits: int = 1) -> list:
+    return [None if np.isnan(v) else round(float(v), digits) for v in values]
+
+
+def payload(book: dict, stats: dict) -> dict:
+    """
+    JSON-ready matrix: scores as row-major array-of-arrays of whole percents
+    (null = no score), and `done` as a base64 np.packbits bitmask (row-major,
+    most significant bit first) — ~40 bytes per learner for 300 assignments.
+    """
+    scores = book["scores"]
+    whole = np.where(np.isnan(scores), -1, np.rint(scores)).astype(np.int16).tolist()
+    return {
+        "students": [{"id": uid, "name": name} for uid, name in book["students"]],
+        "assignments": [{"id": aid, "title": title, "due": due.isoformat() if due else None}
+                        for aid, title, due in book["assignments"]],
+        "shape": list(scores.shape),
+        "scores": [[None if v < 0 else v for v in row] for row in whole],
+        "done": base64.b64encode(np.packbits(book["done"], axis=None).tobytes()).decode(),
+        "student_completion": _json_floats(stats["student_completion"] * 100),
+        "student_average": _json_floats(stats["student_average"]),
+        "assignment_completion": _json_floats(stats["assignment_completion"] * 100),
+        "assignment_average": _json_floats(stats["assignment_average"]),
+    }
@@ -0,0 +1,82 @@
+# gunicorn.conf.py — production server settings (`gunicorn -c gunicorn.conf.py wsgi:app`)
+# Per-worker RSS and boot time, with and without preload: `python bench_workers.py --workers 4`.
+import gc
+import multiprocessing
+import os
+import signal
+import sys
+import time
+
+_started = time.monotonic()
+
+bind = os.getenv("BIND", f"0.0.0.0:{os.getenv('PORT', '8000')}")
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+# Live dashboard streams (SSE) are spread over all the workers: events travel through the
+# live_events table, which one dispatcher per worker tails (events.py), so a stream sees
+# submissions saved by any worker and Last-Event-ID ids are global.
+# gevent workers by default: an open stream is a greenlet parked on its topic's Condition,
+# so a worker holds hundreds of them (SSE_MAX_STREAMS, default half of worker_connections)
+# alongside ordinary requests. Under gthread (GUNICORN_WORKER_CLASS=gthread, or gevent not
+# installed) each stream parks one of `threads`, so the cap drops to SSE_MAX_STREAMS=4.
+# Open streams and a page's latency alongside them: `python bench_sse.py --streams 300`.
+try:
+    import gevent  # noqa: F401
+    _default_class = "gevent"
+except ImportError:
+    _default_class = "gthread"
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", _default_class)
+threads = int(os.getenv("GUNICORN_THREADS", 8))
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", 1000))  # gevent: open sockets per worker
+
+if worker_class == "gevent":
+    # patch before the preloaded app creates its locks and threads, not just in each worker
+    from gevent import monkey
+    monkey.patch_all()
+    os.environ.setdefault("SSE_MAX_STREAMS", str(worker_connections // 2))
+
+# import the app once in the master so workers share its pages copy-on-write
+preload_app = os.getenv("GUNICORN_PRELOAD", "1") != "0"
+
+# recycle workers to cap slow leaks; jitter keeps them from all restarting together
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 1000))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", 100))
+
+timeout = 60             # a worker silent this long is killed and replaced
+graceful_timeout = 30    # SIGTERM: stop accepting, finish in-flight requests for up to this long
+keepalive = 5
+
+accesslog = "-"
+errorlog = "-"
+
+
+def when_ready(server):
+    if preload_app:
+        # move everything imported so far out of the collector's generations, so
+        # gc passes in workers don't write to (and un-share) the preloaded pages
+        gc.freeze()
+    server.log.info("master ready in %.2fs (preload=%s)", time.monotonic() - _started, preload_app)
+
+
+def post_fork(server, worker):
+    """Never let a worker reuse pooled connections inherited from the master."""
+    app_module = sys.modules.get("app")
+    if app_module is None:  # not preloaded: the worker builds its own engines on import
+        return
+    from models import db
+    with app_module.app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)  # drop the parent's pool without closing its sockets
+
+
+def post_worker_init(worker):
+    """On SIGTERM end open SSE streams first, so the graceful drain isn't held up by them."""
+    previous = signal.getsignal(signal.SIGTERM)
+
+    def drain(signum, frame):
+        from events import broker
+        broker.close()
+        if callable(previous):
+            previous(signum, frame)
+
+    signal.signal(signal.SIGTERM, drain)
+    worker.log.info("worker %s booted in %.2fs since master start", worker.pid, time.monotonic() - _started)
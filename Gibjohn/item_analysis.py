@@ -0,0 +1,107 @@
+# item_analysis.py — packed per-answer storage + vectorised item analysis
+import numpy as np
+
+# Each answer is one nibble: 0 = blank, 1..15 = choice index + 1.
+# Two answers per byte, first answer in the high nibble.
+BLANK = -1
+MAX_CHOICES = 15
+
+
+def pack_responses(choices) -> bytes:
+    """Pack a list of choice indices (None/-1 for blank) into bytes."""
+    nibbles = []
+    for c in choices:
+        if c is None or c < 0:
+            nibbles.append(0)
+        elif c >= MAX_CHOICES:
+            raise ValueError(f"choice index {c} does not fit in a nibble")
+        else:
+            nibbles.append(c + 1)
+    if len(nibbles) % 2:
+        nibbles.append(0)
+    return bytes((hi << 4) | lo for hi, lo in zip(nibbles[0::2], nibbles[1::2]))
+
+
+def unpack_responses(blob: bytes, n_items: int) -> list[int]:
+    """Inverse of pack_responses for a single submission."""
+    return response_matrix([blob], n_items)[0].tolist()
+
+
+def response_matrix(blobs, n_items: int) -> np.ndarray:
+    """
+    Decode many packed submissions into an (attempts x items) int8 matrix.
+    Blanks (and short/legacy rows) come back as BLANK.
+    """
+    width = (n_items + 1) // 2
+    blobs = [b[:width].ljust(width, b"\x00") for b in blobs if b is not None]
+    if not blobs:
+        return np.empty((0, n_items), dtype=np.int8)
+
+    packed = np.frombuffer(b"".join(blobs), dtype=np.uint8).reshape(len(blobs), width)
+    out = np.empty((len(blobs), width * 2), dtype=np.int8)
+    out[:, 0::2] = packed >> 4
+    out[:, 1::2] = packed & 0x0F
+    return out[:, :n_items] - 1
+
+
+def analyse(matrix: np.ndarray, key, n_choices: int) -> dict:
+    """
+    Classical item analysis over an (attempts x items) choice matrix.
+
+    difficulty     – proportion answering each item correctly (p-value)
+    discrimination – corrected point-biserial: item vs. rest-of-test score
+    distractors    – (items x choices) frequency of each option, plus blanks
+    """
+    key = np.asarray(key, dtype=np.int8)
+    n_attempts, n_items = matrix.shape
+    if n_attempts == 0:
+        return {
+            "attempts": 0,
+            "difficulty": np.zeros(n_items),
+            "discrimination": np.zeros(n_items),
+            "distractors": np.zeros((n_items, n_choices), dtype=np.int64),
+            "blanks": np.zeros(n_items, dtype=np.int64),
+        }
+
+    correct = (matrix == key).astype(np.float64)
+    difficulty = correct.mean(axis=0)
+
+    rest = correct.sum(axis=1, keepdims=True) - correct
+    dc = correct - difficulty
+    dr = rest - rest.mean(axis=0)
+    denom = np.sqrt((dc ** 2).sum(axis=0) * (dr ** 2).sum(axis=0))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        discrimination = np.where(denom > 0, (dc * dr).sum(axis=0) / denom, 0.0)
+
+    # one-hot count of every option per item: (items x choices)
+    distractors = (matrix[:, :, None] == np.arange(n_choices, dtype=np.int8)).sum(axis=0)
+    blanks = (matrix == BLANK).sum(axis=0)
+
+    return {
+        "attempts": n_attempts,
+        "difficulty": difficulty,
+        "discrimination": discrimination,
+        "distractors": distractors,
+        "blanks": blanks,
+    }
+
+
+def item_rows(stats: dict, key, labels, choice_labels) -> list[dict]:
+    """Flatten analyse() output into template-friendly rows."""
+    n = max(stats["attempts"], 1)
+    rows = []
+    for i, label in enumerate(labels):
+        counts = stats["distractors"][i]
+        rows.append({
+            "item": label,
+            "answer": choice_labels[key[i]],
+            "difficulty": round(float(stats["difficulty"][i]) * 100, 1),
+            "discrimination": round(float(stats["discrimination"][i]), 2),
+            "options": [
+                {"label": choice_labels[c], "pct": round(100 * int(counts[c]) / n, 1),
+                 "correct": c == key[i]}
+                for c in range(len(choice_labels))
+            ],
+            "blank_pct": round(100 * int(stats["blanks"][i]) / n, 1),
+        })
+    return rows
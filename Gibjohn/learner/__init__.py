@@ -1,4 +1,4 @@
 # tutor/__init__.py
 from flask import Blueprint
 bp = Blueprint("learner", __name__, template_folder="../templates/learner")
-from . import routes  # noqa
\ No newline at end of file
+from . import routes, progress, rewards, reminders  # noqa
\ No newline at end of file
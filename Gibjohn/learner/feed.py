@@ -0,0 +1,62 @@
+# learner/feed.py — "due soon" assignment feed for the learner dashboard
+from flask import current_app
+from sqlalchemy import func, select, desc
+from models import db, Class, ClassEnrollment, Assignment, Submission
+
+ENROLLMENT_TTL = 300  # seconds; enrol/unenrol paths invalidate explicitly
+
+
+def enrolled_class_ids(user_id: int) -> tuple[int, ...]:
+    """The learner's class ids, cached host-wide in the shared cache."""
+    return current_app.extensions["cache"].get_or_set(
+        user_id,
+        lambda: tuple(db.session.scalars(
+            select(ClassEnrollment.class_id).filter(ClassEnrollment.user_id == user_id)
+        ).all()),
+        ttl=ENROLLMENT_TTL, ns="enrollments",
+    )
+
+
+def invalidate_enrollments(user_id: int) -> None:
+    current_app.extensions["cache"].delete(user_id, ns="enrollments")
+
+
+def due_feed(user_id: int, limit: int = 10):
+    """
+    Assignments for the learner's classes, soonest due first (undated last,
+    then newest), each with the learner's attempt count and best score.
+    One statement. Each class's rows come from ix_assignments_class_due_sort
+    (covering, already in order); for one class that is the ORDER BY, for
+    several SQLite merges them with a temp B-tree sort over the learner's
+    assignments before the LIMIT.
+    """
+    class_ids = enrolled_class_ids(user_id)
+    if not class_ids:
+        return []
+
+    mine = (
+        select(
+            Submission.assignment_id,
+            func.count(Submission.submission_id).label("attempts"),
+            func.max(Submission.score).label("best_score"),
+        )
+        .filter(Submission.user_id == user_id)
+        .group_by(Submission.assignment_id)
+    ).subquery()
+
+    stmt = (
+        select(
+            Assignment.assignment_id,
+            Assignment.title,
+            Assignment.due_date,
+            Class.title.label("class_title"),
+            func.coalesce(mine.c.attempts, 0).label("attempts"),
+            mine.c.best_score,
+        )
+        .join(Class, Class.class_id == Assignment.class_id)
+        .outerjoin(mine, mine.c.assignment_id == Assignment.assignment_id)
+        .filter(Assignment.class_id.in_(class_ids))
+        .order_by(Assignment.due_sort.asc(), desc(Assignment.created_at))
+        .limit(limit)
+    )
+    return db.session.execute(stmt).all()
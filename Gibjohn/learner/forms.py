@@ -33,3 +33,10 @@ class QuizForm(FlaskForm):
         validators=[DataRequired()],
     )
     submit = SubmitField("Submit Quiz")
+
+
+# Answer key for the MVP quiz; every question offers the same A/B/C options,
+# so a letter's position in CHOICE_LETTERS is its packed choice index.
+CHOICE_LETTERS = ("A", "B", "C")
+ANSWER_KEY = {"question1": "A", "question2": "C", "question3": "B"}
+QUESTION_FIELDS = tuple(ANSWER_KEY)
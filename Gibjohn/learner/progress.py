@@ -0,0 +1,162 @@
+# learner/progress.py — Progress row kept up to date on every quiz/lesson write
+from datetime import datetime, timezone
+import click
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from models import db, Progress, Submission, Assignment, Class, ActivityLog, LessonCompletion
+from learner.rewards import award_crossed
+
+from . import bp
+
+XP_PER_LEVEL = 500
+LESSON_XP = 30
+DASHBOARD_SUBJECTS = ("maths", "english", "science")
+
+
+def subject_key(subject: str | None) -> str:
+    return (subject or "misc").strip().lower()
+
+
+def _locked_progress(user_id: int) -> Progress:
+    """The learner's Progress row, row-locked for this transaction (created on first use)."""
+    p = (Progress.query
+         .filter_by(user_id=user_id)
+         .with_for_update()
+         .one_or_none())
+    if p is None:
+        p = Progress(user_id=user_id, attempts=0, xp=0, lessons_completed=0, subjects={})
+        db.session.add(p)
+    return p
+
+
+def _bump_subject(p: Progress, subject: str, xp: int, score: float | None = None) -> None:
+    key = subject_key(subject)
+    cur = dict(p.subjects.get(key) or {"xp": 0, "attempts": 0, "score_sum": 0.0})
+    cur["xp"] += xp
+    if score is not None:
+        cur["attempts"] += 1
+        cur["score_sum"] += float(score)
+    p.subjects[key] = cur  # reassign so MutableDict flags the change
+
+
+def record_quiz_attempt(user_id: int, subject: str, score: float, xp: int) -> Progress:
+    """Call before committing a new Submission; joins the same transaction."""
+    p = _locked_progress(user_id)
+    p.attempts = (p.attempts or 0) + 1
+    p.best_score = score if p.best_score is None else max(p.best_score, score)
+    p.last_attempted = datetime.now(timezone.utc)
+    old_xp = p.xp or 0
+    p.xp = old_xp + xp
+    _bump_subject(p, subject, xp, score)
+    award_crossed(user_id, old_xp, p.xp)
+    return p
+
+
+def mark_lesson_complete(user_id: int, assignment_id: int) -> bool:
+    """
+    Record that the learner finished this lesson, in the caller's transaction.
+    False if they already had: the lesson's XP was credited that time.
+    """
+    try:
+        with db.session.begin_nested():
+            db.session.add(LessonCompletion(user_id=user_id, assignment_id=assignment_id))
+        return True
+    except IntegrityError:
+        return False
+
+
+def record_lesson_complete(user_id: int, subject: str, xp: int = LESSON_XP) -> Progress:
+    """Call after mark_lesson_complete returns True, before committing the lesson-complete ActivityLog row."""
+    p = _locked_progress(user_id)
+    p.lessons_completed = (p.lessons_completed or 0) + 1
+    old_xp = p.xp or 0
+    p.xp = old_xp + xp
+    _bump_subject(p, subject, xp)
+    award_crossed(user_id, old_xp, p.xp)
+    return p
+
+
+def progress_summary(user_id: int) -> dict:
+    """Template numbers for the XP card and subject meters — one indexed row read."""
+    p = Progress.query.filter_by(user_id=user_id).one_or_none()
+    xp = (p.xp or 0) if p else 0
+    subjects = (p.subjects or {}) if p else {}
+
+    def mastery(key):
+        s = subjects.get(key)
+        if not s or not s.get("attempts"):
+            return 0
+        return round(s["score_sum"] / s["attempts"])
+
+    summary = {
+        "level": xp // XP_PER_LEVEL + 1,
+        "xp": round(100 * (xp % XP_PER_LEVEL) / XP_PER_LEVEL),  # % through current level
+        "xp_total": xp,
+    }
+    summary.update({key: mastery(key) for key in DASHBOARD_SUBJECTS})
+    return summary
+
+
+def rebuild_progress() -> int:
+    """
+    Recompute every Progress row from history (one-off backfill / repair).
+    Lesson completions only exist as ActivityLog text, so their XP counts
+    towards the total but not towards a subject.
+    """
+    quiz_rows = (
+        db.session.query(
+            Submission.user_id,
+            Class.subject,
+            func.count(Submission.submission_id),
+            func.coalesce(func.sum(Submission.score), 0),
+            func.max(Submission.score),
+            func.max(Submission.submitted_at),
+        )
+        .join(Assignment, Assignment.assignment_id == Submission.assignment_id)
+        .join(Class, Class.class_id == Assignment.class_id)
+        .group_by(Submission.user_id, Class.subject)
+        .all()
+    )
+    lesson_counts = dict(
+        db.session.query(ActivityLog.user_id, func.count(ActivityLog.activity_id))
+        .filter(ActivityLog.action.like("Finished lesson%"))
+        .group_by(ActivityLog.user_id)
+        .all()
+    )
+
+    fresh = {}
+    for uid, subject, n, total, best, last in quiz_rows:
+        p = fresh.setdefault(uid, {"attempts": 0, "xp": 0, "best_score": None,
+                                   "last_attempted": None, "subjects": {}})
+        p["attempts"] += n
+        p["xp"] += int(total)  # XP == % score per quiz
+        p["best_score"] = best if p["best_score"] is None else max(p["best_score"], best or 0)
+        p["last_attempted"] = last if p["last_attempted"] is None else max(p["last_attempted"], last)
+        key = subject_key(subject)
+        cur = p["subjects"].setdefault(key, {"xp": 0, "attempts": 0, "score_sum": 0.0})
+        cur["xp"] += int(total)
+        cur["attempts"] += n
+        cur["score_sum"] += float(total)
+
+    existing = {p.user_id: p for p in Progress.query.all()}
+    for uid in set(fresh) | set(lesson_counts) | set(existing):
+        data = fresh.get(uid, {"attempts": 0, "xp": 0, "best_score": None,
+                               "last_attempted": None, "subjects": {}})
+        lessons = lesson_counts.get(uid, 0)
+        p = existing.get(uid) or Progress(user_id=uid)
+        p.attempts = data["attempts"]
+        p.best_score = data["best_score"]
+        p.last_attempted = data["last_attempted"]
+        p.lessons_completed = lessons
+        p.xp = data["xp"] + lessons * LESSON_XP
+        p.subjects = data["subjects"]
+        db.session.add(p)
+    db.session.commit()
+    return len(set(fresh) | set(lesson_counts) | set(existing))
+
+
+@bp.cli.command("rebuild-progress")
+def rebuild_progress_command():
+    """Recompute learner Progress rows from submissions and activity history."""
+    n = rebuild_progress()
+    click.echo(f"Rebuilt progress for {n} learner(s).")
@@ -0,0 +1,87 @@
+# learner/reminders.py — one digest email per learner listing work due soon that they haven't submitted
+from datetime import datetime, timedelta, timezone
+from itertools import groupby
+import click
+from flask import current_app
+from sqlalchemy import select, insert, exists, and_
+from models import db, User, Class, ClassEnrollment, Assignment, Submission, ReminderSent, school_now
+from mail import make_transport, build_message
+
+from . import bp
+
+
+def due_unsubmitted(hours: int, now: datetime | None = None):
+    """
+    Every (learner, assignment) pair due within `hours` with no submission and
+    no reminder yet, in one statement, ordered by learner then due date.
+    `now` is naive school-local time, like due_date.
+    """
+    now = now or school_now()
+    stmt = (
+        select(User.user_id, User.email, User.full_name,
+               Assignment.assignment_id, Assignment.title, Assignment.due_date,
+               Class.title.label("class_title"))
+        .join(ClassEnrollment, ClassEnrollment.user_id == User.user_id)
+        .join(Class, Class.class_id == ClassEnrollment.class_id)
+        .join(Assignment, Assignment.class_id == ClassEnrollment.class_id)
+        # due_sort == due_date for dated work, so the range uses ix_assignments_class_due_sort
+        .where(Assignment.due_sort > now, Assignment.due_sort <= now + timedelta(hours=hours))
+        .where(User.role == "learner", User.deleted_at.is_(None))
+        .where(~exists().where(and_(Submission.user_id == User.user_id,
+                                    Submission.assignment_id == Assignment.assignment_id)))
+        .where(~exists().where(and_(ReminderSent.user_id == User.user_id,
+                                    ReminderSent.assignment_id == Assignment.assignment_id)))
+        .order_by(User.user_id, Assignment.due_sort)
+    )
+    return db.session.execute(stmt).all()
+
+
+def digest(rows) -> tuple[str, str]:
+    """(subject, body) for one learner's due rows."""
+    first = rows[0]
+    subject = (f"Due soon: {first.title}" if len(rows) == 1
+               else f"{len(rows)} assignments due soon")
+    lines = [f"Hi {first.full_name or 'there'},", "", "These are due soon and you haven't submitted them yet:", ""]
+    lines += [f"  • {r.title} ({r.class_title}) — due {r.due_date:%a %d %b, %H:%M}" for r in rows]
+    lines += ["", "Log in to Gibjohn to open them.", ""]
+    return subject, "\n".join(lines)
+
+
+def send_reminders(hours: int, batch_size: int, dry_run: bool = False) -> tuple[int, int]:
+    """Send digests in batches over one transport; returns (emails, assignments)."""
+    pairs = due_unsubmitted(hours)
+    emails = assignments = 0
+    batch, sent_rows = [], []
+
+    with make_transport() as transport:
+        def flush():
+            nonlocal batch, sent_rows
+            if not dry_run and batch:
+                transport.send_many(batch)
+                db.session.execute(insert(ReminderSent), sent_rows)  # executemany
+                db.session.commit()
+            batch, sent_rows = [], []
+
+        now = datetime.now(timezone.utc)
+        for user_id, group in groupby(pairs, key=lambda r: r.user_id):
+            rows = list(group)
+            subject, body = digest(rows)
+            batch.append(build_message(rows[0].email, subject, body))
+            sent_rows += [{"user_id": user_id, "assignment_id": r.assignment_id, "sent_at": now} for r in rows]
+            emails += 1
+            assignments += len(rows)
+            if len(batch) >= batch_size:
+                flush()
+        flush()
+    return emails, assignments
+
+
+@bp.cli.command("send-reminders")
+@click.option("--hours", default=24, show_default=True, help="Remind about work due within this many hours.")
+@click.option("--batch-size", default=None, type=int, help="Messages per send/commit (default MAIL_BATCH_SIZE).")
+@click.option("--dry-run", is_flag=True, help="Count what would be sent; send nothing.")
+def send_reminders_command(hours, batch_size, dry_run):
+    """Email each learner one digest of unsubmitted work due soon (run from cron; per school via `tenants each`)."""
+    emails, n = send_reminders(hours, batch_size or current_app.config["MAIL_BATCH_SIZE"], dry_run)
+    verb = "Would send" if dry_run else "Sent"
+    click.echo(f"{verb} {emails} digest(s) covering {n} assignment(s).")
@@ -0,0 +1,100 @@
+# learner/rewards.py — award Reward rows as a learner's XP crosses their criteria
+from bisect import bisect_right
+from datetime import datetime, timezone
+import click
+from flask import current_app
+from sqlalchemy import event, insert, select, and_, exists, literal
+from sqlalchemy.exc import IntegrityError
+from models import db, Reward, UserReward, Progress, ActivityLog
+
+from . import bp
+
+CACHE_TTL = 300  # seconds; backstop only, Reward writes invalidate the shared entry
+
+
+def _load_thresholds():
+    rows = db.session.execute(
+        select(Reward.criteria, Reward.reward_id, Reward.title).order_by(Reward.criteria, Reward.reward_id)
+    ).all()
+    return [c for c, _, _ in rows], [(rid, title) for _, rid, title in rows]
+
+
+def _thresholds():
+    """Rewards sorted by criteria: parallel lists of thresholds and (id, title)."""
+    return current_app.extensions["cache"].get_or_set("thresholds", _load_thresholds, ttl=CACHE_TTL, ns="rewards")
+
+
+def invalidate_cache(*_args):
+    current_app.extensions["cache"].invalidate("rewards")
+
+
+for _evt in ("after_insert", "after_update", "after_delete"):
+    event.listen(Reward, _evt, invalidate_cache)
+
+
+def _insert_ignoring_duplicates(rows) -> set[int]:
+    """Insert user_rewards rows, skipping already-earned ones; returns the reward_ids actually inserted."""
+    dialect = db.session.get_bind().dialect.name
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        # no ON CONFLICT: one savepoint per row, so a duplicate only skips itself
+        inserted = set()
+        for row in rows:
+            try:
+                with db.session.begin_nested():
+                    db.session.execute(insert(UserReward).values(row))
+                inserted.add(row["reward_id"])
+            except IntegrityError:
+                pass
+        return inserted
+    stmt = dialect_insert(UserReward).values(rows).on_conflict_do_nothing().returning(UserReward.reward_id)
+    return set(db.session.scalars(stmt))
+
+
+def award_crossed(user_id: int, old_xp: int, new_xp: int) -> list[str]:
+    """
+    Award every reward with old_xp < criteria <= new_xp in one INSERT.
+    Joins the caller's transaction; returns the titles newly awarded (a
+    reward the learner already holds is neither logged nor returned).
+    """
+    if new_xp <= old_xp:
+        return []
+    criteria, rewards = _thresholds()
+    lo, hi = bisect_right(criteria, old_xp), bisect_right(criteria, new_xp)
+    if lo == hi:
+        return []
+
+    now = datetime.now(timezone.utc)
+    crossed = rewards[lo:hi]
+    inserted = _insert_ignoring_duplicates(
+        [{"user_id": user_id, "reward_id": rid, "earned_at": now} for rid, _ in crossed]
+    )
+    awarded = [title for rid, title in crossed if rid in inserted]
+    for title in awarded:
+        db.session.add(ActivityLog(user_id=user_id, action=f"Unlocked badge — {title}"))
+    return awarded
+
+
+def backfill_rewards() -> int:
+    """Grant every reward a learner's current XP already qualifies for, in one statement."""
+    missing = (
+        select(Progress.user_id, Reward.reward_id, literal(datetime.now(timezone.utc)))
+        .join(Reward, Reward.criteria <= Progress.xp)
+        .where(~exists().where(and_(UserReward.user_id == Progress.user_id,
+                                    UserReward.reward_id == Reward.reward_id)))
+    )
+    result = db.session.execute(
+        insert(UserReward).from_select(["user_id", "reward_id", "earned_at"], missing)
+    )
+    db.session.commit()
+    return result.rowcount
+
+
+@bp.cli.command("backfill-rewards")
+def backfill_rewards_command():
+    """Award rewards that existing learners have already earned."""
+    n = backfill_rewards()
+    click.echo(f"Awarded {n} reward(s).")
@@ -1,13 +1,16 @@
 # learner/routes.py
-from urllib.parse import parse_qs, urlparse
-from flask import render_template, redirect, url_for, flash, request
+from flask import render_template, redirect, url_for, flash
 from flask_login import login_required, current_user
 from flask_wtf import FlaskForm
-from models import db, Class, ClassEnrollment, Assignment, Submission, ActivityLog
-from sqlalchemy import desc
+from models import db, Class, ClassEnrollment, Assignment, Submission, ActivityLog, LessonCompletion
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import joinedload
-from learner.forms import QuizForm
+from learner.forms import QuizForm, ANSWER_KEY, CHOICE_LETTERS, QUESTION_FIELDS
 from models import Submission
+from item_analysis import pack_responses
+from learner.progress import (record_quiz_attempt, record_lesson_complete, mark_lesson_complete,
+                              progress_summary, LESSON_XP)
+from learner.feed import due_feed, enrolled_class_ids, invalidate_enrollments
 
 from . import bp
 
@@ -15,35 +18,21 @@ class EmptyForm(FlaskForm):
     pass
 
 
-from urllib.parse import urlparse
-
-def youtube_embed_src(raw_url: str) -> str | None:
-    try:
-        u = urlparse(raw_url)
-        host = u.netloc.replace("www.", "")
-        if "youtube.com" in host:
-            if u.path == "/watch":
-                vid = parse_qs(u.query).get("v", [None])[0]
-                return f"https://www.youtube-nocookie.com/embed/{vid}" if vid else None
-            if u.path.startswith("/embed/"):
-                return f"https://www.youtube-nocookie.com{u.path}"
-        if "youtu.be" in host:
-            vid = u.path.lstrip("/")
-            return f"https://www.youtube-nocookie.com/embed/{vid}"
-    except Exception:
-        pass
-    return None
-
-
 def auto_enroll_if_needed(user):
     """MVP: if a student has no classes, enrol them to the first class."""
     if not user.is_authenticated or user.role != "learner":
         return
-    if not user.enrollments:
+    if not enrolled_class_ids(user.user_id):
         first_class = Class.query.order_by(Class.created_at.asc()).first()
         if first_class:
-            db.session.add(ClassEnrollment(class_id=first_class.class_id, user_id=user.user_id))
+            # the cached ids can be stale (or another request got here first): a duplicate is a no-op
+            try:
+                with db.session.begin_nested():
+                    db.session.add(ClassEnrollment(class_id=first_class.class_id, user_id=user.user_id))
+            except IntegrityError:
+                pass
             db.session.commit()
+            invalidate_enrollments(user.user_id)
 
 @bp.route("/learner/dashboard", methods=["GET"])
 @login_required
@@ -51,29 +40,14 @@ def dashboard():
     form = EmptyForm()
     auto_enroll_if_needed(current_user)
 
-    # Get the student's class ids
-    class_ids_q = (db.session.query(ClassEnrollment.class_id)
-                .filter(ClassEnrollment.user_id == current_user.user_id))
-
-    # Fetch assignments for those classes
-    assignments = (Assignment.query
-        .filter(Assignment.class_id.in_(class_ids_q))
-        .options(
-            joinedload(Assignment.class_),     # a.class_.title
-            joinedload(Assignment.resource),   # a.resource.title
-        )
-        # Order: due soonest first; undated ones after; then newest created
-        .order_by(Assignment.due_date.is_(None), Assignment.due_date.asc(), desc(Assignment.created_at))
-        .limit(10)
-        .all()
-    )
+    # Soonest-due assignments + whether this learner has already submitted
+    assignments = due_feed(current_user.user_id, limit=10)
 
     return render_template(
         "learner/learner_dashboard.html",  # ensure the folder prefix is correct
         form=form,
         assignments=assignments,
-        # demo numbers you were using
-        level=3, xp=70, maths=65, english=82, science=35,
+        **progress_summary(current_user.user_id),
     )
 
 
@@ -95,20 +69,15 @@ def lesson(assignment_id):
         "start_url": url_for("learner.quiz", assignment_id=assignment_id),
     }]
 
-    # Build a YouTube thumbnail if the resource is a YT link
-    yt = (a.resource.url or "") if (a.resource and a.resource.type == "link") else ""
-    vid = None
-    if "youtu.be/" in yt:
-        vid = yt.rsplit("/", 1)[-1].split("?")[0]
-    elif "youtube.com/watch" in yt and "v=" in yt:
-        vid = parse_qs(urlparse(yt).query).get("v", [None])[0]
-    thumb_url = f"https://img.youtube.com/vi/{vid}/hqdefault.jpg" if vid else None
+    # Thumbnail precomputed when the link was added (tutor/links.py)
+    thumb_url = a.resource.thumb_url if a.resource else None
 
+    summary = progress_summary(current_user.user_id)
     return render_template(
         "learner/lesson.html",
         assignment=a,
         quizzes=quizzes,
-        level=3, xp=70,
+        level=summary["level"], xp=summary["xp"],
         thumb_url=thumb_url
     )
 @bp.route("/lesson/<int:assignment_id>/play")
@@ -118,41 +87,64 @@ def play_lesson(assignment_id):
     if not a:
         flash("Lesson not found.", "error")
         return redirect(url_for("learner.dashboard"))
-    embed_src = None
-    if a.resource and a.resource.type == "link" and a.resource.url:
-        embed_src = youtube_embed_src(a.resource.url)
+    embed_src = a.resource.embed_url if a.resource else None
 
+    summary = progress_summary(current_user.user_id)
     return render_template(
         "learner/player.html",
         assignment=a,
+        form=EmptyForm(),
         embed_src=embed_src,
-        level=3,
-        xp=70,
+        level=summary["level"],
+        xp=summary["xp"],
     )
 # --- FINISH PAGES ---
-@bp.route("/lesson/<int:assignment_id>/complete", methods=["GET"])
-@login_required
-def lesson_complete(assignment_id):
+def _enrolled_assignment(assignment_id: int):
+    """The assignment, if it's in one of the current learner's classes."""
     a = db.session.get(Assignment, assignment_id)
-    if not a:
+    if a is None or a.class_id not in enrolled_class_ids(current_user.user_id):
         flash("Lesson not found.", "error")
+        return None
+    return a
+
+
+@bp.route("/lesson/<int:assignment_id>/complete", methods=["POST"])
+@login_required
+def finish_lesson(assignment_id):
+    a = _enrolled_assignment(assignment_id)
+    if not a:
         return redirect(url_for("learner.dashboard"))
+    if not EmptyForm().validate_on_submit():
+        flash("Invalid or expired form. Please try again.", "error")
+        return redirect(url_for("learner.play_lesson", assignment_id=assignment_id))
 
-    # Log simple activity + (optional) award XP in your own system later
-    db.session.add(ActivityLog(
-        user_id=current_user.user_id,
-        action=f"Finished lesson — {a.title} (+30 XP)"
-    ))
+    # Log activity + award XP in the same transaction, the first time only
+    if mark_lesson_complete(current_user.user_id, a.assignment_id):
+        db.session.add(ActivityLog(
+            user_id=current_user.user_id,
+            action=f"Finished lesson — {a.title} (+{LESSON_XP} XP)"
+        ))
+        record_lesson_complete(current_user.user_id, a.class_.subject if a.class_ else None)
     db.session.commit()
+    return redirect(url_for("learner.lesson_complete", assignment_id=assignment_id))
+
+
+@bp.route("/lesson/<int:assignment_id>/complete", methods=["GET"])
+@login_required
+def lesson_complete(assignment_id):
+    a = _enrolled_assignment(assignment_id)
+    if not a:
+        return redirect(url_for("learner.dashboard"))
+    if db.session.get(LessonCompletion, (current_user.user_id, a.assignment_id)) is None:
+        return redirect(url_for("learner.play_lesson", assignment_id=assignment_id))
 
     return render_template(
         "learner/lesson_complete.html",
         assignment=a,
-        xp_award=30
+        xp_award=LESSON_XP
     )
 
 
-
 @bp.route("/lesson/<int:assignment_id>/quiz", methods=["GET", "POST"])
 @login_required
 def quiz(assignment_id):
@@ -163,25 +155,30 @@ def quiz(assignment_id):
 
     form = QuizForm()
     if form.validate_on_submit():
-        # Answer key for MVP
-        key = {"question1": "A", "question2": "C", "question3": "B"}
-        given = {
-            "question1": form.question1.data,
-            "question2": form.question2.data,
-            "question3": form.question3.data,
-        }
-        correct = sum(1 for k in key if given.get(k) == key[k])
-        total = 3
+        given = {f: getattr(form, f).data for f in QUESTION_FIELDS}
+        correct = sum(1 for k in ANSWER_KEY if given.get(k) == ANSWER_KEY[k])
+        total = len(QUESTION_FIELDS)
         score_pct = round((correct / total) * 100)
 
-        # Save a submission row
+        # Save a submission row (+ every answer, packed for item analysis)
         sub = Submission(
             assignment_id=assignment.assignment_id,
             user_id=current_user.user_id,
             status="submitted",
             score=score_pct,
+            responses=pack_responses(
+                CHOICE_LETTERS.index(given[f]) if given[f] in CHOICE_LETTERS else None
+                for f in QUESTION_FIELDS
+            ),
         )
         db.session.add(sub)
+        xp_awarded = score_pct  # simple MVP: XP == % score
+        record_quiz_attempt(
+            current_user.user_id,
+            assignment.class_.subject if assignment.class_ else None,
+            score_pct,
+            xp_awarded,
+        )
         db.session.commit()
 
         # Render finish page with results
@@ -191,7 +188,7 @@ def quiz(assignment_id):
             correct=correct,
             total=total,
             score=score_pct,
-            xp_awarded=score_pct,  # simple MVP: XP == % score
+            xp_awarded=xp_awarded,
         )
 
     return render_template("learner/quiz.html", assignment=assignment, form=form)
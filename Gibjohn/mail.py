@@ -0,0 +1,111 @@
+# mail.py — outgoing email through a pluggable transport (SMTP, or .eml files for local runs)
+import os
+import smtplib
+import time
+from abc import ABC, abstractmethod
+from email.message import EmailMessage
+from flask import current_app
+
+
+class Transport(ABC):
+    """Open once, send many, close: callers batch so connections get reused."""
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def open(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    @abstractmethod
+    def send_many(self, messages: list[EmailMessage]) -> int:
+        """Send every message; returns how many were sent."""
+
+
+class SMTPTransport(Transport):
+    """
+    One SMTP connection reused for every message, re-established after
+    `per_connection` messages or if the server drops it. For local testing run
+    `python -m aiosmtpd -n -l localhost:1025` and set MAIL_PORT=1025.
+    """
+
+    def __init__(self, host, port=25, username=None, password=None, use_tls=False, per_connection=100):
+        self.host, self.port = host, port
+        self.username, self.password, self.use_tls = username, password, use_tls
+        self.per_connection = per_connection
+        self._smtp = None
+        self._sent_on_conn = 0
+
+    def open(self):
+        self._smtp = smtplib.SMTP(self.host, self.port, timeout=30)
+        if self.use_tls:
+            self._smtp.starttls()
+        if self.username:
+            self._smtp.login(self.username, self.password)
+        self._sent_on_conn = 0
+
+    def close(self):
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except smtplib.SMTPException:
+                self._smtp.close()
+            self._smtp = None
+
+    def send_many(self, messages):
+        for msg in messages:
+            if self._smtp is None or self._sent_on_conn >= self.per_connection:
+                self.close()
+                self.open()
+            try:
+                self._smtp.send_message(msg)
+            except smtplib.SMTPServerDisconnected:
+                self.open()  # one retry on a fresh connection
+                self._smtp.send_message(msg)
+            self._sent_on_conn += 1
+        return len(messages)
+
+
+class FileTransport(Transport):
+    """Writes each message to <outbox>/<timestamp>-<n>.eml instead of sending it."""
+
+    def __init__(self, outbox: str):
+        self.outbox = outbox
+        self._n = 0
+
+    def open(self):
+        os.makedirs(self.outbox, exist_ok=True)
+
+    def send_many(self, messages):
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.gmtime())
+        for msg in messages:
+            self._n += 1
+            with open(os.path.join(self.outbox, f"{stamp}-{os.getpid()}-{self._n:05d}.eml"), "wb") as fh:
+                fh.write(bytes(msg))
+        return len(messages)
+
+
+def make_transport(config=None) -> Transport:
+    config = config or current_app.config
+    kind = config["MAIL_TRANSPORT"]
+    if kind == "smtp":
+        return SMTPTransport(config["MAIL_SERVER"], config["MAIL_PORT"], config.get("MAIL_USERNAME"),
+                             config.get("MAIL_PASSWORD"), config["MAIL_USE_TLS"])
+    if kind == "file":
+        return FileTransport(config["MAIL_OUTBOX"])
+    raise ValueError(f"Unknown MAIL_TRANSPORT {kind!r}; use 'smtp' or 'file'")
+
+
+def build_message(to: str, subject: str, body: str, sender: str | None = None) -> EmailMessage:
+    msg = EmailMessage()
+    msg["From"] = sender or current_app.config["MAIL_FROM"]
+    msg["To"] = to
+    msg["Subject"] = subject
+    msg.set_content(body)
+    return msg
@@ -0,0 +1,278 @@
+# maintenance.py — `flask db-maint ...`: planner stats, bounded incremental vacuum, WAL checkpoints,
+# integrity checks and a size report, each step short enough to run while the school is using the app
+import os
+import sqlite3
+import time
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from tenancy import DEFAULT, current_tenant, tenant_context, tenant_engine
+
+CHECKPOINT_MODES = ("PASSIVE", "FULL", "RESTART", "TRUNCATE")
+
+
+def _engine():
+    """The current school's primary engine (`flask tenants each db-maint ...` walks every school)."""
+    return tenant_engine(current_app.extensions["sqlalchemy"], current_tenant())
+
+
+def _is_sqlite(engine) -> bool:
+    return engine.dialect.name == "sqlite"
+
+
+def _pragma(conn, name: str):
+    return conn.execute(f"PRAGMA {name}").fetchone()[0]
+
+
+class _raw:
+    """A pooled DBAPI connection for PRAGMAs; sqlite3 autocommits them, one short transaction each."""
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def __enter__(self):
+        self.proxy = self.engine.raw_connection()
+        return self.proxy.driver_connection
+
+    def __exit__(self, *exc):
+        self.proxy.close()
+
+
+# ----- steps (each returns a one-line summary) -----
+def analyze(full: bool = False) -> str:
+    """
+    PRAGMA optimize re-analyzes only tables whose stats look stale, with
+    analysis_limit capping rows sampled per index; --full runs ANALYZE over everything.
+    """
+    engine = _engine()
+    started = time.perf_counter()
+    if not _is_sqlite(engine):
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.exec_driver_sql("ANALYZE")
+        return f"ANALYZE in {time.perf_counter() - started:.2f}s"
+    # before 3.46 optimize only looks at tables this (fresh) connection has queried, i.e. none
+    how = "ANALYZE" if full or sqlite3.sqlite_version_info < (3, 46) else "PRAGMA optimize=0x10002"
+    with _raw(engine) as conn:
+        if not full:
+            conn.execute(f"PRAGMA analysis_limit={current_app.config['DB_MAINT_ANALYSIS_LIMIT']}")
+        conn.execute(how)  # 0x10000: every table, not just ones this connection used
+        conn.commit()
+    limit = "" if full else f" (analysis_limit={current_app.config['DB_MAINT_ANALYSIS_LIMIT']})"
+    return f"{how}{limit} in {time.perf_counter() - started:.2f}s"
+
+
+def incremental_vacuum(max_seconds: float | None = None, step_pages: int | None = None) -> str:
+    """
+    Hand free pages back to the filesystem step_pages at a time. Each step is
+    its own write transaction lasting milliseconds, with a pause between steps
+    so queued writers get in; stops when the freelist is empty or time is up.
+    """
+    engine = _engine()
+    if not _is_sqlite(engine):
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.exec_driver_sql("VACUUM")  # plain VACUUM never blocks reads or writes on Postgres
+        return "VACUUM"
+    cfg = current_app.config
+    max_seconds = cfg["DB_MAINT_VACUUM_SECONDS"] if max_seconds is None else max_seconds
+    step_pages = step_pages or cfg["DB_MAINT_VACUUM_STEP_PAGES"]
+    pause = cfg["DB_MAINT_PAUSE_SECONDS"]
+
+    with _raw(engine) as conn:
+        if _pragma(conn, "auto_vacuum") != 2:
+            return "skipped: auto_vacuum is not INCREMENTAL (run `flask db-maint setup` once, out of hours)"
+        before = _pragma(conn, "freelist_count")
+        deadline, steps, longest = time.monotonic() + max_seconds, 0, 0.0
+        while _pragma(conn, "freelist_count") and time.monotonic() < deadline:
+            started = time.perf_counter()
+            # executescript steps the pragma to completion; execute() stops after one page
+            conn.executescript(f"PRAGMA incremental_vacuum({step_pages});")
+            longest = max(longest, time.perf_counter() - started)
+            steps += 1
+            time.sleep(pause)
+        after = _pragma(conn, "freelist_count")
+    return (f"freed {before - after} of {before} free pages in {steps} step(s), "
+            f"longest write lock {longest * 1000:.0f} ms, {after} left")
+
+
+def checkpoint(mode: str = "PASSIVE") -> str:
+    """Copy the WAL back into the database; PASSIVE never waits on readers or writers."""
+    engine = _engine()
+    if not _is_sqlite(engine):
+        return "skipped: sqlite only"
+    with _raw(engine) as conn:
+        if _pragma(conn, "journal_mode") != "wal":
+            return "skipped: journal_mode is not WAL"
+        busy, log, done = conn.execute(f"PRAGMA wal_checkpoint({mode})").fetchone()
+    return f"{mode}: {done}/{log} WAL frames checkpointed{' (busy: readers still on old frames)' if busy else ''}"
+
+
+def integrity(full: bool = False) -> tuple[bool, str]:
+    """quick_check (or integrity_check) plus foreign_key_check; read-only, so WAL writers carry on."""
+    engine = _engine()
+    if not _is_sqlite(engine):
+        return True, "skipped: sqlite only"
+    started = time.perf_counter()
+    with _raw(engine) as conn:
+        problems = [r[0] for r in conn.execute(f"PRAGMA {'integrity_check' if full else 'quick_check'}(100)")]
+        problems = [] if problems == ["ok"] else problems
+        orphans = conn.execute("PRAGMA foreign_key_check").fetchall()
+    if orphans:
+        problems.append(f"{len(orphans)} row(s) with a missing parent, first in {orphans[0][0]}")
+    name = "integrity_check" if full else "quick_check"
+    verdict = "FAILED: " + "; ".join(problems[:5]) if problems else "ok"
+    return not problems, f"{name} {verdict} in {time.perf_counter() - started:.2f}s"
+
+
+def report() -> dict:
+    """File, WAL and free-page sizes, plus per-table bytes and slack when the dbstat table is compiled in."""
+    engine = _engine()
+    if not _is_sqlite(engine):
+        with engine.connect() as conn:
+            size = conn.exec_driver_sql("SELECT pg_database_size(current_database())").scalar()
+            tables = conn.exec_driver_sql(
+                "SELECT relname, pg_total_relation_size(relid), 0 FROM pg_catalog.pg_statio_user_tables "
+                "ORDER BY 2 DESC").fetchall()
+        return {"bytes": size, "tables": [tuple(t) for t in tables]}
+
+    with _raw(engine) as conn:
+        page_size, pages, free = (_pragma(conn, p) for p in ("page_size", "page_count", "freelist_count"))
+        info = {
+            "path": engine.url.database,
+            "bytes": page_size * pages,
+            "free_bytes": page_size * free,
+            "free_pct": round(100 * free / pages, 1) if pages else 0.0,
+            "journal_mode": _pragma(conn, "journal_mode"),
+            "auto_vacuum": {0: "NONE", 1: "FULL", 2: "INCREMENTAL"}[_pragma(conn, "auto_vacuum")],
+            "wal_bytes": 0,
+            "tables": [],
+        }
+        wal = f"{engine.url.database}-wal"
+        if engine.url.database and os.path.exists(wal):
+            info["wal_bytes"] = os.path.getsize(wal)
+        try:
+            info["tables"] = conn.execute(
+                "SELECT name, SUM(pgsize), SUM(unused) FROM dbstat GROUP BY name ORDER BY 2 DESC").fetchall()
+        except Exception:  # sqlite built without SQLITE_ENABLE_DBSTAT_VTAB
+            pass
+    return info
+
+
+def run_all(vacuum_seconds: float | None = None) -> bool:
+    """The routine pass for cron or the scheduler: stats, free pages, WAL, quick check."""
+    click.echo(f"[{current_tenant()}] analyze: {analyze()}")
+    click.echo(f"[{current_tenant()}] vacuum: {incremental_vacuum(vacuum_seconds)}")
+    click.echo(f"[{current_tenant()}] checkpoint: {checkpoint()}")
+    ok, summary = integrity()
+    click.echo(f"[{current_tenant()}] check: {summary}")
+    return ok
+
+
+def _mb(n) -> str:
+    return f"{(n or 0) / 1_048_576:.1f} MB"
+
+
+# ----- CLI: flask db-maint ... -----
+def init_app(app):
+    app.config.setdefault("DB_MAINT_ANALYSIS_LIMIT", 1000)
+    app.config.setdefault("DB_MAINT_VACUUM_STEP_PAGES", 256)
+    app.config.setdefault("DB_MAINT_VACUUM_SECONDS", 30)
+    app.config.setdefault("DB_MAINT_PAUSE_SECONDS", 0.05)
+    app.cli.add_command(maint_cli)
+
+
+maint_cli = AppGroup("db-maint", help="Database upkeep that is safe during school hours.")
+
+
+@maint_cli.command("analyze")
+@click.option("--full", is_flag=True, help="ANALYZE every table instead of PRAGMA optimize.")
+def analyze_command(full):
+    """Refresh query-planner statistics."""
+    click.echo(analyze(full))
+
+
+@maint_cli.command("vacuum")
+@click.option("--max-seconds", type=float, default=None, help="Time budget (default DB_MAINT_VACUUM_SECONDS).")
+@click.option("--step-pages", type=int, default=None, help="Pages per step (default DB_MAINT_VACUUM_STEP_PAGES).")
+def vacuum_command(max_seconds, step_pages):
+    """Return free pages to the filesystem in short, bounded steps."""
+    click.echo(incremental_vacuum(max_seconds, step_pages))
+
+
+@maint_cli.command("checkpoint")
+@click.option("--mode", type=click.Choice(CHECKPOINT_MODES, case_sensitive=False), default="PASSIVE",
+              show_default=True, help="TRUNCATE also shrinks the -wal file but waits for readers.")
+def checkpoint_command(mode):
+    """Checkpoint the write-ahead log."""
+    click.echo(checkpoint(mode.upper()))
+
+
+@maint_cli.command("check")
+@click.option("--full", is_flag=True, help="integrity_check instead of the faster quick_check.")
+def check_command(full):
+    """Verify the database file and foreign keys; exits 1 on corruption."""
+    ok, summary = integrity(full)
+    click.echo(summary)
+    if not ok:
+        raise SystemExit(1)
+
+
+@maint_cli.command("report")
+@click.option("--top", type=int, default=15, show_default=True, help="Largest tables to list.")
+def report_command(top):
+    """Size, free space and per-table usage."""
+    info = report()
+    if "journal_mode" in info:
+        click.echo(f"{info['path']}: {_mb(info['bytes'])}, {_mb(info['free_bytes'])} free ({info['free_pct']}%), "
+                   f"WAL {_mb(info['wal_bytes'])}, journal_mode={info['journal_mode']}, "
+                   f"auto_vacuum={info['auto_vacuum']}")
+    else:
+        click.echo(f"database: {_mb(info['bytes'])}")
+    if not info["tables"]:
+        click.echo("(per-table sizes need sqlite's dbstat table)")
+    for name, size, unused in info["tables"][:top]:
+        slack = f"  {100 * unused / size:4.1f}% slack" if unused and size >= 65536 else ""  # skip 1-page tables
+        click.echo(f"  {name:40} {_mb(size):>10}{slack}")
+
+
+@maint_cli.command("setup")
+@click.confirmation_option(prompt="This runs a full VACUUM that locks the database until it finishes. Continue?")
+def setup_command():
+    """One-off, out of hours: switch to WAL + auto_vacuum=INCREMENTAL (needs a full VACUUM to take effect)."""
+    engine = _engine()
+    if not _is_sqlite(engine):
+        raise click.ClickException("setup is for SQLite databases.")
+    with _raw(engine) as conn:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        started = time.perf_counter()
+        conn.execute("VACUUM")
+        mode = _pragma(conn, "auto_vacuum")
+    click.echo(f"journal_mode=WAL, auto_vacuum={'INCREMENTAL' if mode == 2 else mode} "
+               f"(VACUUM took {time.perf_counter() - started:.1f}s)")
+
+
+@maint_cli.command("run")
+@click.option("--every", type=int, default=None, metavar="SECONDS",
+              help="Keep running, one pass every SECONDS (a simple scheduler for a sidecar or systemd unit).")
+@click.option("--vacuum-seconds", type=float, default=None, help="Vacuum time budget per pass.")
+def run_command(every, vacuum_seconds):
+    """
+    analyze + vacuum + checkpoint + quick_check for this school; exits 1 if a
+    check fails. With --every it never returns, so it walks every school itself.
+    """
+    if every is None:
+        if not run_all(vacuum_seconds):
+            raise SystemExit(1)
+        return
+    db = current_app.extensions["sqlalchemy"]
+    while True:
+        for tenant in [DEFAULT, *current_app.config.get("TENANTS", [])]:
+            with tenant_context(tenant):
+                try:
+                    if not run_all(vacuum_seconds):
+                        current_app.logger.error("db-maint: integrity check failed for %s", tenant)
+                except Exception:  # a locked or missing school shouldn't stop the others
+                    current_app.logger.exception("db-maint: pass failed for %s", tenant)
+                finally:
+                    db.session.remove()
+        time.sleep(every)
@@ -0,0 +1,45 @@
+"""daily class rollups
+
+Revision ID: 1345928c0bdb
+Revises: 522f28833bce
+Create Date: 2026-10-19 04:45:58.596610
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1345928c0bdb'
+down_revision = '522f28833bce'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('daily_class_rollups',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('class_id', sa.Integer(), nullable=False),
+    sa.Column('tutor_id', sa.Integer(), nullable=False),
+    sa.Column('subject', sa.String(length=80), nullable=False),
+    sa.Column('submissions', sa.Integer(), nullable=False),
+    sa.Column('score_sum', sa.Float(), nullable=False),
+    sa.Column('score_sq_sum', sa.Float(), nullable=False),
+    sa.Column('learners', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['class_id'], ['classes.class_id'], ),
+    sa.ForeignKeyConstraint(['tutor_id'], ['users.user_id'], ),
+    sa.PrimaryKeyConstraint('day', 'class_id')
+    )
+    op.create_index('ix_daily_rollups_tutor_day', 'daily_class_rollups', ['tutor_id', 'day'], unique=False)
+    op.create_table('rollup_state',
+    sa.Column('name', sa.String(length=64), nullable=False),
+    sa.Column('high_water', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade():
+    op.drop_table('rollup_state')
+    op.drop_index('ix_daily_rollups_tutor_day', table_name='daily_class_rollups')
+    op.drop_table('daily_class_rollups')
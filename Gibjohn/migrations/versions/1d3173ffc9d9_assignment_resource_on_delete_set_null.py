@@ -0,0 +1,57 @@
+"""assignment resource on delete set null
+
+assignments.resource_id becomes nullable with ON DELETE SET NULL: deleting a
+tutor's resources (auth/purge.py) used to cascade into other tutors'
+assignments that used them, and those assignments' submissions.
+
+Revision ID: 1d3173ffc9d9
+Revises: 29396080dbce
+Create Date: 2026-10-19 05:10:34.244673
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1d3173ffc9d9'
+down_revision = '29396080dbce'
+branch_labels = None
+depends_on = None
+
+
+# gives SQLite's unnamed constraints a name batch mode can drop them by
+NAMING = {'fk': 'fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s'}
+FK_NAME = 'fk_assignments_resource_id_resources'
+
+# indexes with DESC columns on assignments, lost by the batch rebuild
+DESC_INDEXES = [
+    ('ix_assignments_class_created', ['class_id', 'created_at DESC']),
+    ('ix_assignments_class_due_sort', ['class_id', 'due_sort', 'created_at DESC', 'title', 'due_date']),
+]
+
+
+def _rebuild(nullable, ondelete):
+    inspector = sa.inspect(op.get_bind())
+    existing = {fk['constrained_columns'][0]: fk['name'] for fk in inspector.get_foreign_keys('assignments')}
+    for name, _ in DESC_INDEXES:
+        op.drop_index(name, table_name='assignments')
+
+    with op.batch_alter_table('assignments', schema=None, naming_convention=NAMING) as batch_op:
+        name = existing.get('resource_id') or FK_NAME
+        batch_op.drop_constraint(name, type_='foreignkey')
+        batch_op.alter_column('resource_id', existing_type=sa.Integer(), nullable=nullable)
+        batch_op.create_foreign_key(name, 'resources', ['resource_id'], ['resource_id'], ondelete=ondelete)
+
+    for name, columns in DESC_INDEXES:
+        op.create_index(name, 'assignments', [sa.text(c) if ' ' in c else c for c in columns], unique=False)
+
+
+def upgrade():
+    _rebuild(True, 'SET NULL')
+
+
+def downgrade():
+    # assignments whose resource was deleted can't go back under NOT NULL
+    op.execute("DELETE FROM assignments WHERE resource_id IS NULL")
+    _rebuild(False, 'CASCADE')
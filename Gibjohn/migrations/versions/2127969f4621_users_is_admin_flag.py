@@ -0,0 +1,29 @@
+"""users is_admin flag
+
+Replaces the ADMIN_EMAILS setting; nobody is an admin after upgrading
+until `flask admin grant <email>` is run for them.
+
+Revision ID: 2127969f4621
+Revises: 8df645488286
+Create Date: 2026-10-19 04:52:06.504321
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2127969f4621'
+down_revision = '8df645488286'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('is_admin', sa.Boolean(), server_default=sa.false(), nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('is_admin')
@@ -0,0 +1,60 @@
+"""denormalized student and submission counters
+
+Adds the columns counters.py keeps up to date and fills them with a recount;
+`flask counters check` compares them with the tables afterwards.
+
+Revision ID: 29396080dbce
+Revises: 59053cb2e552
+Create Date: 2026-10-19 04:57:41.866047
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '29396080dbce'
+down_revision = '59053cb2e552'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('classes', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('student_count', sa.Integer(), server_default='0', nullable=False))
+    with op.batch_alter_table('assignments', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('submission_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('submitter_count', sa.Integer(), server_default='0', nullable=False))
+
+    op.execute("""
+        UPDATE classes SET student_count = (
+            SELECT count(*) FROM class_enrollments e WHERE e.class_id = classes.class_id
+        )
+    """)
+    op.execute("""
+        UPDATE assignments SET
+            submission_count = (
+                SELECT count(*) FROM submissions s WHERE s.assignment_id = assignments.assignment_id
+            ),
+            submitter_count = (
+                SELECT count(DISTINCT s.user_id) FROM submissions s WHERE s.assignment_id = assignments.assignment_id
+            )
+    """)
+
+
+def downgrade():
+    # dropping columns rebuilds both tables on SQLite, and a rebuild reflects
+    # indexes without their DESC / lower(): drop and recreate those around it
+    op.drop_index('ix_classes_tutor_title', table_name='classes')
+    with op.batch_alter_table('classes', schema=None) as batch_op:
+        batch_op.drop_column('student_count')
+    op.create_index('ix_classes_tutor_title', 'classes', ['tutor_id', sa.text('lower(title)')], unique=False)
+
+    op.drop_index('ix_assignments_class_due_sort', table_name='assignments')
+    op.drop_index('ix_assignments_class_created', table_name='assignments')
+    with op.batch_alter_table('assignments', schema=None) as batch_op:
+        batch_op.drop_column('submitter_count')
+        batch_op.drop_column('submission_count')
+    op.create_index('ix_assignments_class_created', 'assignments', ['class_id', sa.text('created_at DESC')], unique=False)
+    op.create_index('ix_assignments_class_due_sort', 'assignments',
+                    ['class_id', 'due_sort', sa.text('created_at DESC'), 'title', 'due_date'], unique=False)
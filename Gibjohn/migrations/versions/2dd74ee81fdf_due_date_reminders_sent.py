@@ -0,0 +1,33 @@
+"""due date reminders sent
+
+One row per (learner, assignment) reminded, so `flask learner send-reminders` sends each once.
+
+Revision ID: 2dd74ee81fdf
+Revises: bd2ffee301a6
+Create Date: 2026-10-19 04:56:07.690797
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2dd74ee81fdf'
+down_revision = 'bd2ffee301a6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('reminders_sent',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('assignment_id', sa.Integer(), nullable=False),
+    sa.Column('sent_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['assignment_id'], ['assignments.assignment_id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.user_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'assignment_id')
+    )
+
+
+def downgrade():
+    op.drop_table('reminders_sent')
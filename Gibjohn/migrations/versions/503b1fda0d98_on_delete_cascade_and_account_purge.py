@@ -0,0 +1,86 @@
+"""on delete cascade and account purge
+
+Recreates every foreign key with ON DELETE CASCADE, so deleting a user
+(auth/purge.py) or an assignment is one statement. SQLite can't alter a
+constraint: batch mode rebuilds each table, and reflected rebuilds lose
+DESC in index columns, so those indexes are dropped and recreated around
+it. Also adds users.deleted_at and the activity_logs (user_id, timestamp)
+index.
+
+Revision ID: 503b1fda0d98
+Revises: 6ceb36bfb109
+Create Date: 2026-10-19 04:49:08.467354
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '503b1fda0d98'
+down_revision = '6ceb36bfb109'
+branch_labels = None
+depends_on = None
+
+
+# (table, column, referred table, referred column), parents before children
+FOREIGN_KEYS = [
+    ('classes', 'tutor_id', 'users', 'user_id'),
+    ('class_enrollments', 'class_id', 'classes', 'class_id'),
+    ('class_enrollments', 'user_id', 'users', 'user_id'),
+    ('resources', 'owner_id', 'users', 'user_id'),
+    ('assignments', 'resource_id', 'resources', 'resource_id'),
+    ('assignments', 'class_id', 'classes', 'class_id'),
+    ('submissions', 'assignment_id', 'assignments', 'assignment_id'),
+    ('submissions', 'user_id', 'users', 'user_id'),
+    ('progress', 'user_id', 'users', 'user_id'),
+    ('user_rewards', 'user_id', 'users', 'user_id'),
+    ('user_rewards', 'reward_id', 'rewards', 'reward_id'),
+    ('activity_logs', 'user_id', 'users', 'user_id'),
+    ('daily_class_rollups', 'class_id', 'classes', 'class_id'),
+    ('daily_class_rollups', 'tutor_id', 'users', 'user_id'),
+]
+
+# gives SQLite's unnamed constraints a name batch mode can drop them by
+NAMING = {'fk': 'fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s'}
+
+# indexes with DESC columns on the tables being rebuilt
+DESC_INDEXES = [
+    ('ix_resources_owner_created', 'resources', ['owner_id', 'created_at DESC']),
+    ('ix_assignments_class_created', 'assignments', ['class_id', 'created_at DESC']),
+    ('ix_assignments_class_due_sort', 'assignments', ['class_id', 'due_sort', 'created_at DESC', 'title', 'due_date']),
+]
+
+
+def _set_ondelete(ondelete):
+    inspector = sa.inspect(op.get_bind())
+    for name, table, _ in DESC_INDEXES:
+        op.drop_index(name, table_name=table)
+
+    tables = dict.fromkeys(t for t, *_ in FOREIGN_KEYS)
+    for table in tables:
+        existing = {fk['constrained_columns'][0]: fk['name'] for fk in inspector.get_foreign_keys(table)}
+        with op.batch_alter_table(table, schema=None, naming_convention=NAMING) as batch_op:
+            for _, column, referred, referred_column in (fk for fk in FOREIGN_KEYS if fk[0] == table):
+                name = existing.get(column) or f'fk_{table}_{column}_{referred}'
+                batch_op.drop_constraint(name, type_='foreignkey')
+                batch_op.create_foreign_key(name, referred, [column], [referred_column], ondelete=ondelete)
+
+    for name, table, columns in DESC_INDEXES:
+        op.create_index(name, table, [sa.text(c) if ' ' in c else c for c in columns], unique=False)
+
+
+def upgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('deleted_at', sa.DateTime(), nullable=True))
+
+    _set_ondelete('CASCADE')
+    op.create_index('ix_activity_logs_user_time', 'activity_logs', ['user_id', sa.text('timestamp DESC')], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_activity_logs_user_time', table_name='activity_logs')
+    _set_ondelete(None)
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('deleted_at')
@@ -0,0 +1,26 @@
+"""store packed quiz responses
+
+Revision ID: 522f28833bce
+Revises: b546a65c0ec4
+Create Date: 2026-10-19 04:44:52.858423
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '522f28833bce'
+down_revision = 'b546a65c0ec4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('submissions', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('responses', sa.LargeBinary(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('submissions', schema=None) as batch_op:
+        batch_op.drop_column('responses')
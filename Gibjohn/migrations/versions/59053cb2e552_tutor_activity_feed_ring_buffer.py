@@ -0,0 +1,44 @@
+"""tutor activity feed ring buffer
+
+Starts empty: run `flask feeds rebuild` (per school: `flask tenants each feeds rebuild`)
+after upgrading to fill it from the existing activity_logs.
+
+Revision ID: 59053cb2e552
+Revises: 2dd74ee81fdf
+Create Date: 2026-10-19 04:57:04.316159
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '59053cb2e552'
+down_revision = '2dd74ee81fdf'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('tutor_feed_heads',
+    sa.Column('tutor_id', sa.Integer(), nullable=False),
+    sa.Column('head', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['tutor_id'], ['users.user_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('tutor_id')
+    )
+    op.create_table('tutor_feed_entries',
+    sa.Column('tutor_id', sa.Integer(), nullable=False),
+    sa.Column('slot', sa.Integer(), nullable=False),
+    sa.Column('seq', sa.Integer(), nullable=False),
+    sa.Column('activity_id', sa.Integer(), nullable=False),
+    sa.Column('action', sa.String(length=255), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['activity_id'], ['activity_logs.activity_id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['tutor_id'], ['users.user_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('tutor_id', 'slot')
+    )
+
+
+def downgrade():
+    op.drop_table('tutor_feed_entries')
+    op.drop_table('tutor_feed_heads')
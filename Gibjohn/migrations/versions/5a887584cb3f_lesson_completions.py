@@ -0,0 +1,34 @@
+"""lesson completions
+
+One row per (learner, lesson) finished: the lesson's XP is credited when it's inserted.
+Lessons finished before this revision aren't recorded, so each can credit once more.
+
+Revision ID: 5a887584cb3f
+Revises: 1d3173ffc9d9
+Create Date: 2026-10-19 05:13:19.727318
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5a887584cb3f'
+down_revision = '1d3173ffc9d9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('lesson_completions',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('assignment_id', sa.Integer(), nullable=False),
+    sa.Column('completed_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['assignment_id'], ['assignments.assignment_id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.user_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'assignment_id')
+    )
+
+
+def downgrade():
+    op.drop_table('lesson_completions')
@@ -0,0 +1,48 @@
+"""assignment due_sort and feed indexes
+
+Revision ID: 6ceb36bfb109
+Revises: eb0e94c930b4
+Create Date: 2026-10-19 04:47:23.396702
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from datetime import datetime
+
+
+# revision identifiers, used by Alembic.
+revision = '6ceb36bfb109'
+down_revision = 'eb0e94c930b4'
+branch_labels = None
+depends_on = None
+
+NO_DUE_DATE = datetime(9999, 12, 31)  # models.NO_DUE_DATE when this revision was written
+
+
+def upgrade():
+    with op.batch_alter_table('assignments', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('due_sort', sa.DateTime(), nullable=True))
+
+    op.execute(sa.text("UPDATE assignments SET due_sort = COALESCE(due_date, :no_due)")
+               .bindparams(sa.bindparam('no_due', NO_DUE_DATE, type_=sa.DateTime())))
+
+    # making the column NOT NULL rebuilds the table on SQLite, and a rebuild
+    # reflects indexes without their DESC: drop and recreate this one around it
+    op.drop_index('ix_assignments_class_created', table_name='assignments')
+    with op.batch_alter_table('assignments', schema=None) as batch_op:
+        batch_op.alter_column('due_sort', existing_type=sa.DateTime(), nullable=False)
+    op.create_index('ix_assignments_class_created', 'assignments', ['class_id', sa.text('created_at DESC')], unique=False)
+
+    op.create_index('ix_assignments_class_due_sort', 'assignments',
+                    ['class_id', 'due_sort', sa.text('created_at DESC'), 'title', 'due_date'], unique=False)
+    op.create_index('ix_submissions_user_assignment', 'submissions', ['user_id', 'assignment_id', 'score'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_submissions_user_assignment', table_name='submissions')
+    op.drop_index('ix_assignments_class_due_sort', table_name='assignments')
+
+    op.drop_index('ix_assignments_class_created', table_name='assignments')
+    with op.batch_alter_table('assignments', schema=None) as batch_op:
+        batch_op.drop_column('due_sort')
+    op.create_index('ix_assignments_class_created', 'assignments', ['class_id', sa.text('created_at DESC')], unique=False)
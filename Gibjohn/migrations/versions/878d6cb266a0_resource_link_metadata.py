@@ -0,0 +1,43 @@
+"""resource link metadata
+
+Existing link rows get their columns filled by `flask tutor ingest-links`.
+
+Revision ID: 878d6cb266a0
+Revises: 503b1fda0d98
+Create Date: 2026-10-19 04:50:52.067363
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '878d6cb266a0'
+down_revision = '503b1fda0d98'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('resources', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('canonical_url', sa.String(length=255), nullable=True))
+        batch_op.add_column(sa.Column('provider', sa.String(length=16), nullable=True))
+        batch_op.add_column(sa.Column('provider_id', sa.String(length=64), nullable=True))
+        batch_op.add_column(sa.Column('embed_url', sa.String(length=255), nullable=True))
+        batch_op.add_column(sa.Column('thumb_url', sa.String(length=255), nullable=True))
+        batch_op.create_index('ix_resources_owner_canonical', ['owner_id', 'canonical_url'], unique=False)
+        batch_op.create_index('ix_resources_provider_id', ['provider', 'provider_id'], unique=False)
+
+
+def downgrade():
+    # dropping columns rebuilds the table on SQLite, which would lose this index's DESC
+    op.drop_index('ix_resources_owner_created', table_name='resources')
+    with op.batch_alter_table('resources', schema=None) as batch_op:
+        batch_op.drop_index('ix_resources_provider_id')
+        batch_op.drop_index('ix_resources_owner_canonical')
+        batch_op.drop_column('thumb_url')
+        batch_op.drop_column('embed_url')
+        batch_op.drop_column('provider_id')
+        batch_op.drop_column('provider')
+        batch_op.drop_column('canonical_url')
+    op.create_index('ix_resources_owner_created', 'resources', ['owner_id', sa.text('created_at DESC')], unique=False)
@@ -0,0 +1,26 @@
+"""typeahead title indexes
+
+Revision ID: 8df645488286
+Revises: 878d6cb266a0
+Create Date: 2026-10-19 04:51:09.905994
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8df645488286'
+down_revision = '878d6cb266a0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_classes_tutor_title', 'classes', ['tutor_id', sa.text('lower(title)')], unique=False)
+    op.create_index('ix_resources_owner_title', 'resources', ['owner_id', sa.text('lower(title)')], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_resources_owner_title', table_name='resources')
+    op.drop_index('ix_classes_tutor_title', table_name='classes')
@@ -0,0 +1,147 @@
+"""baseline schema
+
+The tables as they stood before migrations were added. Databases created
+back then with db.create_all() (instance/app.db among them) already have
+them, so this revision only creates what is missing and a plain
+`flask db upgrade` brings either kind of database to head.
+
+Revision ID: b546a65c0ec4
+Revises: 
+Create Date: 2026-10-19 04:44:50.381210
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b546a65c0ec4'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if "users" in sa.inspect(op.get_bind()).get_table_names():
+        return  # created by db.create_all() before migrations existed
+
+    op.create_table('users',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('role', sa.String(length=16), nullable=False),
+    sa.Column('email', sa.String(length=120), nullable=False),
+    sa.Column('password_hash', sa.Text(), nullable=False),
+    sa.Column('full_name', sa.String(length=120), nullable=True),
+    sa.Column('dob', sa.Date(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('last_login', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+    op.create_table('rewards',
+    sa.Column('reward_id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=120), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('criteria', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('reward_id')
+    )
+    op.create_table('classes',
+    sa.Column('class_id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=120), nullable=False),
+    sa.Column('subject', sa.String(length=80), nullable=False),
+    sa.Column('year_group', sa.Integer(), nullable=False),
+    sa.Column('tutor_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['tutor_id'], ['users.user_id'], ),
+    sa.PrimaryKeyConstraint('class_id')
+    )
+    op.create_table('resources',
+    sa.Column('resource_id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=120), nullable=False),
+    sa.Column('subject', sa.String(length=16), nullable=False),
+    sa.Column('type', sa.String(length=16), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('url', sa.String(length=255), nullable=True),
+    sa.Column('owner_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('path', sa.String(length=255), nullable=True),
+    sa.Column('mime', sa.String(length=64), nullable=True),
+    sa.Column('size', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['owner_id'], ['users.user_id'], ),
+    sa.PrimaryKeyConstraint('resource_id')
+    )
+    op.create_index('ix_resources_owner_created', 'resources', ['owner_id', sa.text('created_at DESC')], unique=False)
+    op.create_table('progress',
+    sa.Column('progress_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('best_score', sa.Float(), nullable=True),
+    sa.Column('attempts', sa.Integer(), nullable=True),
+    sa.Column('last_attempted', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.user_id'], ),
+    sa.PrimaryKeyConstraint('progress_id'),
+    sa.UniqueConstraint('user_id')
+    )
+    op.create_table('user_rewards',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('reward_id', sa.Integer(), nullable=False),
+    sa.Column('earned_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['reward_id'], ['rewards.reward_id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.user_id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'reward_id')
+    )
+    op.create_table('activity_logs',
+    sa.Column('activity_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('action', sa.String(length=255), nullable=False),
+    sa.Column('timestamp', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.user_id'], ),
+    sa.PrimaryKeyConstraint('activity_id')
+    )
+    op.create_table('class_enrollments',
+    sa.Column('class_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('enrolled_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['class_id'], ['classes.class_id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.user_id'], ),
+    sa.PrimaryKeyConstraint('class_id', 'user_id')
+    )
+    op.create_table('assignments',
+    sa.Column('assignment_id', sa.Integer(), nullable=False),
+    sa.Column('resource_id', sa.Integer(), nullable=False),
+    sa.Column('class_id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=120), nullable=False),
+    sa.Column('due_date', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['class_id'], ['classes.class_id'], ),
+    sa.ForeignKeyConstraint(['resource_id'], ['resources.resource_id'], ),
+    sa.PrimaryKeyConstraint('assignment_id')
+    )
+    op.create_index('ix_assignments_class_created', 'assignments', ['class_id', sa.text('created_at DESC')], unique=False)
+    op.create_table('submissions',
+    sa.Column('submission_id', sa.Integer(), nullable=False),
+    sa.Column('assignment_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=16), nullable=False),
+    sa.Column('score', sa.Float(), nullable=True),
+    sa.Column('feedback', sa.Text(), nullable=True),
+    sa.Column('submitted_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['assignment_id'], ['assignments.assignment_id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.user_id'], ),
+    sa.PrimaryKeyConstraint('submission_id')
+    )
+
+
+def downgrade():
+    op.drop_table('submissions')
+    op.drop_index('ix_assignments_class_created', table_name='assignments')
+    op.drop_table('assignments')
+    op.drop_table('class_enrollments')
+    op.drop_table('activity_logs')
+    op.drop_table('user_rewards')
+    op.drop_table('progress')
+    op.drop_index('ix_resources_owner_created', table_name='resources')
+    op.drop_table('resources')
+    op.drop_table('classes')
+    op.drop_table('rewards')
+    op.drop_index('ix_users_email', table_name='users')
+    op.drop_table('users')
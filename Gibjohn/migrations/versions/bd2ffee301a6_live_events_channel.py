@@ -0,0 +1,38 @@
+"""live events channel
+
+The table the SSE dispatchers in every worker process poll (events.py).
+
+Revision ID: bd2ffee301a6
+Revises: 2127969f4621
+Create Date: 2026-10-19 04:55:02.588517
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'bd2ffee301a6'
+down_revision = '2127969f4621'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('live_events',
+    sa.Column('event_id', sa.Integer(), nullable=False),
+    sa.Column('topic', sa.String(length=64), nullable=False),
+    sa.Column('name', sa.String(length=32), nullable=False),
+    sa.Column('payload', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('event_id'),
+    sqlite_autoincrement=True
+    )
+    op.create_index('ix_live_events_topic', 'live_events', ['topic', 'event_id'], unique=False)
+    op.create_index('ix_live_events_created', 'live_events', ['created_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_live_events_created', table_name='live_events')
+    op.drop_index('ix_live_events_topic', table_name='live_events')
+    op.drop_table('live_events')
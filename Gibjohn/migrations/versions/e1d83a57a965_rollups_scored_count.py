@@ -0,0 +1,39 @@
+"""rollups scored count
+
+Means were score_sum / submissions, counting ungraded (NULL score) rows;
+`scored` is the right divisor. Existing rows are backfilled from the
+submissions they summarise.
+
+Revision ID: e1d83a57a965
+Revises: 1345928c0bdb
+Create Date: 2026-10-19 04:46:22.200382
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e1d83a57a965'
+down_revision = '1345928c0bdb'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('daily_class_rollups', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('scored', sa.Integer(), server_default='0', nullable=False))
+
+    op.execute("""
+        UPDATE daily_class_rollups SET scored = (
+            SELECT count(s.score) FROM submissions s
+            JOIN assignments a ON a.assignment_id = s.assignment_id
+            WHERE a.class_id = daily_class_rollups.class_id
+              AND date(s.submitted_at) = daily_class_rollups.day
+        )
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('daily_class_rollups', schema=None) as batch_op:
+        batch_op.drop_column('scored')
@@ -0,0 +1,33 @@
+"""progress xp lessons and subjects
+
+Existing rows start at zero / {}; fill them from past submissions and
+lesson activity with `flask learner rebuild-progress`.
+
+Revision ID: eb0e94c930b4
+Revises: e1d83a57a965
+Create Date: 2026-10-19 04:46:46.035222
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'eb0e94c930b4'
+down_revision = 'e1d83a57a965'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('progress', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('xp', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('lessons_completed', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('subjects', sa.JSON(), server_default='{}', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('progress', schema=None) as batch_op:
+        batch_op.drop_column('subjects')
+        batch_op.drop_column('lessons_completed')
+        batch_op.drop_column('xp')
@@ -1,13 +1,43 @@
 from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+from flask import current_app
 from flask_login import UserMixin
 from flask_sqlalchemy import SQLAlchemy
 from werkzeug.security import generate_password_hash, check_password_hash
-from sqlalchemy import Index, func, Enum as SAEnum
-
-db = SQLAlchemy()
+from sqlalchemy import Index, func, event, inspect, Enum as SAEnum
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.mutable import MutableDict
+from sqlalchemy.orm import validates
+from replicas import RoutingSession
+
+db = SQLAlchemy(session_options={"class_": RoutingSession})
+
+# SQLite only enforces FOREIGN KEY / ON DELETE CASCADE when asked, per connection.
+# auto_vacuum only takes effect on a new, empty file (or after VACUUM): see `flask db-maint setup`.
+@event.listens_for(Engine, "connect")
+def _sqlite_foreign_keys(dbapi_conn, conn_record):
+    if type(dbapi_conn).__module__.startswith("sqlite3"):
+        cur = dbapi_conn.cursor()
+        cur.execute("PRAGMA foreign_keys=ON")
+        cur.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        cur.close()
+
+def fk_cascades() -> bool:
+    """
+    Whether this database's foreign keys delete children themselves. Ones
+    created before the ON DELETE CASCADE migration don't, and with
+    foreign_keys=ON a parent delete then fails; callers delete children first.
+    """
+    fks = inspect(db.session.connection()).get_foreign_keys("submissions")
+    return all((fk.get("options") or {}).get("ondelete", "").upper() == "CASCADE" for fk in fks)
 
 # ----- Helpers -----
 UTC_NOW = lambda: datetime.now(timezone.utc)
+NO_DUE_DATE = datetime(9999, 12, 31)  # sorts undated assignments after dated ones
+
+def school_now() -> datetime:
+    """Naive wall-clock time in SCHOOL_TIMEZONE, the clock due dates are typed in and stored in."""
+    return datetime.now(ZoneInfo(current_app.config["SCHOOL_TIMEZONE"])).replace(tzinfo=None)
 
 # ----- User -----
 class User(db.Model, UserMixin):
@@ -21,28 +51,33 @@ class User(db.Model, UserMixin):
     dob          = db.Column(db.Date)
     created_at   = db.Column(db.DateTime, nullable=False, default=UTC_NOW)
     last_login   = db.Column(db.DateTime)
+    deleted_at   = db.Column(db.DateTime)  # set when a large account is queued for purge
+    is_admin     = db.Column(db.Boolean, nullable=False, default=False, server_default=db.false())  # `flask admin grant`
 
     # Relationships
     classes_taught = db.relationship(
         "Class",
         back_populates="tutor",
         cascade="all, delete-orphan",
+        passive_deletes=True,
         foreign_keys="Class.tutor_id",
     )
     resources = db.relationship(
         "Resources",
         back_populates="owner",
         cascade="all, delete-orphan",
+        passive_deletes=True,
     )
     enrollments = db.relationship(
         "ClassEnrollment",
         back_populates="user",
         cascade="all, delete-orphan",
+        passive_deletes=True,
     )
-    submissions = db.relationship("Submission", back_populates="user", cascade="all, delete-orphan")
-    progress    = db.relationship("Progress", back_populates="user", uselist=False, cascade="all, delete-orphan")
-    activity    = db.relationship("ActivityLog", back_populates="user", cascade="all, delete-orphan")
-    user_rewards= db.relationship("UserReward", back_populates="user", cascade="all, delete-orphan")
+    submissions = db.relationship("Submission", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    progress    = db.relationship("Progress", back_populates="user", uselist=False, cascade="all, delete-orphan", passive_deletes=True)
+    activity    = db.relationship("ActivityLog", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    user_rewards= db.relationship("UserReward", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
 
     def get_id(self):
         return str(self.user_id)
@@ -64,13 +99,14 @@ class Class(db.Model):
     title       = db.Column(db.String(120), nullable=False)
     subject     = db.Column(db.String(80), nullable=False)
     year_group  = db.Column(db.Integer, nullable=False)
-    tutor_id    = db.Column(db.Integer, db.ForeignKey("users.user_id"), nullable=False)
+    tutor_id    = db.Column(db.Integer, db.ForeignKey("users.user_id", ondelete="CASCADE"), nullable=False)
     created_at  = db.Column(db.DateTime, nullable=False, default=UTC_NOW)
+    student_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")  # kept by counters.py
 
     tutor = db.relationship("User", back_populates="classes_taught", foreign_keys=[tutor_id])
 
     # enrollments and students (many-to-many via ClassEnrollment)
-    enrollments = db.relationship("ClassEnrollment", back_populates="klass", cascade="all, delete-orphan")
+    enrollments = db.relationship("ClassEnrollment", back_populates="klass", cascade="all, delete-orphan", passive_deletes=True)
     students = db.relationship(
         "User",
         secondary="class_enrollments",
@@ -79,17 +115,19 @@ class Class(db.Model):
         viewonly=True,
     )
 
-    assignments = db.relationship("Assignment", back_populates="class_", cascade="all, delete-orphan")
+    assignments = db.relationship("Assignment", back_populates="class_", cascade="all, delete-orphan", passive_deletes=True)
 
     def __repr__(self):
         return f"<Class {self.class_id} {self.title}>"
 
+Index("ix_classes_tutor_title", Class.tutor_id, func.lower(Class.title))
+
 # ----- ClassEnrollment (join table) -----
 class ClassEnrollment(db.Model):
     __tablename__ = "class_enrollments"
 
-    class_id    = db.Column(db.Integer, db.ForeignKey("classes.class_id"), primary_key=True, nullable=False)
-    user_id     = db.Column(db.Integer, db.ForeignKey("users.user_id"), primary_key=True, nullable=False)
+    class_id    = db.Column(db.Integer, db.ForeignKey("classes.class_id", ondelete="CASCADE"), primary_key=True, nullable=False)
+    user_id     = db.Column(db.Integer, db.ForeignKey("users.user_id", ondelete="CASCADE"), primary_key=True, nullable=False)
     enrolled_at = db.Column(db.DateTime, nullable=False, default=UTC_NOW)
 
     klass = db.relationship("Class", back_populates="enrollments")
@@ -108,7 +146,13 @@ class Resources(db.Model):
     type        = db.Column(db.String(16), nullable=False, default="file")  # 'file' | 'link'
     description = db.Column(db.Text)
     url         = db.Column(db.String(255))          # for links
-    owner_id    = db.Column(db.Integer, db.ForeignKey("users.user_id"), nullable=False)
+    # filled by tutor/links.ingest_link when a link is added
+    canonical_url = db.Column(db.String(255))
+    provider      = db.Column(db.String(16))            # 'youtube' | 'vimeo' | 'web'
+    provider_id   = db.Column(db.String(64))
+    embed_url     = db.Column(db.String(255))
+    thumb_url     = db.Column(db.String(255))
+    owner_id    = db.Column(db.Integer, db.ForeignKey("users.user_id", ondelete="CASCADE"), nullable=False)
     created_at  = db.Column(db.DateTime, nullable=False, default=UTC_NOW)
 
     # optional file metadata
@@ -117,44 +161,61 @@ class Resources(db.Model):
     size        = db.Column(db.Integer)
 
     owner = db.relationship("User", back_populates="resources")
-    assignments = db.relationship("Assignment", back_populates="resource")  # no delete-orphan: assignment owns FK
+    assignments = db.relationship("Assignment", back_populates="resource", passive_deletes=True)  # no delete-orphan: assignment owns FK
 
     def __repr__(self):
         return f"<Resource {self.resource_id} {self.title} ({self.type})>"
 
 Index("ix_resources_owner_created", Resources.owner_id, Resources.created_at.desc())
+Index("ix_resources_owner_canonical", Resources.owner_id, Resources.canonical_url)
+Index("ix_resources_provider_id", Resources.provider, Resources.provider_id)
+Index("ix_resources_owner_title", Resources.owner_id, func.lower(Resources.title))
 
 # ----- Assignment -----
 class Assignment(db.Model):
     __tablename__ = "assignments"
 
     assignment_id = db.Column(db.Integer, primary_key=True)
-    resource_id   = db.Column(db.Integer, db.ForeignKey("resources.resource_id"), nullable=False)
-    class_id      = db.Column(db.Integer, db.ForeignKey("classes.class_id"), nullable=False)
+    # SET NULL: deleting a tutor's resources must not take other tutors' assignments with them
+    resource_id   = db.Column(db.Integer, db.ForeignKey("resources.resource_id", ondelete="SET NULL"))
+    class_id      = db.Column(db.Integer, db.ForeignKey("classes.class_id", ondelete="CASCADE"), nullable=False)
     title         = db.Column(db.String(120), nullable=False)
     due_date      = db.Column(db.DateTime)
+    due_sort      = db.Column(db.DateTime, nullable=False, default=NO_DUE_DATE)  # due_date or NO_DUE_DATE
     created_at    = db.Column(db.DateTime, nullable=False, default=UTC_NOW)
     updated_at    = db.Column(db.DateTime, nullable=False, default=UTC_NOW, onupdate=UTC_NOW)
+    # kept by counters.py: every submission row, and distinct learners who have submitted
+    submission_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    submitter_count  = db.Column(db.Integer, nullable=False, default=0, server_default="0")
 
     class_   = db.relationship("Class", back_populates="assignments")
     resource = db.relationship("Resources", back_populates="assignments")
-    submissions = db.relationship("Submission", back_populates="assignment", cascade="all, delete-orphan")
+    submissions = db.relationship("Submission", back_populates="assignment", cascade="all, delete-orphan", passive_deletes=True)
+
+    @validates("due_date")
+    def _sync_due_sort(self, key, value):
+        self.due_sort = value or NO_DUE_DATE
+        return value
 
     def __repr__(self):
         return f"<Assignment {self.assignment_id} {self.title}>"
 
 Index("ix_assignments_class_created", Assignment.class_id, Assignment.created_at.desc())
+# covers the learner due-soon feed (learner/feed.py) without touching the table
+Index("ix_assignments_class_due_sort", Assignment.class_id, Assignment.due_sort,
+      Assignment.created_at.desc(), Assignment.title, Assignment.due_date)
 
 # ----- Submission -----
 class Submission(db.Model):
     __tablename__ = "submissions"
 
     submission_id = db.Column(db.Integer, primary_key=True)
-    assignment_id = db.Column(db.Integer, db.ForeignKey("assignments.assignment_id"), nullable=False)
-    user_id       = db.Column(db.Integer, db.ForeignKey("users.user_id"), nullable=False)
+    assignment_id = db.Column(db.Integer, db.ForeignKey("assignments.assignment_id", ondelete="CASCADE"), nullable=False)
+    user_id       = db.Column(db.Integer, db.ForeignKey("users.user_id", ondelete="CASCADE"), nullable=False)
     status        = db.Column(db.String(16), nullable=False)  # 'submitted' | 'graded' | etc
     score         = db.Column(db.Float)
     feedback      = db.Column(db.Text)
+    responses     = db.Column(db.LargeBinary)  # packed choice indices, see item_analysis.pack_responses
     submitted_at  = db.Column(db.DateTime, nullable=False, default=UTC_NOW)
 
     assignment = db.relationship("Assignment", back_populates="submissions")
@@ -163,15 +224,21 @@ class Submission(db.Model):
     def __repr__(self):
         return f"<Submission {self.submission_id} a={self.assignment_id} u={self.user_id}>"
 
+Index("ix_submissions_user_assignment", Submission.user_id, Submission.assignment_id, Submission.score)
+
 # ----- Progress (1:1 with User) -----
 class Progress(db.Model):
     __tablename__ = "progress"
 
     progress_id   = db.Column(db.Integer, primary_key=True)
-    user_id       = db.Column(db.Integer, db.ForeignKey("users.user_id"), unique=True, nullable=False)
+    user_id       = db.Column(db.Integer, db.ForeignKey("users.user_id", ondelete="CASCADE"), unique=True, nullable=False)
     best_score    = db.Column(db.Float)
     attempts      = db.Column(db.Integer, default=0)
     last_attempted= db.Column(db.DateTime)
+    xp            = db.Column(db.Integer, nullable=False, default=0)
+    lessons_completed = db.Column(db.Integer, nullable=False, default=0)
+    # {"maths": {"xp": 120, "attempts": 2, "score_sum": 150.0}, ...} — see learner/progress.py
+    subjects      = db.Column(MutableDict.as_mutable(db.JSON), nullable=False, default=dict)
 
     user = db.relationship("User", back_populates="progress")
 
@@ -187,7 +254,7 @@ class Reward(db.Model):
     description = db.Column(db.Text)
     criteria    = db.Column(db.Integer, nullable=False)  # e.g., points needed
 
-    user_rewards = db.relationship("UserReward", back_populates="reward", cascade="all, delete-orphan")
+    user_rewards = db.relationship("UserReward", back_populates="reward", cascade="all, delete-orphan", passive_deletes=True)
 
     def __repr__(self):
         return f"<Reward {self.reward_id} {self.title}>"
@@ -195,8 +262,8 @@ class Reward(db.Model):
 class UserReward(db.Model):
     __tablename__ = "user_rewards"
 
-    user_id   = db.Column(db.Integer, db.ForeignKey("users.user_id"), primary_key=True, nullable=False)
-    reward_id = db.Column(db.Integer, db.ForeignKey("rewards.reward_id"), primary_key=True, nullable=False)
+    user_id   = db.Column(db.Integer, db.ForeignKey("users.user_id", ondelete="CASCADE"), primary_key=True, nullable=False)
+    reward_id = db.Column(db.Integer, db.ForeignKey("rewards.reward_id", ondelete="CASCADE"), primary_key=True, nullable=False)
     earned_at = db.Column(db.DateTime, nullable=False, default=UTC_NOW)
 
     user   = db.relationship("User", back_populates="user_rewards")
@@ -210,7 +277,7 @@ class ActivityLog(db.Model):
     __tablename__ = "activity_logs"
 
     activity_id = db.Column(db.Integer, primary_key=True)
-    user_id     = db.Column(db.Integer, db.ForeignKey("users.user_id"), nullable=False)
+    user_id     = db.Column(db.Integer, db.ForeignKey("users.user_id", ondelete="CASCADE"), nullable=False)
     action      = db.Column(db.String(255), nullable=False)
     timestamp   = db.Column(db.DateTime, nullable=False, default=UTC_NOW)
 
@@ -218,3 +285,93 @@ class ActivityLog(db.Model):
 
     def __repr__(self):
         return f"<Activity {self.activity_id} u={self.user_id} {self.action[:24]}>"
+
+Index("ix_activity_logs_user_time", ActivityLog.user_id, ActivityLog.timestamp.desc())
+
+# ----- Analytics rollups (refreshed by `flask tutor refresh-rollups`) -----
+class DailyClassRollup(db.Model):
+    __tablename__ = "daily_class_rollups"
+
+    day          = db.Column(db.Date, primary_key=True)
+    class_id     = db.Column(db.Integer, db.ForeignKey("classes.class_id", ondelete="CASCADE"), primary_key=True)
+    tutor_id     = db.Column(db.Integer, db.ForeignKey("users.user_id", ondelete="CASCADE"), nullable=False)
+    subject      = db.Column(db.String(80), nullable=False)
+    submissions  = db.Column(db.Integer, nullable=False, default=0)
+    scored       = db.Column(db.Integer, nullable=False, default=0, server_default="0")  # submissions with a score
+    score_sum    = db.Column(db.Float, nullable=False, default=0)
+    score_sq_sum = db.Column(db.Float, nullable=False, default=0)
+    learners     = db.Column(db.Integer, nullable=False, default=0)  # distinct submitters that day
+
+    def __repr__(self):
+        return f"<DailyClassRollup {self.day} class={self.class_id} n={self.submissions}>"
+
+Index("ix_daily_rollups_tutor_day", DailyClassRollup.tutor_id, DailyClassRollup.day)
+
+class RollupState(db.Model):
+    __tablename__ = "rollup_state"
+
+    name       = db.Column(db.String(64), primary_key=True)
+    high_water = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime, nullable=False, default=UTC_NOW, onupdate=UTC_NOW)
+
+    def __repr__(self):
+        return f"<RollupState {self.name} hw={self.high_water}>"
+
+# ----- Lesson completions: one row per learner and lesson, so its XP is credited once -----
+class LessonCompletion(db.Model):
+    __tablename__ = "lesson_completions"
+
+    user_id       = db.Column(db.Integer, db.ForeignKey("users.user_id", ondelete="CASCADE"), primary_key=True)
+    assignment_id = db.Column(db.Integer, db.ForeignKey("assignments.assignment_id", ondelete="CASCADE"), primary_key=True)
+    completed_at  = db.Column(db.DateTime, nullable=False, default=UTC_NOW)
+
+    def __repr__(self):
+        return f"<LessonCompletion u={self.user_id} a={self.assignment_id}>"
+
+# ----- Due-date reminders (sent by `flask learner send-reminders`) -----
+class ReminderSent(db.Model):
+    __tablename__ = "reminders_sent"
+
+    user_id       = db.Column(db.Integer, db.ForeignKey("users.user_id", ondelete="CASCADE"), primary_key=True)
+    assignment_id = db.Column(db.Integer, db.ForeignKey("assignments.assignment_id", ondelete="CASCADE"), primary_key=True)
+    sent_at       = db.Column(db.DateTime, nullable=False, default=UTC_NOW)
+
+    def __repr__(self):
+        return f"<ReminderSent u={self.user_id} a={self.assignment_id}>"
+
+# ----- Tutor activity feed: capped ring buffer per tutor, filled on write (feeds.py) -----
+class TutorFeedHead(db.Model):
+    __tablename__ = "tutor_feed_heads"
+
+    tutor_id = db.Column(db.Integer, db.ForeignKey("users.user_id", ondelete="CASCADE"), primary_key=True)
+    head     = db.Column(db.Integer, nullable=False, default=0)  # seq of the newest entry
+
+class TutorFeedEntry(db.Model):
+    __tablename__ = "tutor_feed_entries"
+
+    tutor_id    = db.Column(db.Integer, db.ForeignKey("users.user_id", ondelete="CASCADE"), primary_key=True)
+    slot        = db.Column(db.Integer, primary_key=True)  # seq % FEED_SIZE
+    seq         = db.Column(db.Integer, nullable=False)
+    activity_id = db.Column(db.Integer, db.ForeignKey("activity_logs.activity_id", ondelete="CASCADE"), nullable=False)
+    action      = db.Column(db.String(255), nullable=False)
+    created_at  = db.Column(db.DateTime, nullable=False)
+
+    def __repr__(self):
+        return f"<TutorFeedEntry t={self.tutor_id} #{self.seq} {self.action[:24]}>"
+
+# ----- Live dashboard events: the cross-process channel behind the SSE streams (events.py) -----
+class LiveEvent(db.Model):
+    __tablename__ = "live_events"
+    __table_args__ = {"sqlite_autoincrement": True}  # ids are SSE event ids: never reuse one after a prune
+
+    event_id   = db.Column(db.Integer, primary_key=True)
+    topic      = db.Column(db.String(64), nullable=False)  # "tutor:<user_id>"
+    name       = db.Column(db.String(32), nullable=False)
+    payload    = db.Column(db.Text, nullable=False)        # JSON
+    created_at = db.Column(db.DateTime, nullable=False, default=UTC_NOW)
+
+    def __repr__(self):
+        return f"<LiveEvent #{self.event_id} {self.topic} {self.name}>"
+
+Index("ix_live_events_topic", LiveEvent.topic, LiveEvent.event_id)
+Index("ix_live_events_created", LiveEvent.created_at)
@@ -0,0 +1,100 @@
+# replicas.py — send read-only views to a replica, except right after the user's own writes
+import os
+import time
+from functools import wraps
+import click
+from flask.cli import AppGroup
+from flask import g, session, has_request_context, current_app
+from sqlalchemy import event, Insert, Update, Delete
+from tenancy import DEFAULT, TenantSession, bind_key, current_tenant, tenant_engine, tenant_env
+
+WROTE_AT = "_wrote_at"  # flask session key: when this browser last committed a write
+
+
+def replica_key(tenant: str) -> str:
+    return "replica" if tenant == DEFAULT else f"{bind_key(tenant)}:replica"
+
+
+def replica_binds(tenants) -> dict:
+    """SQLALCHEMY_BINDS entries for REPLICA_DATABASE_URL / TENANT_<NAME>_REPLICA_URL, where set."""
+    urls = {DEFAULT: os.getenv("REPLICA_DATABASE_URL")}
+    urls.update({t: os.getenv(tenant_env(t, "REPLICA_URL")) for t in tenants})
+    return {replica_key(t): url for t, url in urls.items() if url}
+
+
+def read_only(view):
+    """Mark a view's queries as safe to serve from the replica."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        g.read_only = True
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def _recently_wrote() -> bool:
+    wrote_at = session.get(WROTE_AT)
+    return bool(wrote_at) and time.time() - wrote_at < current_app.config["REPLICA_STICKY_SECONDS"]
+
+
+class RoutingSession(TenantSession):
+    """TenantSession that reads from the tenant's replica inside @read_only views."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (bind is None and not self._flushing
+                and not isinstance(clause, (Insert, Update, Delete))
+                and has_request_context() and g.get("read_only") and not _recently_wrote()):
+            engine = self._db.engines.get(replica_key(current_tenant()))
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+# read-your-writes: a commit that flushed anything pins this browser to the primary for a while
+@event.listens_for(RoutingSession, "after_flush")
+def _note_write(sess, _flush_context):
+    sess.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _stick_to_primary(sess):
+    if sess.info.pop("wrote", False) and has_request_context():
+        session[WROTE_AT] = time.time()
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _forget_write(sess):
+    sess.info.pop("wrote", None)
+
+
+def init_app(app):
+    app.config.setdefault("REPLICA_STICKY_SECONDS", 10)
+    app.cli.add_command(replica_cli)
+
+
+# ----- CLI: flask replica ... -----
+@click.group("replica", cls=AppGroup)
+def replica_cli():
+    """Read-replica commands."""
+
+
+@replica_cli.command("sync")
+@click.argument("tenant", required=False)
+def sync(tenant):
+    """Copy a SQLite primary onto its SQLite replica (local stand-in for real replication)."""
+    db = current_app.extensions["sqlalchemy"]
+    tenant = tenant or DEFAULT
+    replica = db.engines.get(replica_key(tenant))
+    if replica is None:
+        raise click.ClickException(f"No replica configured for {tenant!r}")
+    primary = tenant_engine(db, tenant)
+    if primary.dialect.name != "sqlite" or replica.dialect.name != "sqlite":
+        raise click.ClickException("Only SQLite pairs can be synced here; use the database's own replication")
+
+    src, dst = primary.raw_connection(), replica.raw_connection()
+    try:
+        src.driver_connection.backup(dst.driver_connection)
+    finally:
+        src.close()
+        dst.close()
+    replica.dispose()  # drop pooled connections that saw the old file
+    click.echo(f"{tenant}: replica synced from {primary.url}")
@@ -0,0 +1,86 @@
+// static/css/js/heatmap.js — draws the class gradebook matrix from /api/v1/classes/<id>/gradebook
+(function () {
+const canvas = document.getElementById('heatmap');
+if (!canvas || !canvas.dataset.src) return;
+const tip = document.getElementById('heatmap-tip');
+const summary = document.getElementById('heatmap-summary');
+
+const LABEL_W = 170;   // learner names + their average
+const HEAD_H = 28;     // assignment averages row
+const NOT_DONE = '#e7eaf2';
+const UNSCORED = '#c9c2e8';
+
+function colour(score) {  // 0% red -> 100% green
+return `hsl(${Math.round(score * 1.2)}, 65%, 55%)`;
+}
+
+function doneBit(bits, i) {
+return (bits.charCodeAt(i >> 3) >> (7 - (i & 7))) & 1;
+}
+
+function pct(v) {
+return v === null ? '–' : `${Math.round(v)}%`;
+}
+
+function draw(g) {
+const [rows, cols] = g.shape;
+if (!rows || !cols) {
+    summary.textContent = 'No learners or assignments in this class yet.';
+    canvas.hidden = true;
+    return;
+}
+const bits = atob(g.done);
+const cell = Math.max(6, Math.min(24, Math.floor((canvas.parentElement.clientWidth - LABEL_W) / cols)));
+const rowH = Math.max(cell, 14);
+const ratio = window.devicePixelRatio || 1;
+canvas.width = (LABEL_W + cols * cell) * ratio;
+canvas.height = (HEAD_H + rows * rowH) * ratio;
+canvas.style.width = `${LABEL_W + cols * cell}px`;
+canvas.style.height = `${HEAD_H + rows * rowH}px`;
+const ctx = canvas.getContext('2d');
+ctx.scale(ratio, ratio);
+ctx.font = '12px system-ui, sans-serif';
+ctx.textBaseline = 'middle';
+
+for (let c = 0; c < cols; c++) {
+    const avg = g.assignment_average[c];
+    ctx.fillStyle = avg === null ? NOT_DONE : colour(avg);
+    ctx.fillRect(LABEL_W + c * cell, 4, cell - 1, HEAD_H - 8);
+}
+for (let r = 0; r < rows; r++) {
+    const y = HEAD_H + r * rowH;
+    ctx.fillStyle = '#374151';
+    ctx.fillText(`${g.students[r].name}`.slice(0, 20), 4, y + rowH / 2);
+    ctx.fillText(pct(g.student_average[r]), LABEL_W - 40, y + rowH / 2);
+    for (let c = 0; c < cols; c++) {
+    const score = g.scores[r][c];
+    ctx.fillStyle = score !== null ? colour(score) : (doneBit(bits, r * cols + c) ? UNSCORED : NOT_DONE);
+    ctx.fillRect(LABEL_W + c * cell, y, cell - 1, rowH - 1);
+    }
+}
+
+const done = g.student_completion.reduce((a, b) => a + b, 0) / rows;
+summary.textContent = `${rows} learners × ${cols} assignments · ${Math.round(done)}% complete. Hover a cell for details.`;
+
+canvas.addEventListener('mousemove', e => {
+    const box = canvas.getBoundingClientRect();
+    const c = Math.floor((e.clientX - box.left - LABEL_W) / cell);
+    const r = Math.floor((e.clientY - box.top - HEAD_H) / rowH);
+    const a = g.assignments[c];
+    if (!a) { tip.textContent = ''; return; }
+    if (r < 0) {
+    tip.textContent = `${a.title}: ${pct(g.assignment_completion[c])} submitted, average ${pct(g.assignment_average[c])}`;
+    } else if (r < rows) {
+    const s = g.students[r];
+    const state = g.scores[r][c] !== null ? pct(g.scores[r][c])
+        : (doneBit(bits, r * cols + c) ? 'submitted, not scored' : 'not submitted');
+    tip.textContent = `${s.name} — ${a.title}: ${state}`;
+    }
+});
+}
+
+fetch(canvas.dataset.src, { credentials: 'same-origin', headers: { Accept: 'application/json' } })
+.then(r => (r.ok ? r.json() : Promise.reject(r.status)))
+.then(draw)
+.catch(() => { summary.textContent = 'Couldn’t load the gradebook. Refresh to try again.'; });
+})();
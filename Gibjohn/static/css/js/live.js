@@ -0,0 +1,49 @@
+// static/css/js/live.js — live tutor dashboard via server-sent events
+(function () {
+const root = document.getElementById('tutor-live');
+const feed = document.getElementById('activity-feed');
+if (!root || !root.dataset.stream || !window.EventSource) return;
+
+const MAX_ITEMS = 8;
+
+function addActivity(text) {
+if (!feed) return;
+const empty = feed.querySelector('.muted');
+if (empty) empty.remove();
+const p = document.createElement('p');
+p.className = 'activity-item';
+p.textContent = text;
+feed.prepend(p);
+while (feed.children.length > MAX_ITEMS) feed.lastElementChild.remove();
+}
+
+const RETRY_MS = 30000;  // after a 503 (worker's stream slots full); matches SSE_RETRY_SECONDS
+let lastId = '';
+
+function connect() {
+const url = lastId ? `${root.dataset.stream}?last_event_id=${encodeURIComponent(lastId)}` : root.dataset.stream;
+const es = new EventSource(url);
+
+es.addEventListener('submission', e => {
+lastId = e.lastEventId;
+const d = JSON.parse(e.data);
+const row = document.querySelector(`tr[data-assignment-id="${d.assignment_id}"] .js-submissions`);
+if (row) row.textContent = `${d.submitted}/${d.class_size}`;
+addActivity(`${d.learner} submitted ‘${d.title}’ (${Math.round(d.score || 0)}%)`);
+});
+
+es.addEventListener('activity', e => {
+lastId = e.lastEventId;
+addActivity(JSON.parse(e.data).action);
+});
+
+// EventSource reconnects by itself after a dropped stream, but gives up on
+// an error status (503 when the server is at capacity): retry with jitter
+es.onerror = () => {
+if (es.readyState !== EventSource.CLOSED) return;
+setTimeout(connect, RETRY_MS * (0.5 + Math.random()));
+};
+}
+
+connect();
+})();
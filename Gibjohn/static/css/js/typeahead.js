@@ -0,0 +1,37 @@
+// static/css/js/typeahead.js — refill a <select> from a JSON search endpoint
+(function () {
+const inputs = document.querySelectorAll('input[data-typeahead]');
+if (!inputs.length) return;
+
+inputs.forEach(input => {
+const select = document.getElementById(input.dataset.target);
+if (!select) return;
+let timer = null;
+let inflight = null;
+
+input.addEventListener('input', () => {
+    clearTimeout(timer);
+    timer = setTimeout(async () => {
+    if (inflight) inflight.abort();
+    inflight = new AbortController();
+    const url = `${input.dataset.typeahead}?q=${encodeURIComponent(input.value.trim())}`;
+    try {
+        const res = await fetch(url, { signal: inflight.signal, headers: { 'Accept': 'application/json' } });
+        if (!res.ok) return;
+        const items = await res.json();
+        const keep = select.value;
+        select.innerHTML = '';
+        items.forEach(it => {
+        const opt = document.createElement('option');
+        opt.value = it.id;
+        opt.textContent = it.label;
+        if (String(it.id) === keep) opt.selected = true;
+        select.appendChild(opt);
+        });
+    } catch (e) {
+        if (e.name !== 'AbortError') console.error(e);
+    }
+    }, 200);
+});
+});
+})();
@@ -0,0 +1,53 @@
+# streaming.py — helpers for building large downloads chunk by chunk
+import io
+import zipfile
+
+
+class ChunkSink(io.RawIOBase):
+    """
+    Write-only, non-seekable file object that buffers bytes until drained.
+    ZipFile falls back to data descriptors on unseekable outputs, so a zip
+    written here can be yielded to the client while it is being built.
+    """
+
+    def __init__(self):
+        self._buf = bytearray()
+        self._pos = 0
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self._buf += b
+        self._pos += len(b)
+        return len(b)
+
+    def tell(self):
+        # zipfile asks for offsets when writing local headers
+        return self._pos
+
+    @property
+    def pending(self) -> int:
+        return len(self._buf)
+
+    def drain(self) -> bytes:
+        out = bytes(self._buf)
+        self._buf.clear()
+        return out
+
+
+def stream_zip(members, chunk_size: int = 64 * 1024):
+    """
+    Yield a ZIP archive as bytes. `members` yields (arcname, iterable_of_bytes);
+    each member body is itself streamed, so memory stays at roughly chunk_size.
+    """
+    sink = ChunkSink()
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for arcname, body in members:
+            with zf.open(arcname, mode="w", force_zip64=True) as dest:
+                for piece in body:
+                    dest.write(piece)
+                    if sink.pending >= chunk_size:
+                        yield sink.drain()
+            yield sink.drain()
+    yield sink.drain()
@@ -0,0 +1,157 @@
+# tenancy.py — one database per school, picked per request (subdomain/session) or per CLI run
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+import click
+from flask.cli import AppGroup
+from flask import g, request, session, has_app_context, current_app
+from flask_sqlalchemy.session import Session as FlaskSession
+
+DEFAULT = "default"
+ENV_VAR = "GIBJOHN_TENANT"  # lets any existing `flask ...` command target one school
+
+_cli_tenant = ContextVar("tenant", default=None)
+
+
+def bind_key(tenant: str) -> str:
+    return f"tenant:{tenant}"
+
+
+def tenant_env(tenant: str, suffix: str) -> str:
+    """Environment variable name for a per-school setting, e.g. TENANT_SCHOOL_A_DATABASE_URL."""
+    return f"TENANT_{tenant.upper().replace('-', '_')}_{suffix}"
+
+
+def tenant_binds(tenants) -> dict:
+    """SQLALCHEMY_BINDS entries: TENANT_<NAME>_DATABASE_URL or instance/tenant-<name>.db."""
+    return {
+        bind_key(t): os.getenv(tenant_env(t, "DATABASE_URL"), f"sqlite:///tenant-{t}.db")
+        for t in tenants
+    }
+
+
+def current_tenant() -> str:
+    if has_app_context() and "tenant" in g:
+        return g.tenant
+    return _cli_tenant.get() or os.getenv(ENV_VAR) or DEFAULT
+
+
+def tenant_namespace(key) -> tuple:
+    """Prefix a per-process cache key so schools never share entries."""
+    return (current_tenant(), key)
+
+
+@contextmanager
+def tenant_context(tenant: str):
+    token = _cli_tenant.set(tenant)
+    try:
+        yield
+    finally:
+        _cli_tenant.reset(token)
+
+
+class TenantSession(FlaskSession):
+    """Routes every unbound query to the current tenant's engine."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is not None:
+            return bind
+        tenant = current_tenant()
+        if tenant != DEFAULT:
+            engines = self._db.engines
+            key = bind_key(tenant)
+            if key not in engines:
+                raise LookupError(f"Unknown tenant {tenant!r}; add it to TENANTS")
+            return engines[key]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def tenant_engine(db, tenant: str):
+    return db.engines[None] if tenant == DEFAULT else db.engines[bind_key(tenant)]
+
+
+def _resolve_request_tenant(known) -> str:
+    host = (request.host or "").split(":")[0]
+    sub = host.split(".")[0] if host.count(".") >= 1 else ""
+    if sub in known:
+        if session.get("tenant") != sub:
+            session["tenant"] = sub
+        return sub
+    t = session.get("tenant")
+    return t if t in known else DEFAULT
+
+
+def init_app(app, db):
+    known = set(app.config.get("TENANTS", []))
+
+    @app.before_request
+    def _pick_tenant():
+        g.tenant = _resolve_request_tenant(known)
+
+    app.cli.add_command(tenants_cli)
+
+
+# ----- CLI: flask tenants ... -----
+@click.group("tenants", cls=AppGroup)
+def tenants_cli():
+    """Per-school database commands."""
+
+
+def _all_tenants():
+    return [DEFAULT] + list(current_app.config.get("TENANTS", []))
+
+
+@tenants_cli.command("list")
+def list_tenants():
+    db = current_app.extensions["sqlalchemy"]
+    for t in _all_tenants():
+        click.echo(f"{t:20} {tenant_engine(db, t).url}")
+
+
+@tenants_cli.command("init-db")
+@click.argument("tenant", required=False)
+def init_db(tenant):
+    """Create the schema for a new tenant (or all), or migrate an existing one to head."""
+    from flask_migrate import stamp, upgrade
+    from sqlalchemy import inspect
+    db = current_app.extensions["sqlalchemy"]
+    for t in [tenant] if tenant else _all_tenants():
+        engine = tenant_engine(db, t)
+        with tenant_context(t):
+            if inspect(engine).get_table_names():
+                upgrade()  # create_all would add new tables but never new columns
+            else:
+                db.metadata.create_all(bind=engine)
+                stamp()  # built from the models, so already at the newest revision
+        click.echo(f"{t}: schema ready")
+
+
+@tenants_cli.command("vacuum")
+@click.argument("tenant", required=False)
+def vacuum(tenant):
+    """VACUUM + ANALYZE each tenant database independently."""
+    db = current_app.extensions["sqlalchemy"]
+    for t in [tenant] if tenant else _all_tenants():
+        engine = tenant_engine(db, t)
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            if engine.dialect.name == "sqlite":
+                conn.exec_driver_sql("VACUUM")
+            conn.exec_driver_sql("ANALYZE")
+        click.echo(f"{t}: vacuumed")
+
+
+@tenants_cli.command("each", context_settings={"ignore_unknown_options": True})
+@click.argument("args", nargs=-1, type=click.UNPROCESSED)
+@click.option("--only", multiple=True, help="Limit to these tenants.")
+@click.pass_context
+def run_each(ctx, args, only):
+    """Run another flask command once per tenant, e.g. `flask tenants each tutor refresh-rollups`."""
+    root = ctx.find_root().command
+    db = current_app.extensions["sqlalchemy"]
+    for t in only or _all_tenants():
+        click.echo(f"== {t} ==")
+        with tenant_context(t):
+            try:
+                root.main(list(args), standalone_mode=False, obj=ctx.find_root().obj)
+            finally:
+                db.session.remove()  # don't carry one school's identity map into the next
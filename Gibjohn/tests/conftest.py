@@ -0,0 +1,76 @@
+# tests/conftest.py — one throwaway SQLite database per test, app imported against it
+import os
+import sys
+import tempfile
+import pytest
+from flask import g
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TMP = tempfile.mkdtemp(prefix="gibjohn-tests-")
+DB_PATH = os.path.join(TMP, "test.db")
+
+# Config reads the environment at import time, so set it before `app` is imported
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+os.environ["CACHE_PATH"] = os.path.join(TMP, "cache.sqlite3")
+os.environ["PROFILE_DIR"] = os.path.join(TMP, "profiles")
+os.environ["SLOW_QUERY_LOG"] = os.path.join(TMP, "slow-queries.jsonl")
+os.environ["MAIL_OUTBOX"] = os.path.join(TMP, "outbox")
+sys.path.insert(0, ROOT)
+
+from app import app as flask_app  # noqa: E402
+from models import db, User, Class, Resources, Assignment, ClassEnrollment  # noqa: E402
+
+flask_app.config.update(TESTING=True, WTF_CSRF_ENABLED=False, RATELIMIT_ENABLED=False)
+flask_app.login_manager.session_protection = None  # the test client's identity isn't under test
+
+
+def reset_database(create: bool = True) -> None:
+    """Drop the file and pooled connections; optionally build the current schema."""
+    with flask_app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+        if os.path.exists(DB_PATH):
+            os.remove(DB_PATH)
+        if create:
+            db.create_all()
+
+
+@pytest.fixture
+def app():
+    reset_database()
+    with flask_app.app_context():
+        yield flask_app
+        db.session.remove()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def login(client, user) -> None:
+    with client.session_transaction() as sess:
+        sess["_user_id"] = str(user.user_id)
+    # requests share the fixture's app context, so drop the user Flask-Login cached in g
+    g.pop("_login_user", None)
+
+
+def make_user(email: str, role: str = "learner", password: str = "Passw0rd!", **kw) -> User:
+    user = User(email=email, role=role, full_name=kw.pop("full_name", email.split("@")[0].title()), **kw)
+    user.set_password(password)
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def make_class(tutor: User, learners=(), title: str = "Maths 7A", subject: str = "Maths") -> tuple[Class, Assignment]:
+    """A class taught by `tutor` with `learners` enrolled and one assignment."""
+    klass = Class(title=title, subject=subject, year_group=7, tutor_id=tutor.user_id)
+    resource = Resources(title=f"{title} worksheet", subject=subject, type="link", owner_id=tutor.user_id)
+    db.session.add_all([klass, resource])
+    db.session.flush()
+    db.session.add_all(ClassEnrollment(class_id=klass.class_id, user_id=u.user_id) for u in learners)
+    assignment = Assignment(title=f"{title} homework", class_id=klass.class_id, resource_id=resource.resource_id)
+    db.session.add(assignment)
+    db.session.commit()
+    return klass, assignment
@@ -0,0 +1,169 @@
+# tests/test_account_delete.py — account and assignment deletion with and without cascading foreign keys
+import shutil
+import pytest
+from flask_migrate import upgrade
+from sqlalchemy import MetaData, select, func
+from counters import check
+from conftest import DB_PATH, ROOT, reset_database, login, make_user, make_class
+from models import (db, User, Class, Resources, Assignment, ClassEnrollment, Submission,
+                    ActivityLog, Progress, fk_cascades)
+
+
+def _seed_learner_with_history():
+    tutor = make_user("tutor@example.com", role="tutor")
+    learner = make_user("learner@example.com")
+    classmate = make_user("classmate@example.com")
+    klass, assignment = make_class(tutor, learners=[learner, classmate])
+    db.session.add_all([
+        Submission(assignment_id=assignment.assignment_id, user_id=learner.user_id, status="submitted", score=60),
+        Submission(assignment_id=assignment.assignment_id, user_id=learner.user_id, status="submitted", score=80),
+        Submission(assignment_id=assignment.assignment_id, user_id=classmate.user_id, status="submitted", score=70),
+        ActivityLog(user_id=learner.user_id, action="Completed lesson"),
+        ActivityLog(user_id=learner.user_id, action="Submitted quiz"),
+        Progress(user_id=learner.user_id, xp=140),
+    ])
+    db.session.commit()
+    return tutor, learner, classmate, klass, assignment
+
+
+def _create_schema_without_cascades():
+    """The current tables, but with foreign keys as they were before ON DELETE CASCADE."""
+    reset_database(create=False)
+    legacy = MetaData()
+    for table in db.metadata.sorted_tables:
+        for fk in table.to_metadata(legacy).foreign_key_constraints:
+            fk.ondelete = None
+    legacy.create_all(db.engine)
+
+
+def _count(model, *where):
+    return db.session.scalar(select(func.count()).select_from(model).where(*where))
+
+
+def _delete_via_profile(client, user):
+    login(client, user)
+    resp = client.post("/account", data={"password": "Passw0rd!", "confirm": "y", "delete_submit": "Delete account"},
+                       follow_redirects=True)
+    assert b"Your account has been deleted." in resp.data
+    assert b"Could not delete account" not in resp.data
+
+
+def _assert_learner_gone(learner_id, classmate, assignment):
+    db.session.expire_all()
+    assert db.session.get(User, learner_id) is None
+    assert _count(Submission, Submission.user_id == learner_id) == 0
+    assert _count(ActivityLog, ActivityLog.user_id == learner_id) == 0
+    assert _count(ClassEnrollment, ClassEnrollment.user_id == learner_id) == 0
+    assert _count(Progress, Progress.user_id == learner_id) == 0
+    # the classmate's work and the class itself are untouched, and the counters follow the deletes
+    assert _count(Submission, Submission.user_id == classmate.user_id) == 1
+    a = db.session.get(Assignment, assignment.assignment_id)
+    assert (a.submission_count, a.submitter_count, a.class_.student_count) == (1, 1, 1)
+
+
+def test_delete_learner_account_with_cascading_keys(client):
+    _, learner, classmate, _, assignment = _seed_learner_with_history()
+    assert fk_cascades()
+    learner_id = learner.user_id
+    _delete_via_profile(client, learner)
+    _assert_learner_gone(learner_id, classmate, assignment)
+
+
+def test_delete_tutor_account_removes_classes_and_their_submissions(client):
+    tutor, learner, _, klass, _ = _seed_learner_with_history()
+    _delete_via_profile(client, tutor)
+    db.session.expire_all()
+    assert _count(Class) == _count(Assignment) == _count(Resources) == _count(Submission) == 0
+    assert _count(ClassEnrollment) == 0
+    assert db.session.get(User, learner.user_id) is not None
+
+
+def test_delete_account_without_cascading_keys(client):
+    """Same deletion on a schema whose foreign keys predate ON DELETE CASCADE."""
+    _create_schema_without_cascades()
+
+    _, learner, classmate, _, assignment = _seed_learner_with_history()
+    assert not fk_cascades()
+    learner_id = learner.user_id
+    _delete_via_profile(client, learner)
+    _assert_learner_gone(learner_id, classmate, assignment)
+
+
+def test_delete_assignment_with_submissions_without_cascading_keys(client):
+    _create_schema_without_cascades()
+
+    tutor, _, _, _, assignment = _seed_learner_with_history()
+    login(client, tutor)
+    resp = client.post(f"/assignments/{assignment.assignment_id}/delete", follow_redirects=True)
+    assert b"Assignment deleted." in resp.data
+    db.session.expire_all()
+    assert _count(Assignment) == _count(Submission) == 0
+
+
+@pytest.mark.parametrize("who", ["learner", "tutor"])
+def test_cascade_migration_on_pre_migrations_database(app, who):
+    """instance/app.db predates migrations and cascading keys; after the 033 revision a bare DELETE cascades."""
+    reset_database(create=False)
+    shutil.copy(f"{ROOT}/instance/app.db", DB_PATH)
+    upgrade(directory=f"{ROOT}/migrations", revision="503b1fda0d98")
+    assert fk_cascades()
+    # the migration's connection went back to the pool: it must not have kept foreign_keys=OFF
+    assert db.session.connection().exec_driver_sql("PRAGMA foreign_keys").scalar() == 1
+    db.session.remove()
+
+    with db.engine.begin() as conn:
+        uid = conn.exec_driver_sql("SELECT min(user_id) FROM users WHERE role = ?", (who,)).scalar()
+        before = {t: conn.exec_driver_sql(f"SELECT count(*) FROM {t}").scalar() for t in ("submissions", "users")}
+        conn.exec_driver_sql("DELETE FROM users WHERE user_id = ?", (uid,))
+        for table, column in [("submissions", "user_id"), ("activity_logs", "user_id"),
+                              ("class_enrollments", "user_id"), ("classes", "tutor_id"), ("progress", "user_id")]:
+            assert conn.exec_driver_sql(f"SELECT count(*) FROM {table} WHERE {column} = ?", (uid,)).scalar() == 0
+        assert conn.exec_driver_sql("SELECT count(*) FROM submissions").scalar() < before["submissions"]
+        assert conn.exec_driver_sql("SELECT count(*) FROM users").scalar() == before["users"] - 1
+
+
+def test_delete_account_on_pre_migrations_database_upgraded_to_head(client):
+    """The whole chain: instance/app.db upgraded to head, then a learner deletes their account via /account."""
+    reset_database(create=False)
+    shutil.copy(f"{ROOT}/instance/app.db", DB_PATH)
+    upgrade(directory=f"{ROOT}/migrations")
+    assert fk_cascades()
+    assert check() == (0, 0)  # the counter columns were backfilled
+
+    learner = db.session.scalars(select(User).where(User.role == "learner").order_by(User.user_id)).first()
+    learner.set_password("Passw0rd!")
+    db.session.commit()
+    learner_id = learner.user_id
+    _delete_via_profile(client, learner)
+
+    db.session.expire_all()
+    assert db.session.get(User, learner_id) is None
+    for model in (Submission, ActivityLog, ClassEnrollment, Progress):
+        assert _count(model, model.user_id == learner_id) == 0
+    assert check() == (0, 0)  # and the counters followed the deletes
+
+
+@pytest.mark.parametrize("cascading", [True, False])
+def test_delete_tutor_keeps_other_tutors_assignments_that_use_their_resources(client, cascading):
+    if not cascading:
+        _create_schema_without_cascades()
+    tutor, learner, _, _, shared = _seed_learner_with_history()  # `shared` is in tutor's class and resource
+    other = make_user("other@example.com", role="tutor")
+    other_class, _ = make_class(other, learners=[learner], title="Science 8B", subject="Science")
+    borrowed = Assignment(title="Borrowed worksheet", class_id=other_class.class_id, resource_id=shared.resource_id)
+    db.session.add(borrowed)
+    db.session.flush()
+    db.session.add(Submission(assignment_id=borrowed.assignment_id, user_id=learner.user_id,
+                              status="submitted", score=90))
+    db.session.commit()
+    other_id, borrowed_id, learner_id = other.user_id, borrowed.assignment_id, learner.user_id
+
+    _delete_via_profile(client, tutor)
+
+    db.session.expire_all()
+    assert _count(Assignment, Assignment.class_id == other_class.class_id) == 2
+    kept = db.session.get(Assignment, borrowed_id)
+    assert kept.resource_id is None  # the resource went with its owner; the assignment stays
+    assert _count(Submission, Submission.assignment_id == borrowed_id, Submission.user_id == learner_id) == 1
+    assert _count(Resources, Resources.owner_id == other_id) == 1
+    assert check() == (0, 0)
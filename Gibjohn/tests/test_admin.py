@@ -0,0 +1,55 @@
+# tests/test_admin.py — /admin access and the request profiler
+import json
+import os
+from conftest import login, make_user
+from admin import profiling
+from models import db
+
+
+def test_admin_pages_need_the_admin_flag_not_an_email(client):
+    # whoever registers an address is trusted with nothing: access is a server-side flag
+    visitor = make_user("head@school.example", role="tutor")
+    login(client, visitor)
+    resp = client.get("/admin/profiles", follow_redirects=True)
+    assert b"Access denied." in resp.data
+
+    visitor.is_admin = True
+    db.session.commit()
+    assert client.get("/admin/profiles").status_code == 200
+
+
+def test_grant_command_sets_and_revokes_the_flag(app):
+    user = make_user("ops@school.example")
+    runner = app.test_cli_runner()
+    assert "granted" in runner.invoke(args=["admin", "grant", "OPS@school.example"]).output
+    db.session.refresh(user)
+    assert user.is_admin
+    runner.invoke(args=["admin", "grant", "ops@school.example", "--revoke"])
+    db.session.refresh(user)
+    assert not user.is_admin
+    assert runner.invoke(args=["admin", "grant", "nobody@school.example"]).exit_code != 0
+
+
+def _profiles_on_disk(app):
+    directory = app.config["PROFILE_DIR"]
+    return [f for f in os.listdir(directory) if f.endswith(".json") and f != profiling.SETTINGS_FILE]
+
+
+def test_streamed_responses_are_not_profiled(app, client):
+    tutor = make_user("tutor@school.example", role="tutor")
+    login(client, tutor)
+    for f in _profiles_on_disk(app):
+        os.remove(os.path.join(app.config["PROFILE_DIR"], f))
+    profiling.save_settings(rate=1.0, minutes=5)
+    try:
+        stream = client.get("/tutor/dashboard/stream", buffered=False)
+        assert stream.is_streamed
+        stream.close()
+        assert _profiles_on_disk(app) == []
+
+        client.get("/account")
+        [meta] = _profiles_on_disk(app)
+        with open(os.path.join(app.config["PROFILE_DIR"], meta)) as fh:
+            assert json.load(fh)["endpoint"] == "auth.profile"
+    finally:
+        profiling.save_settings(0.0)
@@ -0,0 +1,65 @@
+# tests/test_counters.py — student/submission counters follow ORM writes; `check` repairs the rest
+from sqlalchemy import delete
+from conftest import make_user, make_class
+from counters import check
+from models import db, Class, Assignment, Submission, User
+
+
+def _submit(assignment, learner) -> Submission:
+    sub = Submission(assignment_id=assignment.assignment_id, user_id=learner.user_id, status="submitted", score=70.0)
+    db.session.add(sub)
+    db.session.commit()
+    return sub
+
+
+def _counts(assignment) -> tuple[int, int]:
+    db.session.refresh(assignment)
+    return assignment.submission_count, assignment.submitter_count
+
+
+def test_a_learner_counts_once_however_many_attempts(app):
+    tutor = make_user("tutor@school.example", role="tutor")
+    ada, grace = make_user("ada@school.example"), make_user("grace@school.example")
+    klass, assignment = make_class(tutor, [ada, grace])
+    assert db.session.get(Class, klass.class_id).student_count == 2
+
+    _submit(assignment, ada)
+    assert _counts(assignment) == (1, 1)
+    _submit(assignment, ada)
+    assert _counts(assignment) == (2, 1)
+    _submit(assignment, grace)
+    assert _counts(assignment) == (3, 2)
+    assert check() == (0, 0)
+
+
+def test_deleting_attempts_counts_the_submitter_off_with_the_last(app):
+    tutor = make_user("tutor@school.example", role="tutor")
+    ada = make_user("ada@school.example")
+    _, assignment = make_class(tutor, [ada])
+    first, second = _submit(assignment, ada), _submit(assignment, ada)
+
+    db.session.delete(first)
+    db.session.commit()
+    assert _counts(assignment) == (1, 1)  # ada still has an attempt
+    db.session.delete(second)
+    db.session.commit()
+    assert _counts(assignment) == (0, 0)
+    assert check() == (0, 0)
+
+
+def test_check_repairs_counts_after_a_database_cascade(app):
+    tutor = make_user("tutor@school.example", role="tutor")
+    ada, grace = make_user("ada@school.example"), make_user("grace@school.example")
+    klass, assignment = make_class(tutor, [ada, grace])
+    _submit(assignment, ada)
+    _submit(assignment, grace)
+    class_id, assignment_id = klass.class_id, assignment.assignment_id
+
+    # a bulk delete: ON DELETE CASCADE removes grace's enrolment and submission without the ORM hooks
+    db.session.execute(delete(User).where(User.user_id == grace.user_id))
+    db.session.commit()
+    assert check() == (1, 1)
+    assert check(repair=True) == (1, 1)
+    assert check() == (0, 0)
+    assert db.session.get(Class, class_id).student_count == 1
+    assert _counts(db.session.get(Assignment, assignment_id)) == (1, 1)
@@ -0,0 +1,49 @@
+# tests/test_fanout.py — gather runs side by side, and falls back to serial when the pool is busy
+import threading
+import pytest
+from flask import g
+import fanout
+
+
+@pytest.fixture
+def request_ctx(app):
+    app.config["FANOUT_WORKERS"] = 2
+    with app.test_request_context("/tutor/dashboard"):
+        yield
+
+
+def _where():
+    return threading.get_ident(), "_profile" in g
+
+
+def test_caller_runs_one_query_and_the_pool_the_rest(request_ctx):
+    g._profile = "the caller's profiler"
+    results = fanout.gather(a=_where, b=_where, c=_where)
+    assert list(results) == ["a", "b", "c"]
+    assert results["a"] == (threading.get_ident(), True)
+    assert {results["b"][0], results["c"][0]}.isdisjoint({threading.get_ident()})
+    assert not results["b"][1] and not results["c"][1]  # copies never see the profiler
+    assert g.pop("_profile") == "the caller's profiler"
+
+
+def test_saturated_pool_runs_serially_in_the_caller(request_ctx):
+    _, slots = fanout._executor()
+    taken = [slots.acquire(blocking=False) for _ in range(2)]  # other requests hold every slot
+    try:
+        assert all(taken)
+        results = fanout.gather(a=_where, b=_where, c=_where)
+        assert {ident for ident, _ in results.values()} == {threading.get_ident()}
+    finally:
+        for _ in taken:
+            slots.release()
+
+
+def test_slots_are_returned_after_a_failure(request_ctx):
+    def boom():
+        raise RuntimeError("query failed")
+    with pytest.raises(RuntimeError):
+        fanout.gather(a=_where, b=boom, c=_where)
+    _, slots = fanout._executor()
+    assert [slots.acquire(timeout=1) for _ in range(2)] == [True, True]  # the callbacks may still be running
+    slots.release()
+    slots.release()
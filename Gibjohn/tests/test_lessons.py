@@ -0,0 +1,59 @@
+# tests/test_lessons.py — finishing a lesson credits its XP once, and only for enrolled learners
+from sqlalchemy import select, func
+from conftest import login, make_user, make_class
+from learner.progress import LESSON_XP
+from models import db, Class, ClassEnrollment, Progress, ActivityLog
+
+
+def _progress(user_id):
+    db.session.expire_all()
+    p = db.session.scalar(select(Progress).where(Progress.user_id == user_id))
+    return (p.xp, p.lessons_completed) if p else (0, 0)
+
+
+def test_finishing_a_lesson_again_credits_nothing(client):
+    tutor = make_user("tutor@school.example", role="tutor")
+    learner = make_user("ada@school.example")
+    _, assignment = make_class(tutor, [learner])
+    learner_id, url = learner.user_id, f"/lesson/{assignment.assignment_id}/complete"
+    login(client, learner)
+    assert f'action="{url}"'.encode() in client.get(f"/lesson/{assignment.assignment_id}/play").data
+
+    # the finish page itself is read-only: before finishing it sends the learner back to the lesson
+    assert client.get(url).headers["Location"].endswith(f"/lesson/{assignment.assignment_id}/play")
+    assert _progress(learner_id) == (0, 0)
+
+    for _ in range(5):
+        resp = client.post(url)
+        assert resp.status_code == 302 and resp.headers["Location"].endswith(url)
+        assert b"Lesson complete!" in client.get(url).data
+    assert _progress(learner_id) == (LESSON_XP, 1)
+    assert db.session.scalar(select(func.count()).select_from(ActivityLog)
+                             .where(ActivityLog.user_id == learner_id)) == 1
+
+
+def test_lessons_outside_the_learners_classes_are_refused(client):
+    tutor = make_user("tutor@school.example", role="tutor")
+    learner = make_user("ada@school.example")
+    make_class(tutor, [learner])
+    _, elsewhere = make_class(tutor, [], title="Maths 9C")
+    learner_id, url = learner.user_id, f"/lesson/{elsewhere.assignment_id}/complete"
+    login(client, learner)
+
+    assert b"Lesson not found." in client.post(url, follow_redirects=True).data
+    assert _progress(learner_id) == (0, 0)
+    assert client.get(url).headers["Location"].endswith("/learner/dashboard")
+
+
+def test_auto_enrol_with_a_stale_enrolment_cache(app, client):
+    tutor = make_user("tutor@school.example", role="tutor")
+    learner = make_user("ada@school.example")
+    klass, _ = make_class(tutor, [learner])
+    learner_id = learner.user_id
+    app.extensions["cache"].set(learner_id, (), ns="enrollments")  # cached before the enrolment above
+    login(client, learner)
+
+    assert client.get("/learner/dashboard").status_code == 200
+    assert db.session.scalar(select(func.count()).select_from(ClassEnrollment)
+                             .where(ClassEnrollment.user_id == learner_id)) == 1
+    assert db.session.get(Class, klass.class_id).student_count == 1
@@ -0,0 +1,72 @@
+# tests/test_live_events.py — dashboard events travel through live_events, not process memory
+import json
+from sqlalchemy import select
+import events
+from conftest import login, make_user, make_class
+from models import db, User, Submission, LiveEvent
+from tenancy import DEFAULT
+
+
+def _submit(assignment, learner, score=80.0):
+    db.session.add(Submission(assignment_id=assignment.assignment_id, user_id=learner.user_id,
+                              status="submitted", score=score))
+
+
+def test_submission_event_is_written_with_the_submission(app):
+    tutor = make_user("tutor@school.example", role="tutor")
+    learner = make_user("ada@school.example")
+    _, assignment = make_class(tutor, [learner])
+
+    _submit(assignment, learner)
+    db.session.rollback()
+    assert db.session.query(LiveEvent).count() == 0  # rolled back with the change
+
+    _submit(assignment, learner)
+    db.session.commit()
+    row = db.session.query(LiveEvent).one()
+    assert (row.topic, row.name) == (f"tutor:{tutor.user_id}", "submission")
+    assert json.loads(row.payload)["title"] == assignment.title
+
+
+def test_another_process_dispatches_and_resumes_from_the_table(app, monkeypatch):
+    tutor = make_user("tutor@school.example", role="tutor")
+    learner = make_user("ada@school.example")
+    _, assignment = make_class(tutor, [learner])
+
+    # the dispatcher a second worker runs: it sees only what's in the table
+    dispatcher = events._Dispatcher(app, DEFAULT)
+    _submit(assignment, learner)
+    db.session.commit()
+    with dispatcher.engine.connect() as conn:
+        assert dispatcher._poll(conn) == 1
+    event_id = db.session.query(LiveEvent.event_id).scalar()
+    assert dispatcher.cursor == event_id
+
+    # a reconnect with Last-Event-ID lands on any worker and replays from the table
+    monkeypatch.setattr(events, "_ensure_dispatcher", lambda tenant: None)
+    tutor_id, name = tutor.user_id, learner.full_name  # listen() hands its connection back
+    stream = events.listen(tutor_id, event_id - 1)
+    seq, event, payload = next(stream)
+    assert (seq, event) == (event_id, "submission")
+    assert json.loads(payload)["learner"] == name
+
+
+def test_second_attempt_counts_once_on_the_dashboard_and_in_the_event(app, client):
+    tutor = make_user("tutor@school.example", role="tutor")
+    learner = make_user("ada@school.example")
+    classmate = make_user("grace@school.example")
+    _, assignment = make_class(tutor, [learner, classmate])
+    assignment_id, tutor_id = assignment.assignment_id, tutor.user_id
+
+    login(client, learner)
+    answers = {"question1": "A", "question2": "C", "question3": "B"}
+    for _ in range(2):
+        assert client.post(f"/lesson/{assignment_id}/quiz", data=answers).status_code == 200
+
+    payloads = [json.loads(p) for p in db.session.scalars(
+        select(LiveEvent.payload).where(LiveEvent.name == "submission").order_by(LiveEvent.event_id))]
+    assert [(d["submitted"], d["class_size"]) for d in payloads] == [(1, 2), (1, 2)]
+
+    login(client, db.session.get(User, tutor_id))
+    page = client.get("/tutor/dashboard").get_data(as_text=True)
+    assert '<td class="js-submissions">1/2</td>' in page
@@ -0,0 +1,32 @@
+# tests/test_reminders.py — due-date reminders read the school's clock, not UTC
+from datetime import timedelta
+import pytest
+from conftest import make_user, make_class
+from learner.reminders import due_unsubmitted
+from mail import Transport
+from models import db, school_now
+
+
+@pytest.mark.parametrize("zone", ["Pacific/Auckland", "America/Los_Angeles"])
+def test_due_window_is_measured_in_school_time(app, zone):
+    # far from UTC either way: comparing a UTC now with a local due date is off by 8-13 hours
+    app.config["SCHOOL_TIMEZONE"] = zone
+    tutor = make_user("tutor@school.example", role="tutor")
+    learner = make_user("ada@school.example")
+    _, assignment = make_class(tutor, [learner])
+    assignment.due_date = school_now() + timedelta(hours=2)  # as typed into the datetime-local input
+    db.session.commit()
+
+    assert [r.assignment_id for r in due_unsubmitted(3)] == [assignment.assignment_id]
+    assert due_unsubmitted(1) == []
+
+
+def test_transport_must_implement_send_many():
+    with pytest.raises(TypeError):
+        Transport()
+
+    class Null(Transport):
+        def send_many(self, messages):
+            return len(messages)
+    with Null() as transport:
+        assert transport.send_many([]) == 0
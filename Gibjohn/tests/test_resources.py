@@ -0,0 +1,23 @@
+# tests/test_resources.py — adding a link the tutor already has saves nothing and says only that
+from sqlalchemy import select, func
+from conftest import login, make_user
+from models import db, Resources
+
+
+def _flashes(client):
+    with client.session_transaction() as sess:
+        return sess.pop("_flashes", [])
+
+
+def test_duplicate_link_is_not_reported_as_saved(client):
+    tutor = make_user("tutor@school.example", role="tutor")
+    login(client, tutor)
+    form = {"title": "Fractions", "link": "https://www.youtube.com/watch?v=abc123XYZ_0"}
+
+    assert client.post("/resources", data=form).status_code == 302
+    assert _flashes(client) == [("success", "Resource(s) saved.")]
+
+    form["link"] = "https://youtu.be/abc123XYZ_0"  # the same video, written another way
+    assert client.post("/resources", data=form).status_code == 302
+    assert _flashes(client) == [("warn", "That link is already in your resources.")]
+    assert db.session.scalar(select(func.count()).select_from(Resources)) == 1
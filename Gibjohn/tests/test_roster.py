@@ -0,0 +1,13 @@
+# tests/test_roster.py — imported passwords meet the same rules as the registration form
+import io
+from auth.roster import parse_roster
+
+
+def test_roster_passwords_use_the_registration_rules():
+    csv = io.StringIO("email,password\n"
+                      "ada@school.example,longenough1\n"
+                      "grace@school.example,Longenough1!\n"
+                      "alan@school.example,\n")
+    rows, errors = parse_roster(csv, "learner")
+    assert [r["email"] for r in rows] == ["grace@school.example", "alan@school.example"]
+    assert errors == [(2, "Password must include at least one symbol.")]
@@ -1,4 +1,4 @@
 # tutor/__init__.py
 from flask import Blueprint
 bp = Blueprint('tutor', __name__, template_folder="../templates/tutor")
-from . import routes  # noqa 
\ No newline at end of file
+from . import routes, rollups, export, live, links, heatmap  # noqa 
\ No newline at end of file
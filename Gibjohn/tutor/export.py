@@ -0,0 +1,139 @@
+# tutor/export.py — streaming gradebook export (CSV / XLSX)
+import csv
+import io
+from datetime import datetime, timezone
+from xml.sax.saxutils import escape
+from flask import Response, stream_with_context, request, redirect, url_for, flash
+from flask_login import login_required, current_user
+from sqlalchemy import select
+from models import db, Class, Assignment, Submission, User
+from streaming import stream_zip
+from replicas import read_only
+
+from . import bp
+
+YIELD_PER = 1000
+HEADER = ["Class", "Assignment", "Learner", "Email", "Status", "Score", "Submitted at"]
+
+
+def gradebook_rows(tutor_id: int):
+    """Every submission for the tutor's classes, fetched in YIELD_PER batches."""
+    stmt = (
+        select(
+            Class.title,
+            Assignment.title,
+            User.full_name,
+            User.email,
+            Submission.status,
+            Submission.score,
+            Submission.submitted_at,
+        )
+        .join(Assignment, Assignment.assignment_id == Submission.assignment_id)
+        .join(Class, Class.class_id == Assignment.class_id)
+        .join(User, User.user_id == Submission.user_id)
+        .filter(Class.tutor_id == tutor_id)
+        .order_by(Class.title, Assignment.title, Submission.submitted_at)
+        .execution_options(yield_per=YIELD_PER, stream_results=True)
+    )
+    for row in db.session.execute(stmt):
+        yield row
+
+
+def _csv_stream(rows):
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(HEADER)
+    for i, (klass, title, name, email, status, score, at) in enumerate(rows, 1):
+        writer.writerow([klass, title, name or "", email, status,
+                         "" if score is None else score,
+                         at.isoformat(sep=" ", timespec="seconds") if at else ""])
+        if i % YIELD_PER == 0:
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+    yield buf.getvalue()
+
+
+# --- minimal streamed XLSX (one sheet, inline strings) ---
+_XLSX_STATIC = {
+    "[Content_Types].xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    "_rels/.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    "xl/workbook.xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Gradebook" sheetId="1" r:id="rId1"/></sheets></workbook>'
+    ),
+    "xl/_rels/workbook.xml.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+        '</Relationships>'
+    ),
+}
+
+
+def _xlsx_cell(value) -> str:
+    if value is None:
+        return "<c/>"
+    if isinstance(value, (int, float)):
+        return f"<c t=\"n\"><v>{value}</v></c>"
+    if isinstance(value, datetime):
+        value = value.isoformat(sep=" ", timespec="seconds")
+    return f"<c t=\"inlineStr\"><is><t>{escape(str(value))}</t></is></c>"
+
+
+def _sheet_xml(rows):
+    yield (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+    ).encode()
+    yield ("<row>" + "".join(_xlsx_cell(h) for h in HEADER) + "</row>").encode()
+    for row in rows:
+        yield ("<row>" + "".join(_xlsx_cell(v) for v in row) + "</row>").encode()
+    yield b"</sheetData></worksheet>"
+
+
+def _xlsx_stream(rows):
+    members = [(name, [xml.encode()]) for name, xml in _XLSX_STATIC.items()]
+    members.append(("xl/worksheets/sheet1.xml", _sheet_xml(rows)))
+    return stream_zip(members)
+
+
+@bp.route("/gradebook/export")
+@login_required
+@read_only
+def gradebook_export():
+    if current_user.role != "tutor":
+        flash("Access denied.", "error")
+        return redirect(url_for("learner.dashboard"))
+
+    fmt = request.args.get("format", "csv").lower()
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%d")
+    rows = gradebook_rows(current_user.user_id)
+
+    if fmt == "xlsx":
+        body = _xlsx_stream(rows)
+        mimetype = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    else:
+        fmt = "csv"
+        body = (chunk.encode("utf-8") for chunk in _csv_stream(rows))
+        mimetype = "text/csv"
+
+    resp = Response(stream_with_context(body), mimetype=mimetype)
+    resp.headers["Content-Disposition"] = f'attachment; filename="gradebook-{stamp}.{fmt}"'
+    resp.headers["Cache-Control"] = "no-store"
+    return resp
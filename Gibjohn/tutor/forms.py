@@ -1,8 +1,10 @@
 from flask_wtf import FlaskForm
 from wtforms import  HiddenField, MultipleFileField, StringField, TextAreaField, SubmitField, URLField, IntegerField, SelectField, DateTimeLocalField
 from wtforms.validators import Length, NumberRange
-from wtforms.validators import DataRequired, Optional, URL
+from wtforms.validators import DataRequired, Optional, URL, ValidationError
 from flask_wtf.file import FileAllowed
+from flask_login import current_user
+from models import db, Class, Resources
 
 class ResourceForm(FlaskForm):
     title = StringField("Title", validators=[DataRequired()])
@@ -25,12 +27,24 @@ class ClassForm(FlaskForm):
 
 class AssignmentForm(FlaskForm):
     title = StringField("Title", validators=[DataRequired(), Length(min=2, max=120)])
-    class_id = SelectField("Class", coerce=int, validators=[DataRequired()])
-    resource_id = SelectField("Resource", coerce=int, validators=[DataRequired()])
+    # choices only hold a first page (typeahead fetches the rest), so ids are
+    # checked with a primary-key lookup below instead of against the choices
+    class_id = SelectField("Class", coerce=int, validate_choice=False, validators=[DataRequired()])
+    resource_id = SelectField("Resource", coerce=int, validate_choice=False, validators=[DataRequired()])
     # HTML <input type="datetime-local">
     due_date = DateTimeLocalField("Due date (optional)", format="%Y-%m-%dT%H:%M", validators=[Optional()])
     submit = SubmitField("Add assignment")
 
+    def validate_class_id(self, field):
+        c = db.session.get(Class, field.data)
+        if not c or c.tutor_id != current_user.user_id:
+            raise ValidationError("Pick one of your classes.")
+
+    def validate_resource_id(self, field):
+        r = db.session.get(Resources, field.data)
+        if not r or r.owner_id != current_user.user_id:
+            raise ValidationError("Pick one of your resources.")
+
 class AddStudentSearchForm(FlaskForm):
     """Search for a single student by name."""
     class_id = HiddenField(validators=[DataRequired()])
@@ -0,0 +1,16 @@
+# tutor/heatmap.py — learners x assignments heatmap page; the matrix itself comes from /api/v1
+from flask import render_template, redirect, url_for, flash
+from flask_login import login_required, current_user
+from models import db, Class
+
+from . import bp
+
+
+@bp.route("/class/<int:class_id>/gradebook")
+@login_required
+def class_gradebook(class_id):
+    klass = db.session.get(Class, class_id)
+    if not klass or klass.tutor_id != current_user.user_id:
+        flash("Class not found.", "error")
+        return redirect(url_for("tutor.tutor_dashboard"))
+    return render_template("tutor/gradebook.html", class_=klass)
@@ -0,0 +1,103 @@
+# tutor/links.py — canonicalise link resources once, at creation time
+import re
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+import click
+from sqlalchemy import select
+from models import db, Resources
+
+from . import bp
+
+_ID = re.compile(r"^[A-Za-z0-9_-]{4,64}$")
+TRACKING_PARAMS = {"fbclid", "gclid", "si", "feature", "ref"}
+YOUTUBE_HOSTS = {"youtube.com", "m.youtube.com", "music.youtube.com", "youtube-nocookie.com"}
+
+
+def _youtube_id(host: str, path: str, query: dict) -> str | None:
+    if host == "youtu.be":
+        vid = path.strip("/").split("/")[0]
+    elif host in YOUTUBE_HOSTS:
+        parts = path.strip("/").split("/")
+        if parts[0] == "watch":
+            vid = query.get("v")
+        elif parts[0] in ("embed", "shorts", "live", "v") and len(parts) > 1:
+            vid = parts[1]
+        else:
+            vid = None
+    else:
+        vid = None
+    return vid if vid and _ID.match(vid) else None
+
+
+def _vimeo_id(host: str, path: str) -> str | None:
+    if host not in ("vimeo.com", "player.vimeo.com"):
+        return None
+    digits = [p for p in path.split("/") if p.isdigit()]
+    return digits[0] if digits else None
+
+
+def ingest_link(raw_url: str) -> dict:
+    """
+    Canonical URL plus provider/id and precomputed embed + thumbnail URLs.
+    Unknown providers keep a cleaned-up URL and no embed.
+    """
+    u = urlsplit(raw_url.strip())
+    scheme = (u.scheme or "https").lower()
+    host = (u.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = {k: v for k, v in parse_qsl(u.query, keep_blank_values=True)
+             if k not in TRACKING_PARAMS and not k.startswith("utm_")}
+
+    vid = _youtube_id(host, u.path, query)
+    if vid:
+        return {
+            "canonical_url": f"https://www.youtube.com/watch?v={vid}",
+            "provider": "youtube",
+            "provider_id": vid,
+            "embed_url": f"https://www.youtube-nocookie.com/embed/{vid}",
+            "thumb_url": f"https://img.youtube.com/vi/{vid}/hqdefault.jpg",
+        }
+
+    vid = _vimeo_id(host, u.path)
+    if vid:
+        return {
+            "canonical_url": f"https://vimeo.com/{vid}",
+            "provider": "vimeo",
+            "provider_id": vid,
+            "embed_url": f"https://player.vimeo.com/video/{vid}",
+            "thumb_url": None,
+        }
+
+    netloc = host
+    if u.port and not ((scheme, u.port) in (("http", 80), ("https", 443))):
+        netloc = f"{host}:{u.port}"
+    path = u.path or "/"
+    return {
+        "canonical_url": urlunsplit((scheme, netloc, path, urlencode(sorted(query.items())), "")),
+        "provider": "web",
+        "provider_id": None,
+        "embed_url": None,
+        "thumb_url": None,
+    }
+
+
+def find_duplicate(owner_id: int, canonical_url: str) -> Resources | None:
+    return (Resources.query
+            .filter_by(owner_id=owner_id, canonical_url=canonical_url)
+            .first())
+
+
+@bp.cli.command("ingest-links")
+@click.option("--all", "redo_all", is_flag=True, help="Re-ingest links that already have a canonical URL.")
+def ingest_links_command(redo_all):
+    """Backfill canonical URL, provider id and embed/thumbnail for link resources."""
+    stmt = select(Resources).where(Resources.type == "link", Resources.url.isnot(None))
+    if not redo_all:
+        stmt = stmt.where(Resources.canonical_url.is_(None))
+    n = 0
+    for res in db.session.scalars(stmt.execution_options(yield_per=500)):
+        for key, value in ingest_link(res.url).items():
+            setattr(res, key, value)
+        n += 1
+    db.session.commit()
+    click.echo(f"Ingested {n} link(s).")
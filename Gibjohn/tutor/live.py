@@ -0,0 +1,51 @@
+# tutor/live.py — server-sent events for the tutor dashboard
+from flask import Response, request, abort, current_app
+from flask_login import login_required, current_user
+from events import broker, listen, sse_format
+
+from . import bp
+
+
+@bp.route("/tutor/dashboard/stream")
+@login_required
+def dashboard_stream():
+    """
+    Push new submissions / activity lines to an open dashboard.
+
+    Events come through the live_events table (events.py), so the stream
+    can be served by any worker whichever one saved the submission, and
+    Last-Event-ID resumes across workers. A stream waits in Condition.wait
+    for as long as the tab stays open: under the gevent worker that is one
+    parked greenlet fed by the process's single dispatcher, under gthread
+    it is a whole request thread. Capacity is SSE_MAX_STREAMS per worker
+    process (gunicorn.conf.py sets it for the worker class); past that the
+    stream is refused with 503 + Retry-After, and live.js retries after the
+    delay rather than letting open tabs crowd out ordinary requests.
+    """
+    if current_user.role != "tutor":
+        abort(403)
+
+    retry = current_app.config["SSE_RETRY_SECONDS"]
+    if not broker.reserve(current_app.config["SSE_MAX_STREAMS"]):
+        resp = Response(f"retry: {retry * 1000}\n\n", status=503, mimetype="text/event-stream")
+        resp.headers["Retry-After"] = str(retry)
+        return resp
+
+    # EventSource resends Last-Event-ID itself; live.js passes it as ?last_event_id after a 503
+    last_id = request.headers.get("Last-Event-ID", type=int) or request.args.get("last_event_id", type=int)
+    try:
+        events = listen(current_user.user_id, last_id)
+    except Exception:
+        broker.release()
+        raise
+
+    def stream():
+        yield "retry: 5000\n\n"
+        for item in events:
+            yield sse_format(item)
+
+    resp = Response(stream(), mimetype="text/event-stream")
+    resp.call_on_close(broker.release)  # runs when the client goes, once a write to it fails
+    resp.headers["Cache-Control"] = "no-cache"
+    resp.headers["X-Accel-Buffering"] = "no"  # stop nginx buffering the stream
+    return resp
@@ -0,0 +1,168 @@
+# tutor/rollups.py — daily per-class analytics rollups, refreshed incrementally
+# The incremental refresh only sees new submissions. The app's delete paths (assignment
+# delete, account delete/purge) recompute the (class, day) buckets they empty with
+# refresh_buckets; rows deleted outside the app are picked up by the nightly `--full` run.
+from datetime import date, datetime, timedelta, timezone
+import click
+from sqlalchemy import func, select, delete, insert, tuple_
+from models import db, Class, Assignment, Submission, DailyClassRollup, RollupState
+
+from . import bp
+
+STATE_NAME = "daily_class_rollups"
+COLUMNS = ["day", "class_id", "tutor_id", "subject",
+           "submissions", "scored", "score_sum", "score_sq_sum", "learners"]
+# re-scan a little before the high-water mark to catch rows from transactions
+# that committed late; recomputing a day is idempotent so overlap is harmless
+OVERLAP = timedelta(minutes=5)
+
+
+def _day(d) -> date:
+    return d if isinstance(d, date) else date.fromisoformat(d)
+
+
+def _rollup_select(days=None, buckets=None):
+    """SELECT producing DailyClassRollup rows, optionally limited to some days or (class_id, day) pairs."""
+    day = func.date(Submission.submitted_at)
+    q = (
+        select(
+            day.label("day"),
+            Class.class_id,
+            Class.tutor_id,
+            Class.subject,
+            func.count(Submission.submission_id),
+            func.count(Submission.score),  # ungraded rows are NULL: not part of any mean
+            func.coalesce(func.sum(Submission.score), 0),
+            func.coalesce(func.sum(Submission.score * Submission.score), 0),
+            func.count(func.distinct(Submission.user_id)),
+        )
+        .join(Assignment, Assignment.assignment_id == Submission.assignment_id)
+        .join(Class, Class.class_id == Assignment.class_id)
+        .group_by(day, Class.class_id, Class.tutor_id, Class.subject)
+    )
+    if days is not None:
+        q = q.filter(day.in_(days))
+    if buckets is not None:
+        q = q.filter(tuple_(Class.class_id, day).in_([(c, d.isoformat()) for c, d in buckets]))
+    return q
+
+
+def buckets_for(*where) -> list[tuple[int, date]]:
+    """The (class_id, day) rollup buckets holding the submissions that match `where`; call before deleting them."""
+    rows = db.session.execute(
+        select(Assignment.class_id, func.date(Submission.submitted_at))
+        .join(Submission, Submission.assignment_id == Assignment.assignment_id)
+        .join(Class, Class.class_id == Assignment.class_id)
+        .where(*where).distinct()
+    ).all()
+    return [(class_id, _day(d)) for class_id, d in rows]
+
+
+def refresh_buckets(buckets) -> int:
+    """
+    Recompute these (class_id, day) rollups from what's left in submissions,
+    in the caller's transaction (a bucket with nothing left is just removed).
+    """
+    buckets = list(buckets)
+    if not buckets:
+        return 0
+    db.session.execute(delete(DailyClassRollup).where(
+        tuple_(DailyClassRollup.class_id, DailyClassRollup.day).in_(buckets)))
+    return db.session.execute(
+        insert(DailyClassRollup).from_select(COLUMNS, _rollup_select(buckets=buckets))).rowcount
+
+
+def refresh_rollups(full: bool = False) -> tuple[int, int]:
+    """
+    Bring daily_class_rollups up to date.
+
+    Only days that received submissions at/after the stored high-water mark
+    are recomputed (delete + INSERT ... SELECT), so reruns are idempotent and
+    distinct-learner counts stay exact. Returns (days_refreshed, rows_written).
+    """
+    state = db.session.get(RollupState, STATE_NAME) or RollupState(name=STATE_NAME)
+    db.session.add(state)
+
+    new_hw = db.session.scalar(select(func.max(Submission.submitted_at)))
+    if new_hw is None:
+        return 0, 0
+
+    if full or state.high_water is None:
+        db.session.execute(delete(DailyClassRollup))
+        result = db.session.execute(insert(DailyClassRollup).from_select(COLUMNS, _rollup_select()))
+        days = db.session.scalar(select(func.count(func.distinct(DailyClassRollup.day))))
+    else:
+        touched = db.session.scalars(
+            select(func.distinct(func.date(Submission.submitted_at)))
+            .filter(Submission.submitted_at >= state.high_water - OVERLAP)
+        ).all()
+        days = len(touched)
+        if not touched:
+            return 0, 0
+        parsed = [_day(d) for d in touched]
+        db.session.execute(delete(DailyClassRollup).where(DailyClassRollup.day.in_(parsed)))
+        result = db.session.execute(
+            insert(DailyClassRollup).from_select(COLUMNS, _rollup_select(touched))
+        )
+
+    state.high_water = new_hw
+    db.session.commit()
+    return days, result.rowcount
+
+
+def subject_summary(tutor_id: int, since: date | None = None):
+    """Per-subject submission count, and mean and std-dev over the scored ones, read from the rollups."""
+    q = (
+        db.session.query(
+            DailyClassRollup.subject,
+            func.sum(DailyClassRollup.submissions),
+            func.sum(DailyClassRollup.scored),
+            func.sum(DailyClassRollup.score_sum),
+            func.sum(DailyClassRollup.score_sq_sum),
+        )
+        .filter(DailyClassRollup.tutor_id == tutor_id)
+        .group_by(DailyClassRollup.subject)
+    )
+    if since:
+        q = q.filter(DailyClassRollup.day >= since)
+    out = {}
+    for subject, n, scored, s, sq in q.all():
+        scored = int(scored or 0)
+        mean = (s / scored) if scored else 0.0
+        var = max((sq / scored) - mean * mean, 0.0) if scored else 0.0
+        out[subject] = {"submissions": int(n or 0), "avg_score": mean, "std_score": var ** 0.5}
+    return out
+
+
+def weekly_trend(tutor_id: int, weeks: int = 13):
+    """Submissions and mean score per ISO week for the last `weeks` weeks (about a term)."""
+    since = datetime.now(timezone.utc).date() - timedelta(weeks=weeks)  # days are UTC dates of submitted_at
+    rows = (
+        db.session.query(
+            DailyClassRollup.day,
+            DailyClassRollup.submissions,
+            DailyClassRollup.scored,
+            DailyClassRollup.score_sum,
+        )
+        .filter(DailyClassRollup.tutor_id == tutor_id, DailyClassRollup.day >= since)
+        .all()
+    )
+    buckets = {}
+    for day, n, scored, s in rows:
+        monday = day - timedelta(days=day.weekday())
+        b = buckets.setdefault(monday, [0, 0, 0.0])
+        b[0] += n
+        b[1] += scored
+        b[2] += s
+    return [
+        {"week": wk, "submissions": n, "avg_score": (s / scored) if scored else 0.0}
+        for wk, (n, scored, s) in sorted(buckets.items())
+    ]
+
+
+@bp.cli.command("refresh-rollups")
+@click.option("--full", is_flag=True, help="Rebuild every day instead of just new ones.")
+def refresh_rollups_command(full):
+    """Refresh daily analytics rollups (cron: every 5 minutes, plus `--full` nightly for deletes made outside the app)."""
+    days, rows = refresh_rollups(full=full)
+    click.echo(f"Refreshed {days} day(s), wrote {rows} rollup row(s).")
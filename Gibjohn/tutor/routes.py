@@ -4,15 +4,24 @@ import mimetypes
 import os
 from flask import (
     render_template, request, redirect, url_for, flash,
-    current_app, send_from_directory
+    current_app, send_from_directory, jsonify
 )
 from flask_login import login_required, current_user
 from werkzeug.utils import secure_filename
-from models import db, Resources, Class, Assignment, ClassEnrollment, Submission, User, ActivityLog
+from models import db, Resources, Class, Assignment, ClassEnrollment, Submission, User, fk_cascades
 from sqlalchemy import func, desc
+from sqlalchemy.orm import contains_eager
 from . import bp  # blueprint
 from flask_wtf import FlaskForm
 from tutor.forms import ResourceForm, ClassForm, AssignmentForm, AddStudentSearchForm, AddStudentConfirmForm
+from learner.forms import ANSWER_KEY, CHOICE_LETTERS, QUESTION_FIELDS
+from item_analysis import response_matrix, analyse, item_rows
+from tutor.rollups import subject_summary, weekly_trend, buckets_for, refresh_buckets
+from learner.feed import invalidate_enrollments
+from tutor.links import ingest_link, find_duplicate
+from replicas import read_only
+from feeds import recent_activity
+from fanout import gather
 
 # --- tiny CSRF-only form for small POST actions (e.g., create/delete buttons)
 class EmptyForm(FlaskForm):
@@ -24,67 +33,96 @@ class EmptyForm(FlaskForm):
 from flask import render_template, url_for
 from flask_login import login_required, current_user
 from sqlalchemy import func, desc
-from models import db, Class, ClassEnrollment, Assignment, Submission, User, ActivityLog
+from models import db, Class, ClassEnrollment, Assignment, Submission, User
 
 @bp.route("/tutor/dashboard")
 @login_required
+@read_only
 def tutor_dashboard():
-    # -- Classes for this tutor
-    classes = (
-        Class.query
-        .filter_by(tutor_id=current_user.user_id)
-        .order_by(desc(Class.created_at))
-        .all()
-    )
-    kpi_active_classes = len(classes)
+    tutor_id = current_user.user_id
+
+    # Independent panel queries; fanout.gather runs them side by side on separate connections
+    def classes_q():
+        return (
+            db.session.query(Class.class_id, Class.title, Class.student_count)
+            .filter(Class.tutor_id == tutor_id)
+            .order_by(desc(Class.created_at))
+            .all()
+        )
 
     # -- KPI: distinct students across those classes
-    kpi_students = (
-        db.session.query(func.count(func.distinct(ClassEnrollment.user_id)))
-        .join(Class, Class.class_id == ClassEnrollment.class_id)
-        .filter(Class.tutor_id == current_user.user_id)
-        .scalar() or 0
-    )
+    def students_q():
+        return (
+            db.session.query(func.count(func.distinct(ClassEnrollment.user_id)))
+            .join(Class, Class.class_id == ClassEnrollment.class_id)
+            .filter(Class.tutor_id == tutor_id)
+            .scalar() or 0
+        )
 
-    # -- KPI: total assignments this tutor has created
-    kpi_assignments = (
-        db.session.query(func.count(Assignment.assignment_id))
-        .join(Class, Class.class_id == Assignment.class_id)
-        .filter(Class.tutor_id == current_user.user_id)
-        .scalar() or 0
-    )
+    # -- Recent assignments: submitted/class size straight from the counters.py columns
+    def assignments_q():
+        return (
+            db.session.query(
+                Assignment.assignment_id,
+                Assignment.title,
+                Assignment.due_date,
+                Assignment.submitter_count.label("submitted"),
+                Class.student_count.label("class_size"),
+            )
+            .join(Class, Assignment.class_id == Class.class_id)
+            .filter(Class.tutor_id == tutor_id)
+            .order_by(desc(Assignment.created_at))
+            .limit(10)
+            .all()
+        )
 
-    # -- Precompute class sizes
-    class_sizes_sq = (
-        db.session.query(
-            ClassEnrollment.class_id.label("cid"),
-            func.count(ClassEnrollment.user_id).label("size")
+    # -- Leaderboard (sum of Submission.score)
+    def leaderboard_q():
+        return (
+            db.session.query(
+                User.full_name,
+                func.coalesce(func.sum(Submission.score), 0).label("xp")
+            )
+            .join(Submission, Submission.user_id == User.user_id)
+            .join(Assignment, Assignment.assignment_id == Submission.assignment_id)
+            .join(Class, Class.class_id == Assignment.class_id)
+            .filter(Class.tutor_id == tutor_id)
+            .group_by(User.user_id, User.full_name)
+            .order_by(desc("xp"))
+            .limit(10)
+            .all()
         )
-        .group_by(ClassEnrollment.class_id)
-    ).subquery()
-
-    # -- Recent assignments + submissions count + class size
-    rows = (
-        db.session.query(
-            Assignment.assignment_id,
-            Assignment.title,
-            Assignment.due_date,
-            Class.class_id,
-            func.coalesce(class_sizes_sq.c.size, 0).label("class_size"),
-            func.count(Submission.submission_id).label("submitted"),
+
+    # -- Per class: assignment count and submitted learner-assignment cells (counter columns)
+    def class_cells_q():
+        return (
+            db.session.query(Assignment.class_id, func.count(Assignment.assignment_id),
+                             func.sum(Assignment.submitter_count))
+            .join(Class, Class.class_id == Assignment.class_id)
+            .filter(Class.tutor_id == tutor_id)
+            .group_by(Assignment.class_id)
+            .all()
         )
-        .join(Class, Assignment.class_id == Class.class_id)
-        .outerjoin(Submission, Submission.assignment_id == Assignment.assignment_id)
-        .outerjoin(class_sizes_sq, class_sizes_sq.c.cid == Class.class_id)
-        .filter(Class.tutor_id == current_user.user_id)
-        .group_by(Assignment.assignment_id, Class.class_id, class_sizes_sq.c.size)
-        .order_by(desc(Assignment.created_at))
-        .limit(10)
-        .all()
+
+    panels = gather(
+        classes=classes_q,
+        students=students_q,
+        assignments=assignments_q,
+        leaderboard=leaderboard_q,
+        class_cells=class_cells_q,
+        # -- Recent activity: the ring buffer feeds.py fills on write, one keyed read
+        recent=lambda: recent_activity(tutor_id, 8),
     )
+    classes = panels["classes"]
+    submitted_cells = {cid: (n, cells) for cid, n, cells in panels["class_cells"]}
+    kpi_active_classes = len(classes)
+    kpi_students = panels["students"]
+    kpi_assignments = sum(n for n, _ in submitted_cells.values())
+    rows = panels["assignments"]
 
     assignments_tbl = [
         {
+            "assignment_id": r.assignment_id,
             "title": r.title,
             "due": r.due_date,  # format in template
             "submissions": f"{r.submitted}/{r.class_size}",
@@ -93,23 +131,7 @@ def tutor_dashboard():
         for r in rows
     ]
 
-    # -- Leaderboard (sum of Submission.score)
-    leaderboard_rows = (
-        db.session.query(
-            User.full_name,
-            func.coalesce(func.sum(Submission.score), 0).label("xp")
-        )
-        .join(Submission, Submission.user_id == User.user_id)
-        .join(Assignment, Assignment.assignment_id == Submission.assignment_id)
-        .join(Class, Class.class_id == Assignment.class_id)
-        .filter(Class.tutor_id == current_user.user_id)
-        .group_by(User.user_id, User.full_name)
-        .order_by(desc("xp"))
-        .limit(10)
-        .all()
-    )
-
-    leaderboard = [{"name": (n or "Student"), "xp": f"{int(xp)} XP"} for (n, xp) in leaderboard_rows]
+    leaderboard = [{"name": (n or "Student"), "xp": f"{int(xp)} XP"} for (n, xp) in panels["leaderboard"]]
 
     # 🔧 Dummy fill if no leaderboard rows
     if not leaderboard:
@@ -119,21 +141,7 @@ def tutor_dashboard():
             {"name": "Denzil",  "xp": "2500 XP"},
         ]
 
-    # -- Recent activity for students in this tutor’s classes
-    student_ids_sq = (
-        db.session.query(ClassEnrollment.user_id)
-        .join(Class, Class.class_id == ClassEnrollment.class_id)
-        .filter(Class.tutor_id == current_user.user_id)
-    ).subquery()
-
-    recent_acts = (
-        ActivityLog.query
-        .filter(ActivityLog.user_id.in_(student_ids_sq))
-        .order_by(desc(ActivityLog.timestamp))
-        .limit(8)
-        .all()
-    )
-    recent = [a.action for a in recent_acts]
+    recent = panels["recent"]
 
     # 🔧 Dummy fill if no activity rows
     if not recent:
@@ -143,15 +151,18 @@ def tutor_dashboard():
             "Bolaji submitted ‘Fractions Basics’",
         ]
 
-    # -- Class cards (title, student count, progress placeholder)
-    class_sizes_map = dict(
-        db.session.query(class_sizes_sq.c.cid, class_sizes_sq.c.size).all()
-    )
+    # -- Class cards: progress = gradebook completion (learner-assignment cells submitted),
+    #    from the counter columns rather than building every class's matrix
+    def completion(c):
+        n, cells = submitted_cells.get(c.class_id, (0, 0))
+        total = n * c.student_count
+        return min(100, round(100 * (cells or 0) / total)) if total else 0
+
     class_cards = [{
-    "class_id": c.class_id,          # <-- add this
+    "class_id": c.class_id,
     "title": c.title,
-    "students": class_sizes_map.get(c.class_id, 0),
-    "progress": 50,                   # placeholder
+    "students": c.student_count,
+    "progress": completion(c),
 } for c in classes]
 
     # 🔧 Optional: provide dummy cards if tutor has no classes yet
@@ -183,15 +194,66 @@ def tutor_dashboard():
 
 
 # ---------- Assignments ----------
+TYPEAHEAD_LIMIT = 20
+TYPEAHEAD_MAX = 50
+
+
+def _prefix_filter(column, q: str):
+    """Case-insensitive prefix match as a range, so the lower(title) index can serve it."""
+    q = (q or "").strip().lower()
+    if not q:
+        return None
+    return db.and_(func.lower(column) >= q, func.lower(column) < q + "\U0010ffff")
+
+
+def _class_options(q: str = "", limit: int = TYPEAHEAD_LIMIT):
+    query = Class.query.filter(Class.tutor_id == current_user.user_id)
+    prefix = _prefix_filter(Class.title, q)
+    if prefix is not None:
+        query = query.filter(prefix)
+    return query.order_by(func.lower(Class.title)).limit(limit).all()
+
+
+def _resource_options(q: str = "", limit: int = TYPEAHEAD_LIMIT):
+    query = Resources.query.filter(Resources.owner_id == current_user.user_id)
+    prefix = _prefix_filter(Resources.title, q)
+    if prefix is not None:
+        query = query.filter(prefix)
+    return query.order_by(func.lower(Resources.title)).limit(limit).all()
+
+
+def _class_label(c):
+    return f"{c.title} · Y{c.year_group}"
+
+
 def _assignment_form_with_choices():
     form = AssignmentForm()
-    # Classes and resources for the selects
-    cls = Class.query.order_by(Class.title.asc()).all()
-    res = Resources.query.order_by(Resources.title.asc()).all()
-    form.class_id.choices = [(c.class_id, f"{c.title} · Y{c.year_group}") for c in cls]
+    # First page of this tutor's classes/resources; the rest via typeahead
+    cls = _class_options()
+    res = _resource_options()
+    form.class_id.choices = [(c.class_id, _class_label(c)) for c in cls]
     form.resource_id.choices = [(r.resource_id, r.title) for r in res]
     return form, cls, res
 
+
+def _typeahead_limit() -> int:
+    """?limit= clamped to 1..TYPEAHEAD_MAX; 0 or a negative would reach LIMIT (-1 is 'no limit' on SQLite)."""
+    return max(1, min(request.args.get("limit", TYPEAHEAD_LIMIT, type=int), TYPEAHEAD_MAX))
+
+
+@bp.route("/assignments/classes.json")
+@login_required
+def class_typeahead():
+    return jsonify([{"id": c.class_id, "label": _class_label(c)}
+                    for c in _class_options(request.args.get("q", ""), _typeahead_limit())])
+
+
+@bp.route("/assignments/resources.json")
+@login_required
+def resource_typeahead():
+    return jsonify([{"id": r.resource_id, "label": r.title}
+                    for r in _resource_options(request.args.get("q", ""), _typeahead_limit())])
+
 @bp.route("/assignments", methods=["GET", "POST"])
 @login_required
 def assignments():
@@ -211,8 +273,13 @@ def assignments():
         flash("Assignment created.", "success")
         return redirect(url_for("tutor.assignments"))
 
-    # List existing assignments (newest first)
-    items = Assignment.query.order_by(Assignment.created_at.desc()).all()
+    # List this tutor's assignments (newest first)
+    items = (Assignment.query
+            .join(Class, Class.class_id == Assignment.class_id)
+            .filter(Class.tutor_id == current_user.user_id)
+            .options(contains_eager(Assignment.class_))
+            .order_by(Assignment.created_at.desc())
+            .all())
     delete_form = EmptyForm()
     return render_template(
         "tutor/assignments.html",
@@ -237,7 +304,12 @@ def assignments_delete(assignment_id):
         flash("Assignment not found.", "error")
         return redirect(url_for("tutor.assignments"))
 
+    buckets = buckets_for(Assignment.assignment_id == a.assignment_id)
+    if not fk_cascades():
+        a.submissions  # loaded children are deleted by the ORM; otherwise passive_deletes leaves them to the DB
     db.session.delete(a)
+    db.session.flush()
+    refresh_buckets(buckets)  # the analytics days these submissions were counted in
     db.session.commit()
     flash("Assignment deleted.", "success")
     return redirect(url_for("tutor.assignments"))
@@ -311,6 +383,7 @@ def manage_students(class_id):
             else:
                 db.session.add(ClassEnrollment(class_id=class_id, user_id=user.user_id))
                 db.session.commit()
+                invalidate_enrollments(user.user_id)
                 flash(f"Added {user.full_name or user.email} to the class.", "success")
 
             return redirect(url_for("tutor.manage_students", class_id=class_id))
@@ -375,19 +448,26 @@ def resources():
             flash("Please provide a title and at least one file or a link.", "error")
             return redirect(url_for("tutor.resources"))
 
-        # 1) Save link as a resource (if provided)
+        saved = 0
+        # 1) Save link as a resource (if provided), canonicalised + de-duped per owner
         if link:
-            db.session.add(
-                Resources(
-                    title=title or link,
-                    subject="misc",
-                    type="link",
-                    description=description,
-                    url=link,
-                    owner_id=current_user.user_id,
-                    created_at=datetime.now(timezone.utc),
+            meta = ingest_link(link)
+            if find_duplicate(current_user.user_id, meta["canonical_url"]):
+                flash("That link is already in your resources.", "warn")
+            else:
+                db.session.add(
+                    Resources(
+                        title=title or link,
+                        subject="misc",
+                        type="link",
+                        description=description,
+                        url=link,
+                        owner_id=current_user.user_id,
+                        created_at=datetime.now(timezone.utc),
+                        **meta,
+                    )
                 )
-            )
+                saved += 1
 
         # 2) Save files (multiple)
         if files:
@@ -436,9 +516,11 @@ def resources():
                         **kwargs,
                     )
                 )
+                saved += 1
 
         db.session.commit()
-        flash("Resource(s) saved.", "success")
+        if saved:
+            flash("Resource(s) saved.", "success")
         return redirect(url_for("tutor.resources"))
 
     elif request.method == "POST":
@@ -466,47 +548,94 @@ def uploads(filename):
 # ----------------- Analytics --------------------
 @bp.route("/analytics")
 @login_required
+@read_only
 def analytics():
     if current_user.role != "tutor":
         flash("Access denied.", "error")
         return redirect(url_for("learner.dashboard"))
 
-    # by subject (from classes)
-    by_subject_rows = (
-        db.session.query(
-            Class.subject.label("subject"),
-            func.count(Assignment.assignment_id).label("assignments"),
-            func.coalesce(func.avg(Submission.score), 0).label("avg_score"),
+    tutor_id = current_user.user_id
+
+    # by subject: assignment counts live (cheap), scores from the daily rollups
+    def assignment_counts_q():
+        return dict(
+            db.session.query(Class.subject, func.count(Assignment.assignment_id))
+            .join(Assignment, Assignment.class_id == Class.class_id)
+            .filter(Class.tutor_id == tutor_id)
+            .group_by(Class.subject)
+            .all()
         )
-        .join(Assignment, Assignment.class_id == Class.class_id)
-        .outerjoin(Submission, Submission.assignment_id == Assignment.assignment_id)
-        .filter(Class.tutor_id == current_user.user_id)
-        .group_by(Class.subject)
-        .order_by(Class.subject.asc())
-        .all()
-    )
-    by_subject = [
-        {"subject": s or "Unspecified", "assignments": int(a or 0), "avg_score": float(avg or 0)}
-        for (s, a, avg) in by_subject_rows
-    ]
 
     # simple leaderboard (same as your dashboard example)
-    leaderboard_rows = (
-        db.session.query(
-            User.full_name,
-            func.coalesce(func.sum(Submission.score), 0).label("xp"),
+    def leaderboard_q():
+        return (
+            db.session.query(
+                User.full_name,
+                func.coalesce(func.sum(Submission.score), 0).label("xp"),
+            )
+            .join(Submission, Submission.user_id == User.user_id)
+            .join(Assignment, Assignment.assignment_id == Submission.assignment_id)
+            .join(Class, Class.class_id == Assignment.class_id)
+            .filter(Class.tutor_id == tutor_id)
+            .group_by(User.user_id, User.full_name)
+            .order_by(desc("xp"))
+            .limit(10)
+            .all()
         )
-        .join(Submission, Submission.user_id == User.user_id)
-        .join(Assignment, Assignment.assignment_id == Submission.assignment_id)
-        .join(Class, Class.class_id == Assignment.class_id)
-        .filter(Class.tutor_id == current_user.user_id)
-        .group_by(User.user_id, User.full_name)
-        .order_by(desc("xp"))
-        .limit(10)
-        .all()
+
+    # quizzes with stored answers, for the item-analysis picker
+    def quiz_choices_q():
+        return (
+            db.session.query(Assignment.assignment_id, Assignment.title)
+            .join(Class, Class.class_id == Assignment.class_id)
+            .filter(Class.tutor_id == tutor_id)
+            .filter(Assignment.submissions.any(Submission.responses.isnot(None)))
+            .order_by(desc(Assignment.created_at))
+            .all()
+        )
+
+    panels = gather(
+        assignment_counts=assignment_counts_q,
+        score_summary=lambda: subject_summary(tutor_id),
+        trend=lambda: weekly_trend(tutor_id),
+        leaderboard=leaderboard_q,
+        quiz_choices=quiz_choices_q,
     )
-    leaderboard = [{"name": n or "Student", "xp": int(xp)} for (n, xp) in leaderboard_rows]
+    assignment_counts, score_summary = panels["assignment_counts"], panels["score_summary"]
+    by_subject = [
+        {
+            "subject": s or "Unspecified",
+            "assignments": int(assignment_counts.get(s, 0)),
+            "submissions": score_summary.get(s, {}).get("submissions", 0),
+            "avg_score": float(score_summary.get(s, {}).get("avg_score", 0)),
+        }
+        for s in sorted(set(assignment_counts) | set(score_summary))
+    ]
+    trend = panels["trend"]
+    leaderboard = [{"name": n or "Student", "xp": int(xp)} for (n, xp) in panels["leaderboard"]]
+
+    # item analysis for one quiz (?assignment_id=..., default: latest with answers)
+    quiz_choices = panels["quiz_choices"]
+    selected_id = request.args.get("assignment_id", type=int)
+    if selected_id not in {qid for qid, _ in quiz_choices}:
+        selected_id = quiz_choices[0][0] if quiz_choices else None
+
+    items, attempts = [], 0
+    if selected_id:
+        blobs = db.session.scalars(
+            db.select(Submission.responses)
+            .filter(Submission.assignment_id == selected_id, Submission.responses.isnot(None))
+        ).all()
+        key = [CHOICE_LETTERS.index(ANSWER_KEY[f]) for f in QUESTION_FIELDS]
+        stats = analyse(response_matrix(blobs, len(key)), key, len(CHOICE_LETTERS))
+        attempts = stats["attempts"]
+        items = item_rows(stats, key, QUESTION_FIELDS, CHOICE_LETTERS)
 
     return render_template("tutor/analytics.html",
                         by_subject=by_subject,
-                        leaderboard=leaderboard)
+                        trend=trend,
+                        leaderboard=leaderboard,
+                        quiz_choices=quiz_choices,
+                        selected_id=selected_id,
+                        items=items,
+                        attempts=attempts)
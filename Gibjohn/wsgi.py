@@ -0,0 +1,2 @@
+# wsgi.py — production entry point: `gunicorn -c gunicorn.conf.py wsgi:app` (from Gibjohn/)
+from app import app  # noqa: F401